@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+启动导入耗时基准测试
+解析 python -X importtime 的输出，统计导入src.main的累计耗时，
+并检查GUI、日志、配置等子系统没有在模块加载时被导入，防止启动性能回退
+"""
+
+import sys
+import argparse
+import subprocess
+from pathlib import Path
+
+
+project_root = Path(__file__).parent.parent
+
+# 导入src.main时不应加载的模块（只在对应子系统第一次使用时导入）
+FORBIDDEN_MODULES = ("PyQt6", "loguru", "yaml", "src.shared.utils.logger",
+                     "src.shared.utils.config_loader")
+
+
+def parse_importtime(stderr):
+    """
+    解析 -X importtime 输出
+
+    Returns:
+        {模块名: (自身耗时微秒, 累计耗时微秒)}
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return modules
+
+
+def measure(module, repeat):
+    """多次在新进程中导入模块，返回累计耗时最短的一次的解析结果"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c",
+             f"import sys; sys.path.insert(0, {str(project_root)!r}); import {module}"],
+            capture_output=True, text=True, cwd=project_root)
+        if result.returncode != 0:
+            raise RuntimeError(f"导入 {module} 失败:\n{result.stderr}")
+        modules = parse_importtime(result.stderr)
+        if best is None or modules[module][1] < best[module][1]:
+            best = modules
+    return best
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="启动导入耗时基准测试")
+    parser.add_argument("--module", default="src.main", help="要测量的模块")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    parser.add_argument("--budget-ms", type=float, default=100.0,
+                        help="累计导入耗时上限（毫秒），超出时返回非零退出码")
+    parser.add_argument("--top", type=int, default=10, help="列出自身耗时最高的模块数")
+    args = parser.parse_args()
+
+    modules = measure(args.module, args.repeat)
+    total_ms = modules[args.module][1] / 1000
+    print(f"{args.module} 累计导入耗时: {total_ms:.1f} ms (共 {len(modules)} 个模块)")
+    for name, (self_us, cumulative_us) in sorted(
+            modules.items(), key=lambda item: item[1][0], reverse=True)[:args.top]:
+        print(f"  {self_us / 1000:8.2f} ms  {name}")
+
+    failed = False
+    loaded = [name for name in modules
+              if any(name == f or name.startswith(f + ".") for f in FORBIDDEN_MODULES)]
+    if loaded:
+        print(f"❌ 模块加载时导入了应延迟导入的模块: {', '.join(sorted(loaded))}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"❌ 导入耗时超过预算 {args.budget_ms:.0f} ms")
+        failed = True
+    if not failed:
+        print("✅ 启动导入检查通过")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志写入基准测试
+对比同步文件输出与异步（后台线程写入）输出下调用方每秒可写入的日志条数
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.shared.utils import logger as log_utils
+
+
+def run(count, async_sink, overflow, queue_size):
+    """写入count条日志，返回(调用方耗时, 含后台写完的总耗时, 丢弃条数)"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = Path(tmp_dir) / "bench.log"
+        bench_logger = log_utils.setup_logger(
+            name="Bench", log_file=str(log_file), console=False,
+            async_sink=async_sink, queue_size=queue_size, overflow=overflow
+        )
+
+        start = time.perf_counter()
+        for i in range(count):
+            bench_logger.info("处理文件 {} / {}", i, count)
+        caller_seconds = time.perf_counter() - start
+        log_utils.flush_logs()
+        total_seconds = time.perf_counter() - start
+
+        key = ("file", str(log_file.resolve()))
+        dropped = 0
+        async_writer = log_utils._sinks[key][2]
+        if async_writer is not None:
+            dropped = async_writer.dropped
+        log_utils._remove_sink(key)
+    return caller_seconds, total_seconds, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description="日志写入基准测试")
+    parser.add_argument("--count", type=int, default=50000, help="写入的日志条数")
+    parser.add_argument("--queue-size", type=int, default=log_utils.DEFAULT_QUEUE_SIZE,
+                        help="异步写入队列容量")
+    parser.add_argument("--overflow", choices=log_utils.OVERFLOW_POLICIES, default="block",
+                        help="异步写入队列已满时的处理策略")
+    args = parser.parse_args()
+
+    print(f"日志条数: {args.count}")
+    results = {}
+    for label, async_sink in (("同步输出", False), ("异步输出", True)):
+        caller, total, dropped = run(args.count, async_sink, args.overflow, args.queue_size)
+        results[label] = caller
+        print(f"{label}: 调用方 {args.count / caller:,.0f} 条/秒, "
+              f"写完 {total:.2f}s, 丢弃 {dropped} 条")
+
+    print(f"调用方提速: {results['同步输出'] / results['异步输出']:.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
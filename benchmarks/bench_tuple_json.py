@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Y3 JSON解析基准测试
+对比"json.load后遍历整棵树还原元组"与object_hook单遍解码的吞吐量
+"""
+
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3 import tuple_json
+
+
+DEFAULT_MAP = project_root / "maps" / "ProjectName001_1" / "maps" / "EntryMap"
+
+
+def naive_loads(text):
+    """先完整解析，再遍历整棵树把元组包装对象替换为tuple"""
+    def rebuild(obj):
+        if isinstance(obj, dict):
+            if obj.get(tuple_json.TUPLE_KEY) is True and len(obj) == 2:
+                return tuple(rebuild(item) for item in obj[tuple_json.ITEMS_KEY])
+            return {key: rebuild(value) for key, value in obj.items()}
+        if isinstance(obj, list):
+            return [rebuild(item) for item in obj]
+        return obj
+    return rebuild(json.loads(text))
+
+
+def collect_texts(map_dir):
+    """读取目录下所有可解析的JSON文本"""
+    texts = []
+    for file_path in sorted(Path(map_dir).rglob("*.json")):
+        try:
+            text = file_path.read_text(encoding='utf-8')
+            json.loads(text)
+        except (UnicodeDecodeError, ValueError):
+            continue
+        texts.append(text)
+    return texts
+
+
+def bench(label, func, texts, repeat, total_bytes):
+    """多次解析全部文本取最短耗时"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label:<28} {best * 1000:8.1f} ms  {total_bytes / best / (1024 * 1024):7.1f} MB/s")
+    return best
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Y3 JSON解析基准测试")
+    parser.add_argument("--map", type=Path, default=DEFAULT_MAP, help="地图数据目录")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数")
+    args = parser.parse_args()
+
+    texts = collect_texts(args.map)
+    total_bytes = sum(len(text.encode('utf-8')) for text in texts)
+    print(f"{len(texts)} 个JSON文件, {total_bytes / 1024:.0f} KB")
+
+    # 两种方式的解析结果必须一致
+    for text in texts:
+        assert naive_loads(text) == tuple_json.loads(text)
+
+    baseline = bench("json.loads + 遍历还原", naive_loads, texts, args.repeat, total_bytes)
+    fast = bench("tuple_json.loads", tuple_json.loads, texts, args.repeat, total_bytes)
+    bench("json.loads (不还原元组)", json.loads, texts, args.repeat, total_bytes)
+    bench("tuple_json.dumps", lambda text: tuple_json.dumps(tuple_json.loads(text)),
+          texts, args.repeat, total_bytes)
+    print(f"加速比: {baseline / fast:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
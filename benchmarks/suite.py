@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+热点路径基准测试套件
+以 maps/ProjectName001_1 为参考负载，测量项目复制/导入、备份、同步、物编表JSON解析、
+resource.repository 解析、多语言文件加载、多语言检查、逻辑资源空间查询和项目归档的耗时，
+可选在合成放大地图（10x/100x）上测量扩展性；结果写为JSON，--compare 对比两次结果并标出性能回退
+
+用法:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --scales 1,10 --cases parse_object_tables,parse_repository
+    python benchmarks/suite.py --compare baseline.json results.json
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from benchmarks import synthetic
+from src.infrastructure.storage import archive
+from src.infrastructure.storage.backup_manifest import IncrementalBackup
+from src.infrastructure.storage.delta_sync import DeltaSync
+from src.infrastructure.storage.object_store import ObjectStore, load_tree
+from src.infrastructure.storage.parallel_copy import copy_tree
+from src.infrastructure.y3 import tuple_json
+from src.infrastructure.y3.localization_audit import audit
+from src.infrastructure.y3.parse_cache import ParseCache
+from src.infrastructure.y3.resource_index import REPOSITORY_FILE, ResourceIndex
+from src.infrastructure.y3.spatial_index import SpatialIndex
+
+
+# 结果文件格式版本
+RESULTS_VERSION = 1
+
+# 对比时耗时增加超过该比例视为回退
+DEFAULT_THRESHOLD = 0.10
+
+# 空间查询用例的查询次数
+SPATIAL_QUERIES = 1000
+
+# 物编表JSON（相对地图目录）
+OBJECT_TABLE_PATTERNS = ("unit/*.json", "ability/*.json", "modifier/*.json",
+                         "projectile/*.json", "editor_table/*/*.json", "logicres.json")
+
+
+def object_table_files(project_dir):
+    """项目中全部地图目录下的物编表文件"""
+    files = []
+    for map_dir in synthetic.map_dirs(project_dir):
+        for pattern in OBJECT_TABLE_PATTERNS:
+            files.extend(sorted(map_dir.glob(pattern)))
+    return files
+
+
+def language_files(project_dir):
+    """项目中全部地图目录下的多语言文件"""
+    files = []
+    for map_dir in synthetic.map_dirs(project_dir):
+        files.extend(sorted(map_dir.glob("*language.json")))
+    return files
+
+
+def parse_files(files):
+    """逐个解析JSON文件，返回计数"""
+    total_bytes = 0
+    for file_path in files:
+        tuple_json.load_file(file_path)
+        total_bytes += file_path.stat().st_size
+    return {"files": len(files), "bytes": total_bytes}
+
+
+# 每个测试用例由准备函数和被计时的运行函数组成：
+#   prepare(project, work) -> state   不计时，每次运行前调用，work为空的临时目录
+#   run(project, work, state) -> 计数  计时
+
+def prepare_none(project, work):
+    return None
+
+
+def run_copy(project, work, state):
+    stats = copy_tree(project, work / "copy")
+    return {"files": stats["files"], "bytes": stats["bytes"]}
+
+
+def run_backup_store(project, work, state):
+    store = ObjectStore(work / "store")
+    stats = store.save_tree(project, work / "backup.snapshot.json")
+    return {"files": stats["files"], "bytes": stats["bytes_stored"]}
+
+
+def prepare_backup_store_unchanged(project, work):
+    store = ObjectStore(work / "store")
+    store.save_tree(project, work / "previous.snapshot.json")
+    return load_tree(work / "previous.snapshot.json")
+
+
+def run_backup_store_unchanged(project, work, state):
+    store = ObjectStore(work / "store")
+    stats = store.save_tree(project, work / "backup.snapshot.json", state)
+    return {"files": stats["files"], "bytes": stats["bytes_stored"]}
+
+
+def run_backup_incremental(project, work, state):
+    stats = IncrementalBackup(project, work, "bench_backup_").create(work / "bench_backup_1")
+    return {"files": stats["files"], "bytes": stats["bytes_copied"]}
+
+
+def run_sync(project, work, state):
+    stats = DeltaSync(project, work / "y3").run()
+    return {"files": stats["files_copied"], "bytes": stats["bytes_copied"]}
+
+
+def prepare_sync_unchanged(project, work):
+    DeltaSync(project, work / "y3").run()
+
+
+def run_sync_unchanged(project, work, state):
+    stats = DeltaSync(project, work / "y3").run()
+    return {"files": stats["files_unchanged"], "bytes": stats["bytes_copied"]}
+
+
+def prepare_object_tables(project, work):
+    return object_table_files(project)
+
+
+def run_parse_object_tables(project, work, state):
+    return parse_files(state)
+
+
+def prepare_object_tables_cached(project, work):
+    cache = ParseCache(project, cache_dir=work / "parse")
+    files = object_table_files(project)
+    for file_path in files:
+        cache.load(file_path)
+    return files
+
+
+def run_parse_object_tables_cached(project, work, state):
+    cache = ParseCache(project, cache_dir=work / "parse", prune_on_open=False)
+    for file_path in state:
+        cache.load(file_path)
+    return {"files": len(state), "hits": cache.hits}
+
+
+def run_parse_repository(project, work, state):
+    repository_file = project / REPOSITORY_FILE
+    index = ResourceIndex.parse(repository_file)
+    return {"files": 1, "bytes": repository_file.stat().st_size, "items": len(index)}
+
+
+def prepare_languages(project, work):
+    return language_files(project)
+
+
+def run_load_languages(project, work, state):
+    return parse_files(state)
+
+
+def run_l10n_audit(project, work, state):
+    result = audit(project)
+    return {"files": result["files"], "unused": len(result["unused"])}
+
+
+def run_spatial_queries(project, work, state):
+    index = SpatialIndex.from_map(project / "maps" / "EntryMap")
+    if not len(index):
+        return {"files": 1, "items": 0}
+    min_x = min(p.bounds[0] for p in index)
+    min_z = min(p.bounds[1] for p in index)
+    max_x = max(p.bounds[2] for p in index)
+    max_z = max(p.bounds[3] for p in index)
+    # 固定的查询点序列，保证多次运行可比较
+    for step in range(SPATIAL_QUERIES):
+        x = min_x + (max_x - min_x) * ((step * 0.618034) % 1.0)
+        z = min_z + (max_z - min_z) * ((step * 0.414214) % 1.0)
+        index.query_point(x, z)
+        index.nearest(x, z, k=5)
+    return {"files": 1, "items": len(index), "queries": SPATIAL_QUERIES * 2}
+
+
+def run_archive_pack(project, work, state):
+    stats = archive.pack(project, work / "project.zip")
+    return {"files": stats["files"], "bytes": stats["archive_bytes"]}
+
+
+def prepare_archive(project, work):
+    archive.pack(project, work / "project.zip")
+
+
+def run_archive_unpack_subset(project, work, state):
+    stats = archive.unpack(work / "project.zip", work / "out", ["maps/EntryMap/*.json"])
+    return {"files": stats["files"], "bytes": stats["bytes"]}
+
+
+CASES = {
+    "copy": (prepare_none, run_copy),
+    "backup_store": (prepare_none, run_backup_store),
+    "backup_store_unchanged": (prepare_backup_store_unchanged, run_backup_store_unchanged),
+    "backup_incremental": (prepare_none, run_backup_incremental),
+    "sync": (prepare_none, run_sync),
+    "sync_unchanged": (prepare_sync_unchanged, run_sync_unchanged),
+    "parse_object_tables": (prepare_object_tables, run_parse_object_tables),
+    "parse_object_tables_cached": (prepare_object_tables_cached, run_parse_object_tables_cached),
+    "parse_repository": (prepare_none, run_parse_repository),
+    "load_languages": (prepare_languages, run_load_languages),
+    "l10n_audit": (prepare_none, run_l10n_audit),
+    "spatial_queries": (prepare_none, run_spatial_queries),
+    "archive_pack": (prepare_none, run_archive_pack),
+    "archive_unpack_subset": (prepare_archive, run_archive_unpack_subset),
+}
+
+
+def run_case(name, project, repeat, work_root):
+    """
+    多次运行一个测试用例
+
+    Returns:
+        最短耗时、全部耗时和计数
+    """
+    prepare, run = CASES[name]
+    timings = []
+    counters = {}
+    for _ in range(repeat):
+        work = Path(tempfile.mkdtemp(prefix=f"{name}_", dir=work_root))
+        try:
+            state = prepare(project, work)
+            start = time.perf_counter()
+            counters = run(project, work, state)
+            timings.append(time.perf_counter() - start)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+
+    best = min(timings)
+    result = {"seconds": best, "runs": timings}
+    result.update(counters)
+    if counters.get("bytes"):
+        result["throughput_mb_s"] = counters["bytes"] / best / (1024 * 1024)
+    return result
+
+
+def run_suite(project, scales, case_names, repeat, work_root, clone_bytes):
+    """运行套件，返回结果字典"""
+    results = {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "project": str(project),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "repeat": repeat,
+            "scales": scales
+        },
+        "results": {}
+    }
+
+    for scale in scales:
+        if scale == 1:
+            workload = project
+        else:
+            workload = synthetic.generate(project, work_root / f"{project.name}_x{scale}",
+                                          scale, clone_bytes)
+        for name in case_names:
+            key = f"{name}@{scale}x"
+            result = run_case(name, workload, repeat, work_root)
+            results["results"][key] = result
+            extra = ""
+            if "throughput_mb_s" in result:
+                extra = f"  {result['throughput_mb_s']:8.1f} MB/s"
+            print(f"{key:<36} {result['seconds'] * 1000:10.1f} ms  "
+                  f"{result.get('files', 0):>7} 个文件{extra}")
+    return results
+
+
+def compare(baseline_file, current_file, threshold):
+    """
+    对比两次结果
+
+    Returns:
+        存在回退时返回1，否则返回0
+    """
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["results"]
+    with open(current_file, 'r', encoding='utf-8') as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'用例':<36} {'基准(ms)':>10} {'当前(ms)':>10} {'变化':>8}")
+    for key in sorted(set(baseline) | set(current)):
+        if key not in baseline or key not in current:
+            side = "基准" if key not in baseline else "当前"
+            print(f"{key:<36} （{side}结果中没有该用例）")
+            continue
+        before = baseline[key]["seconds"]
+        after = current[key]["seconds"]
+        change = (after - before) / before if before else 0.0
+        mark = ""
+        if change > threshold:
+            mark = "  ❌ 回退"
+            regressions += 1
+        elif change < -threshold:
+            mark = "  ✅ 提升"
+        print(f"{key:<36} {before * 1000:10.1f} {after * 1000:10.1f} {change:+8.1%}{mark}")
+
+    if regressions:
+        print(f"\n{regressions} 个用例耗时增加超过 {threshold:.0%}")
+        return 1
+    print(f"\n没有超过 {threshold:.0%} 的性能回退")
+    return 0
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="热点路径基准测试套件")
+    parser.add_argument("--project", type=Path, default=synthetic.DEFAULT_PROJECT,
+                        help="参考地图项目")
+    parser.add_argument("--scales", default="1", help="地图倍数，逗号分隔，如 1,10,100")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"测试用例，逗号分隔（可选: {', '.join(CASES)}）")
+    parser.add_argument("--repeat", type=int, default=3, help="每个用例的重复次数（取最短耗时）")
+    parser.add_argument("--output", type=Path, help="结果JSON文件")
+    parser.add_argument("--work-dir", type=Path,
+                        help="临时文件和合成地图目录（默认使用系统临时目录，结束后删除）")
+    parser.add_argument("--clone-bytes", type=int, default=synthetic.CLONE_BYTES,
+                        help="合成地图中资源副本保留的字节数，0表示完整复制")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"),
+                        help="对比两个结果文件")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="视为回退的耗时增加比例")
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(args.compare[0], args.compare[1], args.threshold)
+
+    case_names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in case_names if name not in CASES]
+    if unknown:
+        print(f"未知的测试用例: {', '.join(unknown)}")
+        return 1
+    scales = [int(scale) for scale in args.scales.split(",")]
+
+    print(f"参考项目: {args.project}")
+    if args.work_dir:
+        args.work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_suite(args.project, scales, case_names, args.repeat,
+                            args.work_dir, args.clone_bytes)
+    else:
+        with tempfile.TemporaryDirectory(prefix="war3_bench_") as work_root:
+            results = run_suite(args.project, scales, case_names, args.repeat,
+                                Path(work_root), args.clone_bytes)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+        print(f"结果已保存: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
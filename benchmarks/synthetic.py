@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+合成放大地图
+以现有地图项目为底本，把物编对象、逻辑资源、多语言条目和导入资源按倍数复制，
+生成用于测量扩展性的大地图（10x/100x）
+
+复制出的对象和资源使用新的ID/GUID，依赖关系在每份副本内部重新指向；
+资源文件默认只保留前 CLONE_BYTES 字节并附加新GUID，文件数按倍数增长而磁盘占用可控
+"""
+
+import re
+import sys
+import json
+import uuid
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.storage.parallel_copy import copy_tree
+from src.infrastructure.y3 import tuple_json
+from src.infrastructure.y3.resource_index import REPOSITORY_DIR, REPOSITORY_FILE, resource_folder
+
+
+DEFAULT_PROJECT = project_root / "maps" / "ProjectName001_1"
+
+# 合成地图根目录下的说明文件，记录底本和倍数，已存在且一致时直接复用
+MARKER_NAME = "synthetic.json"
+
+# 按对象ID命名的物编目录（相对地图目录）
+OBJECT_DIRS = ("unit", "ability", "modifier", "projectile", "editor_table/*")
+
+# 每份副本的对象ID偏移，底本中对象ID的范围远小于该值
+ID_OFFSET = 100000
+
+# 多语言键在每份副本中的偏移（取与2^32互质的奇数，副本的键均匀分布在32位范围内）
+LANGUAGE_KEY_STRIDE = 2654435761
+
+# 资源副本默认保留的字节数
+CLONE_BYTES = 4096
+
+GUID_PATTERN = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+def clone_guid(guid, copy_index):
+    """第copy_index份副本中资源的GUID（确定性生成）"""
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{guid}/{copy_index}"))
+
+
+def map_dirs(project_dir):
+    """项目中的地图目录（maps/*）"""
+    return sorted(path for path in (Path(project_dir) / "maps").iterdir() if path.is_dir())
+
+
+def clone_objects(map_dir, scale):
+    """按倍数复制以对象ID命名的物编文件，文件中的ID一并替换"""
+    created = 0
+    for pattern in OBJECT_DIRS:
+        for object_dir in map_dir.glob(pattern):
+            originals = [path for path in object_dir.glob("*.json") if path.stem.isdigit()]
+            for file_path in originals:
+                text = file_path.read_text(encoding='utf-8')
+                object_id = int(file_path.stem)
+                for copy_index in range(1, scale):
+                    new_id = str(object_id + copy_index * ID_OFFSET)
+                    (object_dir / f"{new_id}.json").write_text(
+                        text.replace(file_path.stem, new_id), encoding='utf-8')
+                    created += 1
+    return created
+
+
+def clone_logicres(map_dir, scale):
+    """按倍数复制logicres.json各类别中的逻辑资源"""
+    logicres_file = map_dir / "logicres.json"
+    if not logicres_file.exists():
+        return 0
+
+    data = tuple_json.load_file(logicres_file)
+    created = 0
+    for category, entries in data.items():
+        originals = list(entries.items())
+        for copy_index in range(1, scale):
+            for key, entry in originals:
+                new_id = int(key) + copy_index * ID_OFFSET
+                clone = dict(entry)
+                if "id" in clone:
+                    clone["id"] = new_id
+                entries[str(new_id)] = clone
+                created += 1
+    tuple_json.dump_file(data, logicres_file)
+    return created
+
+
+def clone_language_entries(entries, scale):
+    """按倍数复制一个多语言字典中的条目，返回新增条数"""
+    created = 0
+    originals = list(entries.items())
+    for copy_index in range(1, scale):
+        for key, text in originals:
+            if key.lstrip("-").isdigit():
+                # 保持为有符号32位整数，与编辑器生成的键一致
+                new_key = str((int(key) + copy_index * LANGUAGE_KEY_STRIDE + 2 ** 31) % 2 ** 32 - 2 ** 31)
+            else:
+                new_key = f"{key}#{copy_index}"
+            entries[new_key] = text
+            created += 1
+    return created
+
+
+def clone_languages(map_dir, scale):
+    """按倍数复制多语言文件中的条目（文件内容为字典或字典列表）"""
+    created = 0
+    for language_file in map_dir.glob("*language.json"):
+        with open(language_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for entries in (data if isinstance(data, list) else [data]):
+            if isinstance(entries, dict):
+                created += clone_language_entries(entries, scale)
+        with open(language_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=4, ensure_ascii=True)
+    return created
+
+
+def clone_resources(project_dir, scale, clone_bytes):
+    """
+    按倍数复制导入资源：resource.repository 中的记录和对应的资源目录
+
+    每份副本中的GUID统一替换，依赖边指向同一副本中的资源
+    """
+    repository_file = project_dir / REPOSITORY_FILE
+    if not repository_file.exists():
+        return 0
+
+    with open(repository_file, 'r', encoding='utf-8', newline='') as f:
+        lines = f.readlines()
+    item_lines = [line for line in lines if line.startswith("<Item>")]
+    if not item_lines:
+        return 0
+    insert_at = max(i for i, line in enumerate(lines) if line.startswith("<Item>")) + 1
+
+    items = []
+    for line in item_lines:
+        guid = line[line.find("<GUID>") + 6:line.find("</GUID>")]
+        resource_type = line[line.find("<Type>") + 6:line.find("</Type>")]
+        items.append((guid, resource_type))
+    known = {guid for guid, _ in items}
+
+    repo_dir = project_dir / REPOSITORY_DIR
+    clones = []
+    for copy_index in range(1, scale):
+        def replace(match):
+            guid = match.group(0)
+            return clone_guid(guid, copy_index) if guid in known else guid
+
+        for line, (guid, resource_type) in zip(item_lines, items):
+            clones.append(GUID_PATTERN.sub(replace, line))
+            source_dir = repo_dir / resource_folder(resource_type, guid)
+            if not source_dir.is_dir():
+                continue
+            new_guid = clone_guid(guid, copy_index)
+            target_dir = repo_dir / resource_folder(resource_type, new_guid)
+            for source_file in source_dir.rglob("*"):
+                if not source_file.is_file():
+                    continue
+                target_file = target_dir / source_file.relative_to(source_dir)
+                target_file.parent.mkdir(parents=True, exist_ok=True)
+                with open(source_file, 'rb') as src:
+                    content = src.read(clone_bytes) if clone_bytes else src.read()
+                # 附加新GUID，副本内容互不相同，对象存储不会把它们当作同一份内容
+                with open(target_file, 'wb') as dst:
+                    dst.write(content + new_guid.encode('ascii'))
+
+    lines[insert_at:insert_at] = clones
+    with open(repository_file, 'w', encoding='utf-8', newline='') as f:
+        f.writelines(lines)
+    return len(clones)
+
+
+def generate(source_dir, target_dir, scale, clone_bytes=CLONE_BYTES):
+    """
+    生成合成放大地图
+
+    Args:
+        source_dir: 底本地图项目
+        target_dir: 合成地图目录（已存在且倍数一致时直接复用）
+        scale: 倍数，1表示底本的原样副本
+        clone_bytes: 资源副本保留的字节数，0表示完整复制
+
+    Returns:
+        合成地图目录
+    """
+    source_dir = Path(source_dir)
+    target_dir = Path(target_dir)
+    marker = {"source": str(source_dir.resolve()), "scale": scale, "clone_bytes": clone_bytes}
+
+    marker_file = target_dir / MARKER_NAME
+    if marker_file.exists():
+        with open(marker_file, 'r', encoding='utf-8') as f:
+            if json.load(f) == marker:
+                return target_dir
+        raise ValueError(f"目录中已有不同参数的合成地图: {target_dir}")
+
+    copy_tree(source_dir, target_dir)
+    stats = {"objects": 0, "logicres": 0, "language_entries": 0, "resources": 0}
+    if scale > 1:
+        for map_dir in map_dirs(target_dir):
+            stats["objects"] += clone_objects(map_dir, scale)
+            stats["logicres"] += clone_logicres(map_dir, scale)
+            stats["language_entries"] += clone_languages(map_dir, scale)
+        stats["resources"] += clone_resources(target_dir, scale, clone_bytes)
+
+    print(f"合成 {scale}x 地图: {target_dir} (新增对象 {stats['objects']} 个, "
+          f"逻辑资源 {stats['logicres']} 个, 多语言条目 {stats['language_entries']} 条, "
+          f"导入资源 {stats['resources']} 个)")
+    with open(marker_file, 'w', encoding='utf-8') as f:
+        json.dump(marker, f, indent=2)
+    return target_dir
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="生成合成放大地图")
+    parser.add_argument("target", type=Path, help="合成地图目录")
+    parser.add_argument("--scale", type=int, default=10, help="倍数")
+    parser.add_argument("--project", type=Path, default=DEFAULT_PROJECT, help="底本地图项目")
+    parser.add_argument("--clone-bytes", type=int, default=CLONE_BYTES,
+                        help="资源副本保留的字节数，0表示完整复制")
+    args = parser.parse_args()
+
+    generate(args.project, args.target, args.scale, args.clone_bytes)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,420 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目归档（流式打包/解包）
+把地图项目打包为一个标准zip文件，便于传输到构建机或分享：
+    打包时逐块读取文件，多个块由线程池并行压缩（zlib在压缩时释放GIL），
+    按顺序写出，内存占用只与并行窗口大小有关，与项目大小无关；
+    已压缩的资源（png、zip等）和压缩率很低的文件直接存储不再压缩；
+    解包时通过zip末尾的中央目录定位条目，可只解出匹配的部分（如 maps/EntryMap/*.json）
+生成的文件可被任何zip工具读取
+"""
+
+import os
+import time
+import zlib
+import struct
+import fnmatch
+import zipfile
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+
+
+# 每个压缩块的大小，大文件按块并行压缩
+CHUNK_SIZE = 1024 * 1024
+
+# 压缩级别
+DEFAULT_LEVEL = 6
+
+# 已压缩格式，直接存储
+STORED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".webp", ".gif", ".zip", ".xlsx", ".docx", ".gz", ".bz2",
+    ".xz", ".zst", ".7z", ".rar", ".mp3", ".ogg", ".mp4", ".webm", ".ktx2",
+}
+
+# 取样压缩后与原大小之比超过该值时直接存储
+STORE_RATIO = 0.9
+
+# 取样大小
+SAMPLE_SIZE = 64 * 1024
+
+# 打包时跳过的目录
+EXCLUDED_DIRS = {CACHE_DIR_NAME, ".git"}
+
+# zip 格式常量
+_LOCAL_HEADER = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER = struct.Struct("<IHHHHHHIIIHHHHHII")
+_DESCRIPTOR = struct.Struct("<IIII")
+_DESCRIPTOR64 = struct.Struct("<IIQQ")
+_END_RECORD = struct.Struct("<IHHHHIIH")
+_END_RECORD64 = struct.Struct("<IQHHIIQQQQ")
+_END_LOCATOR64 = struct.Struct("<IIQI")
+_FLAG_DESCRIPTOR = 0x08
+_FLAG_UTF8 = 0x800
+_VERSION = 20
+_VERSION64 = 45
+_MADE_BY_UNIX = 3 << 8
+_ZIP32_LIMIT = 0xFFFFFFFF
+_ENTRIES32_LIMIT = 0xFFFF
+# 扩展字段：0x5455 为通用的Unix时间戳（秒），0x4e57 保存纳秒精度的修改时间
+_EXTRA_TIMESTAMP = 0x5455
+_EXTRA_MTIME_NS = 0x4E57
+_EXTRA_ZIP64 = 0x0001
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    """修改时间转换为zip使用的DOS日期和时间"""
+    t = time.localtime(max(mtime, 315532800))  # DOS时间从1980年开始
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_time, dos_date
+
+
+def _time_extra(mtime_ns: int) -> bytes:
+    """修改时间扩展字段"""
+    seconds = max(min(mtime_ns // 1_000_000_000, 2 ** 31 - 1), -2 ** 31)
+    return (struct.pack("<HHBi", _EXTRA_TIMESTAMP, 5, 1, seconds)
+            + struct.pack("<HHq", _EXTRA_MTIME_NS, 8, mtime_ns))
+
+
+def _compress_chunk(data: bytes, level: int, last: bool) -> bytes:
+    """
+    独立压缩一个块（raw deflate）
+
+    非最后一块以 Z_SYNC_FLUSH 结束（按字节对齐且不设置结束标记），各块的输出可直接拼接为
+    一个完整的deflate流
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def should_store(rel_path: str, sample: bytes, level: int = DEFAULT_LEVEL) -> bool:
+    """
+    是否直接存储（不压缩）
+
+    Args:
+        rel_path: 相对路径（按扩展名判断）
+        sample: 文件开头的一段数据（按取样压缩率判断）
+        level: 压缩级别
+    """
+    if os.path.splitext(rel_path)[1].lower() in STORED_EXTENSIONS:
+        return True
+    if len(sample) < 256:
+        return False
+    return len(zlib.compress(sample[:SAMPLE_SIZE], 1)) > len(sample[:SAMPLE_SIZE]) * STORE_RATIO
+
+
+def iter_files(source_dir: Union[str, Path]) -> Iterator[Tuple[str, Path, os.stat_result]]:
+    """
+    按路径顺序列出要打包的文件
+
+    Returns:
+        (相对路径, 绝对路径, 文件状态) 序列，跳过本地缓存和git目录
+    """
+    root = Path(source_dir)
+    stack = [("", root)]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            entries = sorted(it, key=lambda entry: entry.name)
+        subdirs = []
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    subdirs.append((rel_path, Path(entry.path)))
+            elif entry.is_file(follow_symlinks=False):
+                yield rel_path, Path(entry.path), entry.stat(follow_symlinks=False)
+        stack.extend(reversed(subdirs))
+
+
+class _Entry:
+    """写入中的条目"""
+
+    __slots__ = ("name", "mode", "mtime_ns", "size", "method", "offset", "crc",
+                 "compressed", "zip64", "dos_time", "dos_date")
+
+    def __init__(self, name: str, st: os.stat_result, method: int):
+        self.name = name
+        self.mode = st.st_mode
+        self.mtime_ns = st.st_mtime_ns
+        self.size = 0
+        self.method = method
+        self.offset = 0
+        self.crc = 0
+        self.compressed = 0
+        # 大小在打包中途可能变化，接近上限时就使用zip64格式
+        self.zip64 = st.st_size >= _ZIP32_LIMIT // 2
+        self.dos_time, self.dos_date = _dos_datetime(st.st_mtime)
+
+
+class ArchiveWriter:
+    """流式zip写入：条目使用数据描述符，写出数据后不需要回写头部"""
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.offset = 0
+        self.entries: List[_Entry] = []
+
+    def _write(self, data: bytes) -> None:
+        self.fileobj.write(data)
+        self.offset += len(data)
+
+    def begin(self, entry: _Entry) -> None:
+        """写入条目的本地文件头"""
+        entry.offset = self.offset
+        name = entry.name.encode("utf-8")
+        extra = _time_extra(entry.mtime_ns)
+        size_field = 0
+        if entry.zip64:
+            extra += struct.pack("<HHQQ", _EXTRA_ZIP64, 16, 0, 0)
+            size_field = _ZIP32_LIMIT
+        self._write(_LOCAL_HEADER.pack(
+            0x04034B50, _VERSION64 if entry.zip64 else _VERSION, _FLAG_DESCRIPTOR | _FLAG_UTF8,
+            entry.method, entry.dos_time, entry.dos_date, 0, size_field, size_field,
+            len(name), len(extra)) + name + extra)
+
+    def write_data(self, entry: _Entry, raw: bytes, data: bytes) -> None:
+        """写入条目的一块数据（raw为原始数据，data为写入的数据）"""
+        entry.crc = zlib.crc32(raw, entry.crc)
+        entry.size += len(raw)
+        entry.compressed += len(data)
+        self._write(data)
+
+    def end(self, entry: _Entry) -> None:
+        """写入数据描述符"""
+        if entry.zip64:
+            self._write(_DESCRIPTOR64.pack(0x08074B50, entry.crc, entry.compressed, entry.size))
+        else:
+            self._write(_DESCRIPTOR.pack(0x08074B50, entry.crc, entry.compressed, entry.size))
+        self.entries.append(entry)
+
+    def close(self) -> None:
+        """写入中央目录和结束记录"""
+        central_offset = self.offset
+        for entry in self.entries:
+            name = entry.name.encode("utf-8")
+            extra = _time_extra(entry.mtime_ns)
+            zip64_fields = []
+            size, compressed, offset = entry.size, entry.compressed, entry.offset
+            if size >= _ZIP32_LIMIT or compressed >= _ZIP32_LIMIT or offset >= _ZIP32_LIMIT:
+                zip64_fields = [size, compressed, offset]
+                size = compressed = offset = _ZIP32_LIMIT
+                extra += struct.pack("<HH3Q", _EXTRA_ZIP64, 24, *zip64_fields)
+            version = _VERSION64 if (zip64_fields or entry.zip64) else _VERSION
+            self._write(_CENTRAL_HEADER.pack(
+                0x02014B50, _MADE_BY_UNIX | version, version, _FLAG_DESCRIPTOR | _FLAG_UTF8,
+                entry.method, entry.dos_time, entry.dos_date, entry.crc, compressed, size,
+                len(name), len(extra), 0, 0, 0, (entry.mode & 0xFFFF) << 16, offset)
+                + name + extra)
+
+        central_size = self.offset - central_offset
+        count = len(self.entries)
+        if count >= _ENTRIES32_LIMIT or central_size >= _ZIP32_LIMIT or central_offset >= _ZIP32_LIMIT:
+            end64_offset = self.offset
+            self._write(_END_RECORD64.pack(0x06064B50, _END_RECORD64.size - 12,
+                                           _MADE_BY_UNIX | _VERSION64, _VERSION64, 0, 0,
+                                           count, count, central_size, central_offset))
+            self._write(_END_LOCATOR64.pack(0x07064B50, 0, end64_offset, 1))
+            count = min(count, _ENTRIES32_LIMIT)
+            central_size = min(central_size, _ZIP32_LIMIT)
+            central_offset = min(central_offset, _ZIP32_LIMIT)
+        self._write(_END_RECORD.pack(0x06054B50, 0, 0, count, count,
+                                     central_size, central_offset, 0))
+
+
+def _iter_chunks(files: Iterator[Tuple[str, Path, os.stat_result]], level: int,
+                 chunk_size: int) -> Iterator[Tuple[Any, ...]]:
+    """
+    读取文件并拆分为块（生成器，任何时刻只持有一块和下一块的数据）
+
+    Returns:
+        ("begin", 条目) 或 ("chunk", 条目, 数据, 是否最后一块) 序列
+    """
+    for rel_path, abs_path, st in files:
+        try:
+            f = open(abs_path, "rb")
+        except OSError as e:
+            print(f"跳过无法读取的文件: {rel_path} ({e})")
+            continue
+        with f:
+            data = f.read(chunk_size)
+            method = zipfile.ZIP_STORED if should_store(rel_path, data, level) else zipfile.ZIP_DEFLATED
+            entry = _Entry(rel_path, st, method)
+            yield ("begin", entry)
+            while True:
+                following = f.read(chunk_size) if len(data) == chunk_size else b""
+                yield ("chunk", entry, data, not following)
+                if not following:
+                    break
+                data = following
+
+
+def pack(source_dir: Union[str, Path], archive_path: Union[str, Path],
+         workers: Optional[int] = None, level: int = DEFAULT_LEVEL,
+         chunk_size: int = CHUNK_SIZE) -> Dict[str, Any]:
+    """
+    把目录打包为zip文件
+
+    Args:
+        source_dir: 源目录
+        archive_path: 目标zip文件（先写临时文件，完成后替换）
+        workers: 压缩线程数，默认为CPU核数
+        level: 压缩级别（1~9）
+        chunk_size: 压缩块大小
+
+    Returns:
+        统计信息（文件数、原始字节数、归档字节数、直接存储的文件数、耗时秒数）
+    """
+    start = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    # 最多同时持有的块数：保证每个线程都有活干，同时限制内存占用
+    window = workers * 2 + 1
+    archive_path = Path(archive_path)
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=archive_path.parent, prefix=f".{archive_path.name}.",
+                                    suffix=".tmp")
+    stats = {"files": 0, "bytes": 0, "archive_bytes": 0, "stored": 0}
+    try:
+        with os.fdopen(fd, "wb") as f, ThreadPoolExecutor(max_workers=workers) as pool:
+            writer = ArchiveWriter(f)
+            pending: deque = deque()
+
+            def drain(limit: int) -> None:
+                while len(pending) > limit:
+                    item, future = pending.popleft()
+                    if item[0] == "begin":
+                        writer.begin(item[1])
+                        continue
+                    _, entry, raw, last = item
+                    writer.write_data(entry, raw, future.result() if future is not None else raw)
+                    if last:
+                        writer.end(entry)
+                        stats["files"] += 1
+                        stats["bytes"] += entry.size
+                        stats["stored"] += entry.method == zipfile.ZIP_STORED
+
+            for item in _iter_chunks(iter_files(source_dir), level, chunk_size):
+                future = None
+                if item[0] == "chunk" and item[1].method == zipfile.ZIP_DEFLATED:
+                    future = pool.submit(_compress_chunk, item[2], level, item[3])
+                pending.append((item, future))
+                drain(window)
+            drain(0)
+            writer.close()
+            stats["archive_bytes"] = writer.offset
+        os.replace(tmp_name, archive_path)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+    stats["seconds"] = time.perf_counter() - start
+    return stats
+
+
+def _entry_mtime_ns(info: zipfile.ZipInfo) -> Optional[int]:
+    """从扩展字段读取修改时间（优先纳秒精度），没有时返回None"""
+    extra = info.extra
+    position = 0
+    seconds = None
+    while position + 4 <= len(extra):
+        header_id, size = struct.unpack_from("<HH", extra, position)
+        body = extra[position + 4:position + 4 + size]
+        if header_id == _EXTRA_MTIME_NS and size >= 8:
+            return struct.unpack_from("<q", body)[0]
+        if header_id == _EXTRA_TIMESTAMP and size >= 5 and body[0] & 1:
+            seconds = struct.unpack_from("<i", body, 1)[0]
+        position += 4 + size
+    return None if seconds is None else seconds * 1_000_000_000
+
+
+def _matches(name: str, patterns: Optional[Sequence[str]]) -> bool:
+    """条目名是否匹配任一模式（fnmatch规则，* 也匹配 /；以 / 结尾的模式匹配整个目录）"""
+    if not patterns:
+        return True
+    for pattern in patterns:
+        if pattern.endswith("/") and name.startswith(pattern):
+            return True
+        if fnmatch.fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def list_entries(archive_path: Union[str, Path],
+                 patterns: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+    """
+    列出归档中的条目（只读取中央目录）
+
+    Args:
+        archive_path: zip文件
+        patterns: 只列出匹配的条目
+    """
+    with zipfile.ZipFile(archive_path) as zf:
+        return [{"name": info.filename, "size": info.file_size,
+                 "compressed": info.compress_size,
+                 "stored": info.compress_type == zipfile.ZIP_STORED}
+                for info in zf.infolist()
+                if not info.is_dir() and _matches(info.filename, patterns)]
+
+
+def unpack(archive_path: Union[str, Path], target_dir: Union[str, Path],
+           patterns: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+    """
+    解包归档，可只解出匹配的条目
+
+    通过中央目录直接定位匹配的条目，不读取其他条目的数据；文件先写入临时文件再替换，
+    并恢复修改时间和权限
+
+    Args:
+        archive_path: zip文件
+        target_dir: 目标目录
+        patterns: 只解出匹配的条目（如 "maps/EntryMap/*.json"、"maps/EntryMap/"），为None时全部解出
+
+    Returns:
+        统计信息（文件数、字节数、耗时秒数）
+
+    Raises:
+        ValueError: 条目路径指向目标目录之外
+    """
+    start = time.perf_counter()
+    target_dir = Path(target_dir)
+    target_root = target_dir.resolve()
+    stats = {"files": 0, "bytes": 0}
+    with zipfile.ZipFile(archive_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir() or not _matches(info.filename, patterns):
+                continue
+            target_file = (target_dir / info.filename).resolve()
+            if target_root not in target_file.parents:
+                raise ValueError(f"归档中的路径不安全: {info.filename}")
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=target_file.parent,
+                                            prefix=f".{target_file.name}.", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as out, zf.open(info) as src:
+                    while True:
+                        block = src.read(CHUNK_SIZE)
+                        if not block:
+                            break
+                        out.write(block)
+                mode = (info.external_attr >> 16) & 0o7777
+                if mode:
+                    os.chmod(tmp_name, mode)
+                mtime_ns = _entry_mtime_ns(info)
+                if mtime_ns is None:
+                    mtime_ns = int(time.mktime(info.date_time + (0, 0, -1))) * 1_000_000_000
+                os.utime(tmp_name, ns=(mtime_ns, mtime_ns))
+                os.replace(tmp_name, target_file)
+            except BaseException:
+                if os.path.exists(tmp_name):
+                    os.remove(tmp_name)
+                raise
+            stats["files"] += 1
+            stats["bytes"] += info.file_size
+    stats["seconds"] = time.perf_counter() - start
+    return stats
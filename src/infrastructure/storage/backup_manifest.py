@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量备份工具
+为每个备份快照记录文件清单（路径、大小、修改时间、内容哈希），
+未变化的文件直接从上一个快照硬链接，只复制发生变化的文件
+"""
+
+import os
+import json
+import shutil
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+
+# 备份清单文件名，保存在每个备份目录的根部
+MANIFEST_NAME = "backup_manifest.json"
+
+# 清单格式版本
+MANIFEST_VERSION = 1
+
+# 计算哈希时每次读取的块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# 项目内的本地缓存目录（解析缓存、索引等），不参与备份、同步和复制
+CACHE_DIR_NAME = ".cache"
+
+
+def file_digest(file_path: Path) -> str:
+    """
+    计算文件内容的SHA-256哈希
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        十六进制哈希字符串
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(backup_path: Path) -> Optional[Dict[str, Any]]:
+    """
+    读取备份目录中的清单
+
+    Args:
+        backup_path: 备份目录
+
+    Returns:
+        清单字典，不存在或无法解析时返回None
+    """
+    manifest_file = backup_path / MANIFEST_NAME
+    if not manifest_file.exists():
+        return None
+
+    try:
+        with open(manifest_file, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"读取备份清单失败: {manifest_file} ({e})")
+        return None
+
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def write_manifest(backup_path: Path, manifest: Dict[str, Any]) -> None:
+    """
+    写入备份清单
+
+    Args:
+        backup_path: 备份目录
+        manifest: 清单字典
+    """
+    manifest_file = backup_path / MANIFEST_NAME
+    with open(manifest_file, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+
+
+class IncrementalBackup:
+    """基于清单的增量备份"""
+
+    def __init__(self, source_dir: Path, backup_root: Path, backup_prefix: str):
+        """
+        初始化增量备份
+
+        Args:
+            source_dir: 需要备份的项目目录
+            backup_root: 备份目录所在的父目录
+            backup_prefix: 备份目录名前缀，用于查找上一个快照
+        """
+        self.source_dir = Path(source_dir)
+        self.backup_root = Path(backup_root)
+        self.backup_prefix = backup_prefix
+
+    def find_latest_backup(self) -> Optional[Path]:
+        """
+        查找带有清单的最新备份
+
+        Returns:
+            最新备份目录，不存在时返回None
+        """
+        if not self.backup_root.exists():
+            return None
+
+        candidates = []
+        for entry in os.scandir(self.backup_root):
+            if entry.is_dir() and entry.name.startswith(self.backup_prefix):
+                if os.path.exists(os.path.join(entry.path, MANIFEST_NAME)):
+                    candidates.append(entry.name)
+
+        if not candidates:
+            return None
+        # 备份目录名以时间戳结尾，按名称排序即按时间排序
+        return self.backup_root / max(candidates)
+
+    def create(self, backup_path: Path) -> Dict[str, int]:
+        """
+        创建增量备份
+
+        Args:
+            backup_path: 新备份目录，不能已存在
+
+        Returns:
+            统计信息（文件总数、复制数、链接数、复制字节数）
+        """
+        backup_path = Path(backup_path)
+        previous_path = self.find_latest_backup()
+        previous_files: Dict[str, Dict[str, Any]] = {}
+        if previous_path is not None:
+            previous_manifest = load_manifest(previous_path)
+            if previous_manifest:
+                previous_files = previous_manifest.get("files", {})
+
+        backup_path.mkdir(parents=True)
+        files: Dict[str, Dict[str, Any]] = {}
+        stats = {"files": 0, "copied": 0, "linked": 0, "bytes_copied": 0}
+
+        for root, dirs, filenames in os.walk(self.source_dir):
+            dirs[:] = [d for d in dirs if d != CACHE_DIR_NAME]
+            rel_root = os.path.relpath(root, self.source_dir)
+            target_root = backup_path if rel_root == "." else backup_path / rel_root
+            target_root.mkdir(exist_ok=True)
+
+            for filename in filenames:
+                source_file = Path(root) / filename
+                rel_path = Path(rel_root, filename).as_posix()
+                if rel_path.startswith("./"):
+                    rel_path = rel_path[2:]
+
+                st = source_file.stat()
+                previous = previous_files.get(rel_path)
+                if (previous is not None
+                        and previous["size"] == st.st_size
+                        and previous["mtime_ns"] == st.st_mtime_ns):
+                    # 大小和修改时间都未变化，沿用上一个快照中的哈希
+                    digest = previous["sha256"]
+                else:
+                    digest = file_digest(source_file)
+
+                target_file = target_root / filename
+                if (previous is not None and previous["sha256"] == digest
+                        and self._link_previous(previous_path, rel_path, target_file)):
+                    stats["linked"] += 1
+                else:
+                    shutil.copy2(source_file, target_file)
+                    stats["copied"] += 1
+                    stats["bytes_copied"] += st.st_size
+
+                files[rel_path] = {
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": digest
+                }
+                stats["files"] += 1
+
+        write_manifest(backup_path, {
+            "version": MANIFEST_VERSION,
+            "source": str(self.source_dir),
+            "created": datetime.now().isoformat(),
+            "previous": previous_path.name if previous_path else None,
+            "files": files
+        })
+        return stats
+
+    def _link_previous(self, previous_path: Optional[Path], rel_path: str,
+                       target_file: Path) -> bool:
+        """将上一个快照中的文件硬链接到新快照，失败时返回False"""
+        if previous_path is None:
+            return False
+
+        previous_file = previous_path / rel_path
+        try:
+            os.link(previous_file, target_file)
+        except OSError:
+            # 文件系统不支持硬链接或旧快照文件已丢失，退回到复制
+            return False
+        return True
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+增量目录同步
+按大小和修改时间比较源目录与目标目录（修改时间不同但大小相同时再比较内容哈希），
+只复制变化的文件并删除源目录中已不存在的文件，目标目录在同步过程中始终保持完整
+"""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME, file_digest
+
+
+def scan_tree(root: Path) -> Tuple[Dict[str, os.stat_result], Set[str]]:
+    """
+    扫描目录树
+
+    Args:
+        root: 根目录
+
+    Returns:
+        (相对路径 -> 文件状态, 子目录相对路径集合)，路径统一使用"/"分隔，
+        本地缓存目录不计入
+    """
+    files: Dict[str, os.stat_result] = {}
+    dirs: Set[str] = set()
+    if not os.path.isdir(root):
+        return files, dirs
+
+    stack = [("", str(root))]
+    while stack:
+        rel_dir, abs_dir = stack.pop()
+        with os.scandir(abs_dir) as it:
+            for entry in it:
+                rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name == CACHE_DIR_NAME:
+                        continue
+                    dirs.add(rel_path)
+                    stack.append((rel_path, entry.path))
+                else:
+                    files[rel_path] = entry.stat(follow_symlinks=False)
+    return files, dirs
+
+
+def atomic_copy(source_file: Path, target_file: Path) -> None:
+    """
+    复制文件到临时文件后原子替换目标文件
+
+    Args:
+        source_file: 源文件
+        target_file: 目标文件
+    """
+    target_file = Path(target_file)
+    fd, tmp_name = tempfile.mkstemp(dir=target_file.parent,
+                                    prefix=f".{target_file.name}.", suffix=".tmp")
+    os.close(fd)
+    try:
+        shutil.copyfile(source_file, tmp_name)
+        shutil.copystat(source_file, tmp_name)
+        os.replace(tmp_name, target_file)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+class DeltaSync:
+    """源目录到目标目录的增量同步"""
+
+    def __init__(self, source_dir: Path, target_dir: Path, delete: bool = True):
+        """
+        初始化增量同步
+
+        Args:
+            source_dir: 源目录
+            target_dir: 目标目录
+            delete: 是否删除目标目录中源目录已不存在的文件和目录
+        """
+        self.source_dir = Path(source_dir)
+        self.target_dir = Path(target_dir)
+        self.delete = delete
+
+    def plan(self) -> Dict[str, List[str]]:
+        """
+        计算同步计划
+
+        Returns:
+            同步计划：需要创建的目录、复制的文件、只需更新修改时间的文件、
+            未变化的文件、删除的文件和删除的目录
+        """
+        source_files, source_dirs = scan_tree(self.source_dir)
+        target_files, target_dirs = scan_tree(self.target_dir)
+
+        plan: Dict[str, List[str]] = {
+            "mkdir": sorted(source_dirs - target_dirs),
+            "copy": [],
+            "touch": [],
+            "unchanged": [],
+            "delete": [],
+            "rmdir": []
+        }
+
+        for rel_path, src_st in source_files.items():
+            dst_st = target_files.get(rel_path)
+            if dst_st is None or dst_st.st_size != src_st.st_size:
+                plan["copy"].append(rel_path)
+            elif dst_st.st_mtime_ns != src_st.st_mtime_ns:
+                # 大小相同但修改时间不同，比较内容哈希确认是否真的变化
+                if (file_digest(self.source_dir / rel_path)
+                        == file_digest(self.target_dir / rel_path)):
+                    plan["touch"].append(rel_path)
+                else:
+                    plan["copy"].append(rel_path)
+            else:
+                plan["unchanged"].append(rel_path)
+
+        if self.delete:
+            plan["delete"] = sorted(set(target_files) - set(source_files))
+            # 先删除深层目录
+            plan["rmdir"] = sorted(target_dirs - source_dirs, key=len, reverse=True)
+        return plan
+
+    def run(self) -> Dict[str, int]:
+        """
+        执行同步
+
+        Returns:
+            统计信息（复制文件数、复制字节数、删除文件数、删除目录数、未变化文件数）
+        """
+        plan = self.plan()
+        stats = {
+            "files_copied": 0,
+            "bytes_copied": 0,
+            "files_deleted": 0,
+            "dirs_deleted": 0,
+            "files_unchanged": len(plan["unchanged"]) + len(plan["touch"])
+        }
+
+        # 先删除，文件与目录互相替换时不会冲突
+        for rel_path in plan["delete"]:
+            target = self.target_dir / rel_path
+            if target.is_file() or target.is_symlink():
+                target.unlink()
+                stats["files_deleted"] += 1
+
+        for rel_dir in plan["rmdir"]:
+            target = self.target_dir / rel_dir
+            if target.is_dir():
+                shutil.rmtree(target)
+                stats["dirs_deleted"] += 1
+
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        for rel_dir in plan["mkdir"]:
+            (self.target_dir / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        for rel_path in plan["copy"]:
+            source_file = self.source_dir / rel_path
+            atomic_copy(source_file, self.target_dir / rel_path)
+            stats["files_copied"] += 1
+            stats["bytes_copied"] += source_file.stat().st_size
+
+        for rel_path in plan["touch"]:
+            mtime_ns = (self.source_dir / rel_path).stat().st_mtime_ns
+            os.utime(self.target_dir / rel_path, ns=(mtime_ns, mtime_ns))
+
+        return stats
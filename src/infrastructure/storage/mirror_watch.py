@@ -0,0 +1,509 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+双向目录镜像监视
+持续监视两个目录（war3项目 maps/<项目> 与 Y3编辑器 LocalData/<项目>），某一侧的文件
+变化后只把变化的文件复制到另一侧：Linux上使用inotify，其他平台或inotify不可用时
+定时扫描；同一文件在短时间内的多次保存合并为一次复制，两侧在上次同步后都修改过的
+文件视为冲突，不覆盖任何一侧
+"""
+
+import os
+import sys
+import time
+import errno
+import select
+import shutil
+import struct
+import ctypes
+import ctypes.util
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME, file_digest
+from src.infrastructure.storage.delta_sync import atomic_copy, scan_tree
+
+
+# 同一文件最后一次变化后等待的秒数，编辑器连续保存时只复制一次
+DEFAULT_DEBOUNCE = 0.3
+
+# 文件持续变化时最多推迟的秒数
+MAX_DELAY = 2.0
+
+# 轮询方式的扫描间隔（秒）
+POLL_INTERVAL = 0.5
+
+# 主循环等待事件的最长时间（秒）
+TICK = 0.1
+
+# 不参与镜像的目录名
+IGNORED_DIRS = {CACHE_DIR_NAME, ".git"}
+
+# 事件队列溢出等情况下需要重新扫描整个目录时返回的标记
+RESCAN = ""
+
+# 两侧名称（用于统计和冲突报告）
+LEFT = "left"
+RIGHT = "right"
+
+# inotify 常量（linux/inotify.h）
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+WATCH_MASK = (IN_CLOSE_WRITE | IN_ATTRIB | IN_MOVED_FROM | IN_MOVED_TO
+              | IN_CREATE | IN_DELETE | IN_DELETE_SELF)
+_EVENT_HEADER = struct.Struct("iIII")
+
+Signature = Optional[Tuple[int, int]]
+
+
+def is_ignored(rel_path: str) -> bool:
+    """是否为不参与镜像的路径（本地缓存、git目录、原子复制的临时文件）"""
+    parts = rel_path.split("/")
+    if any(part in IGNORED_DIRS for part in parts):
+        return True
+    name = parts[-1]
+    return name.startswith(".") and name.endswith(".tmp")
+
+
+def _signature(file_path: Path) -> Signature:
+    """文件的 (大小, 修改时间)，不存在或不是文件时返回None"""
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    if not os.path.isfile(file_path):
+        return None
+    return st.st_size, st.st_mtime_ns
+
+
+class PollingWatcher:
+    """定时扫描目录、比较文件大小和修改时间的监视方式"""
+
+    def __init__(self, root: Path, interval: float = POLL_INTERVAL):
+        """
+        Args:
+            root: 监视的目录
+            interval: 扫描间隔（秒）
+        """
+        self.root = Path(root)
+        self.interval = interval
+        self._snapshot = self._scan()
+        self._next_scan = time.monotonic() + interval
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        files, _ = scan_tree(self.root)
+        return {rel_path: (st.st_size, st.st_mtime_ns) for rel_path, st in files.items()}
+
+    def fileno(self) -> Optional[int]:
+        """轮询方式没有可等待的文件描述符"""
+        return None
+
+    def read(self) -> Set[str]:
+        """到达扫描间隔时扫描一次，返回变化（新增、修改、删除）的文件"""
+        now = time.monotonic()
+        if now < self._next_scan:
+            return set()
+        self._next_scan = now + self.interval
+        snapshot = self._scan()
+        changed = {rel_path for rel_path, stamp in snapshot.items()
+                   if self._snapshot.get(rel_path) != stamp}
+        changed.update(rel_path for rel_path in self._snapshot if rel_path not in snapshot)
+        self._snapshot = snapshot
+        return changed
+
+    def close(self) -> None:
+        pass
+
+
+class InotifyWatcher:
+    """基于Linux inotify的监视方式，每个子目录一个watch，新建的子目录自动加入"""
+
+    def __init__(self, root: Path):
+        """
+        Args:
+            root: 监视的目录
+
+        Raises:
+            OSError: inotify 不可用或watch数量超过系统限制
+        """
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify 只在Linux上可用")
+        self.root = Path(root)
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self._dirs: Dict[int, str] = {}
+        try:
+            self._add_tree("")
+        except OSError:
+            self.close()
+            raise
+
+    def _add_watch(self, rel_dir: str) -> None:
+        path = os.path.join(self.root, rel_dir) if rel_dir else str(self.root)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"{os.strerror(err)}: {path}")
+        self._dirs[wd] = rel_dir
+
+    def _add_tree(self, rel_dir: str) -> Set[str]:
+        """为目录及其全部子目录添加watch，返回其中已有的文件（新建目录时文件可能先于watch出现）"""
+        files: Set[str] = set()
+        stack = [rel_dir]
+        while stack:
+            current = stack.pop()
+            self._add_watch(current)
+            abs_dir = os.path.join(self.root, current) if current else str(self.root)
+            try:
+                with os.scandir(abs_dir) as it:
+                    for entry in it:
+                        rel_path = f"{current}/{entry.name}" if current else entry.name
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in IGNORED_DIRS:
+                                stack.append(rel_path)
+                        else:
+                            files.add(rel_path)
+            except FileNotFoundError:
+                continue
+        return files
+
+    def fileno(self) -> int:
+        return self._fd
+
+    def read(self) -> Set[str]:
+        """读取已到达的事件（不阻塞），返回变化的文件或目录；队列溢出时返回 {RESCAN}"""
+        changed: Set[str] = set()
+        while True:
+            try:
+                data = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                if mask & IN_Q_OVERFLOW:
+                    changed.add(RESCAN)
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                rel_dir = self._dirs.get(wd)
+                if rel_dir is None or not name:
+                    continue
+                rel_path = f"{rel_dir}/{name}" if rel_dir else name
+                if is_ignored(rel_path):
+                    continue
+                changed.add(rel_path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    try:
+                        changed.update(self._add_tree(rel_path))
+                    except OSError:
+                        # watch数量达到上限等情况下退回整体扫描
+                        changed.add(RESCAN)
+        return changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(root: Path, polling: bool = False, interval: float = POLL_INTERVAL):
+    """
+    创建目录监视器：优先使用inotify，不可用时使用轮询
+
+    Args:
+        root: 监视的目录
+        polling: 强制使用轮询
+        interval: 轮询间隔（秒）
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(root, interval)
+
+
+class MirrorDaemon:
+    """两个目录之间的双向增量镜像"""
+
+    def __init__(self, left_dir: Path, right_dir: Path, debounce: float = DEFAULT_DEBOUNCE,
+                 prefer: Optional[str] = None, polling: bool = False,
+                 on_event: Optional[Callable[[str, str, str], None]] = None):
+        """
+        初始化镜像，以两侧当前的文件状态为同步基准
+
+        Args:
+            left_dir: 一侧目录（如 maps/<项目>）
+            right_dir: 另一侧目录（如 LocalData/<项目>）
+            debounce: 文件最后一次变化后等待的秒数
+            prefer: 冲突时保留哪一侧（LEFT 或 RIGHT），为None时不覆盖并报告冲突
+            polling: 强制使用轮询监视
+            on_event: 回调 (动作, 方向, 相对路径)，动作为 copy、delete、conflict
+        """
+        if prefer not in (None, LEFT, RIGHT):
+            raise ValueError(f"prefer 只能为 {LEFT}、{RIGHT} 或 None")
+        self.dirs = {LEFT: Path(left_dir), RIGHT: Path(right_dir)}
+        self.debounce = debounce
+        self.prefer = prefer
+        self.polling = polling
+        self.on_event = on_event
+        self.watchers = {}
+        self.conflicts: Dict[str, Tuple[Signature, Signature]] = {}
+        self.stats = {"copied": 0, "deleted": 0, "bytes": 0, "conflicts": 0, "events": 0}
+        # 相对路径 -> (首次变化时间, 最后变化时间, 变化的一侧)
+        self._pending: Dict[str, Tuple[float, float, str]] = {}
+        self._base: Dict[str, Tuple[Signature, Signature]] = {}
+        self._stop = threading.Event()
+
+    # ---- 基准 ----
+
+    def _scan_side(self, side: str) -> Dict[str, Tuple[int, int]]:
+        files, _ = scan_tree(self.dirs[side])
+        return {rel_path: (st.st_size, st.st_mtime_ns) for rel_path, st in files.items()
+                if not is_ignored(rel_path)}
+
+    def snapshot(self) -> None:
+        """记录两侧当前的文件状态作为同步基准（之后的变化才会被镜像）"""
+        left, right = self._scan_side(LEFT), self._scan_side(RIGHT)
+        self._base = {rel_path: (left.get(rel_path), right.get(rel_path))
+                      for rel_path in set(left) | set(right)}
+
+    def _rescan(self, side: str) -> Set[str]:
+        """与基准比较找出一侧变化的文件（事件丢失时使用）"""
+        index = 0 if side == LEFT else 1
+        current = self._scan_side(side)
+        changed = {rel_path for rel_path, stamp in current.items()
+                   if self._base.get(rel_path, (None, None))[index] != stamp}
+        changed.update(rel_path for rel_path, stamps in self._base.items()
+                       if stamps[index] is not None and rel_path not in current)
+        return changed
+
+    # ---- 事件 ----
+
+    def start(self) -> None:
+        """建立基准并开始监视"""
+        for side in (LEFT, RIGHT):
+            self.dirs[side].mkdir(parents=True, exist_ok=True)
+        self.snapshot()
+        for side in (LEFT, RIGHT):
+            self.watchers[side] = create_watcher(self.dirs[side], self.polling)
+
+    @property
+    def backend(self) -> str:
+        """使用的监视方式"""
+        kinds = {type(watcher).__name__ for watcher in self.watchers.values()}
+        return "inotify" if kinds == {"InotifyWatcher"} else "polling"
+
+    def _collect(self, timeout: float) -> None:
+        """等待并收集两侧的变化"""
+        fds = [watcher.fileno() for watcher in self.watchers.values()
+               if watcher.fileno() is not None]
+        if fds:
+            select.select(fds, [], [], timeout)
+        else:
+            time.sleep(timeout)
+
+        now = time.monotonic()
+        for side, watcher in self.watchers.items():
+            changed = watcher.read()
+            if RESCAN in changed:
+                changed.discard(RESCAN)
+                changed |= self._rescan(side)
+            for rel_path in changed:
+                if is_ignored(rel_path):
+                    continue
+                self.stats["events"] += 1
+                first, _, _ = self._pending.get(rel_path, (now, now, side))
+                self._pending[rel_path] = (first, now, side)
+
+    def _expand(self, rel_path: str) -> List[str]:
+        """目录事件展开为目录下两侧的全部文件（包括基准中已删除的文件）"""
+        prefix = rel_path + "/"
+        if not any((self.dirs[side] / rel_path).is_dir() for side in (LEFT, RIGHT)) \
+                and not any(path.startswith(prefix) for path in self._base):
+            return [rel_path]
+        files = {path for path in self._base if path.startswith(prefix)}
+        for side in (LEFT, RIGHT):
+            directory = self.dirs[side] / rel_path
+            if directory.is_dir():
+                tree, _ = scan_tree(directory)
+                files.update(f"{prefix}{path}" for path in tree)
+        return sorted(path for path in files if not is_ignored(path))
+
+    def flush(self, force: bool = False) -> int:
+        """
+        处理已稳定（超过debounce秒没有再变化，或已推迟MAX_DELAY秒）的变化
+
+        Args:
+            force: 不等待，处理全部待处理的变化
+
+        Returns:
+            处理的文件数
+        """
+        now = time.monotonic()
+        ready = [rel_path for rel_path, (first, last, _) in self._pending.items()
+                 if force or now - last >= self.debounce or now - first >= MAX_DELAY]
+        handled = 0
+        for rel_path in ready:
+            _, _, side = self._pending.pop(rel_path)
+            for file_path in self._expand(rel_path):
+                self._reconcile(file_path, side)
+                handled += 1
+            self._prune_dirs(rel_path)
+        return handled
+
+    def _prune_dirs(self, rel_path: str) -> None:
+        """一侧已删除的目录（含变化路径的上级目录），另一侧只剩空目录时一并删除"""
+        parts = rel_path.split("/")
+        for depth in range(len(parts), 0, -1):
+            rel_dir = "/".join(parts[:depth])
+            for side, other in ((LEFT, RIGHT), (RIGHT, LEFT)):
+                if (self.dirs[side] / rel_dir).exists():
+                    continue
+                directory = self.dirs[other] / rel_dir
+                if directory.is_dir() and not any(p.is_file() for p in directory.rglob("*")):
+                    shutil.rmtree(directory, ignore_errors=True)
+
+    def _notify(self, action: str, direction: str, rel_path: str) -> None:
+        if self.on_event is not None:
+            self.on_event(action, direction, rel_path)
+
+    def _reconcile(self, rel_path: str, hint: str) -> None:
+        """
+        比较一个文件两侧的状态与基准，把变化的一侧复制（或删除）到另一侧
+
+        Args:
+            rel_path: 相对路径
+            hint: 报告变化的一侧（两侧都没有变化时忽略，如本进程复制产生的事件）
+        """
+        current = (_signature(self.dirs[LEFT] / rel_path), _signature(self.dirs[RIGHT] / rel_path))
+        base = self._base.get(rel_path, (None, None))
+        changed = [side for index, side in enumerate((LEFT, RIGHT)) if current[index] != base[index]]
+        if not changed:
+            return
+
+        if len(changed) == 2:
+            if self._same_content(rel_path, current):
+                self._set_base(rel_path, current)
+                self.conflicts.pop(rel_path, None)
+                return
+            if self.prefer is None:
+                if self.conflicts.get(rel_path) != current:
+                    self.conflicts[rel_path] = current
+                    self.stats["conflicts"] += 1
+                    self._notify("conflict", "", rel_path)
+                return
+            source = self.prefer
+        else:
+            source = changed[0]
+
+        target = RIGHT if source == LEFT else LEFT
+        direction = f"{source}->{target}"
+        source_file = self.dirs[source] / rel_path
+        target_file = self.dirs[target] / rel_path
+        if current[0 if source == LEFT else 1] is None:
+            if target_file.is_file() or target_file.is_symlink():
+                target_file.unlink()
+                self.stats["deleted"] += 1
+                self._notify("delete", direction, rel_path)
+        else:
+            source_stamp = current[0 if source == LEFT else 1]
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                atomic_copy(source_file, target_file)
+            except FileNotFoundError:
+                # 复制前源文件又被删除，等待下一个事件
+                return
+            self.stats["copied"] += 1
+            self.stats["bytes"] += source_stamp[0]
+            self._notify("copy", direction, rel_path)
+            # 基准使用复制前的源文件状态：复制期间源文件又被保存时，其事件可能已被合并，
+            # 此时重新排队，下次处理时源文件与基准不同，会再复制一次
+            target_stamp = _signature(target_file)
+            self.conflicts.pop(rel_path, None)
+            self._set_base(rel_path, (source_stamp, target_stamp) if source == LEFT
+                           else (target_stamp, source_stamp))
+            if _signature(source_file) != source_stamp:
+                now = time.monotonic()
+                self._pending.setdefault(rel_path, (now, now, source))
+            return
+        self.conflicts.pop(rel_path, None)
+        self._set_base(rel_path, (_signature(self.dirs[LEFT] / rel_path),
+                                  _signature(self.dirs[RIGHT] / rel_path)))
+
+    def _same_content(self, rel_path: str, current: Tuple[Signature, Signature]) -> bool:
+        """两侧都变化时，内容相同（或都已删除）不算冲突"""
+        if current[0] is None or current[1] is None:
+            return current[0] == current[1]
+        if current[0][0] != current[1][0]:
+            return False
+        return (file_digest(self.dirs[LEFT] / rel_path)
+                == file_digest(self.dirs[RIGHT] / rel_path))
+
+    def _set_base(self, rel_path: str, stamps: Tuple[Signature, Signature]) -> None:
+        if stamps == (None, None):
+            self._base.pop(rel_path, None)
+        else:
+            self._base[rel_path] = stamps
+
+    # ---- 运行 ----
+
+    def step(self, timeout: float = TICK) -> int:
+        """等待一次事件并处理已稳定的变化，返回处理的文件数"""
+        self._collect(timeout)
+        return self.flush()
+
+    def run(self, duration: Optional[float] = None) -> Dict[str, int]:
+        """
+        持续镜像，直到 stop() 或运行了duration秒
+
+        Returns:
+            统计信息（复制、删除的文件数，复制的字节数，冲突数，收到的事件数）
+        """
+        if not self.watchers:
+            self.start()
+        deadline = None if duration is None else time.monotonic() + duration
+        try:
+            while not self._stop.is_set():
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                self.step()
+        finally:
+            # 被中断（如 Ctrl+C）时也处理已收到、仍在防抖等待中的变化
+            try:
+                self._collect(0)
+                self.flush(force=True)
+            finally:
+                self.close()
+        return dict(self.stats)
+
+    def stop(self) -> None:
+        """从其他线程停止 run()"""
+        self._stop.set()
+
+    def close(self) -> None:
+        for watcher in self.watchers.values():
+            watcher.close()
+        self.watchers = {}
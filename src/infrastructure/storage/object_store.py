@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+内容寻址对象存储
+按内容哈希保存压缩后的文件块，快照只记录"相对路径 -> 哈希"的轻量目录树，
+内容相同的资源在所有项目、模板和备份之间只存储一份
+"""
+
+import os
+import json
+import zlib
+import shutil
+import hashlib
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional, Tuple
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME, HASH_CHUNK_SIZE
+from src.infrastructure.storage.parallel_copy import default_workers
+
+
+# 快照目录树格式版本
+TREE_VERSION = 1
+
+# 对象文件头：原始数据 / zlib压缩数据
+RAW_HEADER = b'\x00'
+ZLIB_HEADER = b'\x01'
+
+# 压缩后体积不低于原始体积的该比例时，改为原样存储
+MIN_COMPRESSION_RATIO = 0.95
+
+# 压缩级别，资源文件大多已经压缩过，使用最快的级别
+COMPRESSION_LEVEL = 1
+
+
+def load_tree(tree_file: Path) -> Optional[Dict[str, Any]]:
+    """
+    读取快照目录树
+
+    Args:
+        tree_file: 目录树文件路径
+
+    Returns:
+        目录树字典，不存在或格式不符时返回None
+    """
+    tree_file = Path(tree_file)
+    if not tree_file.exists():
+        return None
+
+    try:
+        with open(tree_file, 'r', encoding='utf-8') as f:
+            tree = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"读取快照目录树失败: {tree_file} ({e})")
+        return None
+
+    if tree.get("version") != TREE_VERSION:
+        return None
+    return tree
+
+
+def write_tree(tree_file: Path, tree: Dict[str, Any]) -> None:
+    """
+    写入快照目录树
+
+    Args:
+        tree_file: 目录树文件路径
+        tree: 目录树字典
+    """
+    tree_file = Path(tree_file)
+    tree_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(tree_file, 'w', encoding='utf-8') as f:
+        json.dump(tree, f, indent=2, ensure_ascii=False)
+
+
+class ObjectStore:
+    """内容寻址的压缩对象存储"""
+
+    def __init__(self, root: Path):
+        """
+        初始化对象存储
+
+        Args:
+            root: 存储根目录，对象保存在 objects/<哈希前两位>/<哈希其余部分>
+        """
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.tmp_dir = self.root / "tmp"
+
+    def object_path(self, digest: str) -> Path:
+        """获取对象文件路径"""
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def has(self, digest: str) -> bool:
+        """检查对象是否已存在"""
+        return self.object_path(digest).exists()
+
+    def put_file(self, file_path: Path, digest: Optional[str] = None) -> str:
+        """
+        将文件存入对象存储
+
+        文件只读取一次，写入临时文件的同时计算哈希，对象以实际写入内容的哈希保存；
+        读取期间文件被修改（编辑器保存、同步进行中）时，哈希与传入的不同，
+        返回值为实际内容的哈希，不会把新内容存到旧哈希下
+
+        Args:
+            file_path: 源文件路径
+            digest: 已知的内容哈希（对象已存在时不再读取文件），为None时在写入时计算
+
+        Returns:
+            实际存入内容的哈希
+        """
+        if digest is not None and self.has(digest):
+            return digest
+
+        actual, _, _ = self._store_file(file_path)
+        if digest is not None and actual != digest:
+            print(f"文件在存储期间发生变化，按实际内容保存: {file_path}")
+        return actual
+
+    def _store_file(self, file_path: Path) -> Tuple[str, int, bool]:
+        """
+        读取一次文件，边写临时文件边计算哈希，对象不存在时存入
+
+        Returns:
+            (实际内容的哈希, 读取的字节数, 是否新增了对象)
+        """
+        self.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.tmp_dir)
+        try:
+            size = 0
+            hasher = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as out, open(file_path, 'rb') as src:
+                chunk = src.read(HASH_CHUNK_SIZE)
+                # 按第一块的压缩率决定整个文件是否压缩，压缩收益太小（贴图、压缩包等）时原样存储，
+                # 读取时省去解压
+                compressor = None
+                if len(zlib.compress(chunk, COMPRESSION_LEVEL)) < len(chunk) * MIN_COMPRESSION_RATIO:
+                    compressor = zlib.compressobj(COMPRESSION_LEVEL)
+                out.write(RAW_HEADER if compressor is None else ZLIB_HEADER)
+                while chunk:
+                    size += len(chunk)
+                    hasher.update(chunk)
+                    out.write(chunk if compressor is None else compressor.compress(chunk))
+                    chunk = src.read(HASH_CHUNK_SIZE)
+                if compressor is not None:
+                    out.write(compressor.flush())
+
+            digest = hasher.hexdigest()
+            if self.has(digest):
+                os.remove(tmp_name)
+                return digest, size, False
+
+            object_file = self.object_path(digest)
+            object_file.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(tmp_name, object_file)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+        return digest, size, True
+
+    def read(self, digest: str) -> bytes:
+        """
+        读取对象内容
+
+        Args:
+            digest: 内容哈希
+
+        Returns:
+            解压后的原始内容
+        """
+        with open(self.object_path(digest), 'rb') as f:
+            data = f.read()
+        if data[:1] == ZLIB_HEADER:
+            return zlib.decompress(data[1:])
+        return data[1:]
+
+    def checkout_file(self, digest: str, target_file: Path) -> None:
+        """
+        将对象内容还原为文件
+
+        Args:
+            digest: 内容哈希
+            target_file: 目标文件路径
+        """
+        with open(self.object_path(digest), 'rb') as src, open(target_file, 'wb') as out:
+            header = src.read(1)
+            if header == ZLIB_HEADER:
+                decompressor = zlib.decompressobj()
+                for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b''):
+                    out.write(decompressor.decompress(chunk))
+                out.write(decompressor.flush())
+            else:
+                shutil.copyfileobj(src, out, HASH_CHUNK_SIZE)
+
+    def save_tree(self, source_dir: Path, tree_file: Path,
+                  previous_tree: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        将目录存为快照：文件内容写入对象存储，目录树写入tree_file
+
+        Args:
+            source_dir: 源目录
+            tree_file: 目录树文件路径
+            previous_tree: 上一个快照的目录树，大小和修改时间未变的文件直接沿用其哈希；
+                其他文件只读取一次，存入时计算哈希，记录存入后的修改时间和实际存入的大小
+
+        Returns:
+            统计信息（文件总数、新增对象数、新增对象字节数）
+        """
+        source_dir = Path(source_dir)
+        previous_files = previous_tree.get("files", {}) if previous_tree else {}
+        files: Dict[str, Dict[str, Any]] = {}
+        dirs = []
+        stats = {"files": 0, "stored": 0, "bytes_stored": 0}
+
+        for root, dirnames, filenames in os.walk(source_dir):
+            dirnames[:] = [d for d in dirnames if d != CACHE_DIR_NAME]
+            rel_root = os.path.relpath(root, source_dir)
+            if rel_root != ".":
+                dirs.append(Path(rel_root).as_posix())
+
+            for filename in filenames:
+                source_file = Path(root) / filename
+                rel_path = filename if rel_root == "." else Path(rel_root, filename).as_posix()
+                st = source_file.stat()
+                size = st.st_size
+
+                digest = None
+                previous = previous_files.get(rel_path)
+                if (previous is not None
+                        and previous["size"] == st.st_size
+                        and previous["mtime_ns"] == st.st_mtime_ns):
+                    digest = previous["sha256"]
+
+                if digest is None or not self.has(digest):
+                    digest, size, stored = self._store_file(source_file)
+                    if stored:
+                        stats["stored"] += 1
+                        stats["bytes_stored"] += size
+                    # 存入期间文件可能被修改：大小取实际存入的字节数，修改时间取存入之后的，
+                    # 两者与下次快照时的文件状态不一致时会重新读取
+                    st = source_file.stat()
+
+                files[rel_path] = {
+                    "size": size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "sha256": digest
+                }
+                stats["files"] += 1
+
+        write_tree(tree_file, {
+            "version": TREE_VERSION,
+            "source": str(source_dir),
+            "created": datetime.now().isoformat(),
+            "dirs": dirs,
+            "files": files
+        })
+        return stats
+
+    def checkout_tree(self, tree: Dict[str, Any], target_dir: Path,
+                      workers: Optional[int] = None) -> Dict[str, int]:
+        """
+        将快照目录树还原到目标目录
+
+        Args:
+            tree: 目录树字典
+            target_dir: 目标目录
+            workers: 并行还原的线程数，为None时使用default_workers()
+
+        Returns:
+            统计信息（文件总数、还原字节数）
+        """
+        target_dir = Path(target_dir)
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for rel_dir in tree.get("dirs", []):
+            (target_dir / rel_dir).mkdir(parents=True, exist_ok=True)
+
+        def checkout_one(rel_path: str, entry: Dict[str, Any]) -> None:
+            target_file = target_dir / rel_path
+            target_file.parent.mkdir(parents=True, exist_ok=True)
+            self.checkout_file(entry["sha256"], target_file)
+            # 还原修改时间，使后续快照能够按大小和修改时间跳过哈希计算
+            os.utime(target_file, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+
+        files = tree.get("files", {})
+        with ThreadPoolExecutor(max_workers=workers or default_workers()) as executor:
+            for future in [executor.submit(checkout_one, rel_path, entry)
+                           for rel_path, entry in files.items()]:
+                future.result()
+
+        return {
+            "files": len(files),
+            "bytes": sum(entry["size"] for entry in files.values())
+        }
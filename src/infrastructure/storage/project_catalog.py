@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+项目目录
+列出一个目录（war3 的 maps/ 或 Y3 的 LocalData/）下的全部地图项目及其元数据：
+大小、文件数、最后修改时间、项目名称、入口地图和地图版本（header.map 的 version）、最近的备份快照
+
+元数据保存在目录文件中，以项目目录、maps/ 目录、各地图目录和头文件的修改时间为签名
+（每个项目只stat几个路径），签名未变化的项目直接使用缓存，只重新扫描变化的项目；
+目录的修改时间只反映直接子项的增删，项目深处的文件变化时签名可能不变，
+本工具写入项目后调用 invalidate()，其他情况可用 scan(rescan=True) 全部重新扫描；
+只需要项目名称时用 names()，只列出一次根目录
+"""
+
+import os
+import json
+import time
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+from src.infrastructure.storage.delta_sync import scan_tree
+
+
+# 目录文件格式版本
+CATALOG_VERSION = 3
+
+# 项目和地图的头文件
+PROJECT_HEADER = "header.project"
+MAP_HEADER = "header.map"
+
+# 备份名称中的标记：<项目>_backup_<时间>（目录或快照文件）
+BACKUP_MARKER = "_backup_"
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    """文件或目录的修改时间，不存在时返回None"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def project_signature(project_dir: str) -> List[Any]:
+    """
+    项目签名：项目目录、maps/ 目录、各地图目录及头文件的修改时间
+
+    Args:
+        project_dir: 项目目录
+
+    Returns:
+        可直接比较和保存为JSON的列表
+    """
+    maps_dir = os.path.join(project_dir, "maps")
+    signature: List[Any] = [_mtime_ns(project_dir), _mtime_ns(os.path.join(project_dir, PROJECT_HEADER)),
+                            _mtime_ns(maps_dir)]
+    try:
+        with os.scandir(maps_dir) as it:
+            map_dirs = sorted(entry.name for entry in it if entry.is_dir(follow_symlinks=False))
+    except OSError:
+        return signature
+    for name in map_dirs:
+        map_dir = os.path.join(maps_dir, name)
+        signature.append([name, _mtime_ns(map_dir), _mtime_ns(os.path.join(map_dir, MAP_HEADER))])
+    return signature
+
+
+def _read_json(file_path: str) -> Optional[Dict[str, Any]]:
+    """读取JSON头文件，不存在或无法解析时返回None"""
+    try:
+        with open(file_path, 'rb') as f:
+            data = json.loads(f.read())
+    except (OSError, ValueError, UnicodeDecodeError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def read_project_metadata(project_dir: str) -> Dict[str, Any]:
+    """
+    完整扫描一个项目
+
+    Args:
+        project_dir: 项目目录
+
+    Returns:
+        size（字节）、files、modified（最新文件修改时间，秒）、project_name、
+        entry_map、map_version、maps（地图数）
+    """
+    files, _ = scan_tree(Path(project_dir))
+    header = _read_json(os.path.join(project_dir, PROJECT_HEADER)) or {}
+    entry_map = (header.get("entry_map") or {}).get("name")
+    map_version = None
+    if entry_map:
+        map_header = _read_json(os.path.join(project_dir, "maps", entry_map, MAP_HEADER)) or {}
+        map_version = map_header.get("version")
+    maps = sum(1 for rel_path in files
+               if rel_path.startswith("maps/") and rel_path.endswith("/" + MAP_HEADER)
+               and rel_path.count("/") == 2)
+    return {
+        "size": sum(st.st_size for st in files.values()),
+        "files": len(files),
+        "modified": max((st.st_mtime for st in files.values()), default=None),
+        "project_name": header.get("project_name"),
+        "entry_map": entry_map,
+        "map_version": map_version,
+        "maps": maps,
+    }
+
+
+class ProjectCatalog:
+    """一个目录下全部项目的元数据缓存"""
+
+    def __init__(self, root: Union[str, Path], catalog_file: Union[str, Path]):
+        """
+        初始化项目目录
+
+        Args:
+            root: 项目所在目录（每个子目录是一个项目）
+            catalog_file: 保存元数据的目录文件
+        """
+        self.root = str(root)
+        self.catalog_file = Path(catalog_file)
+        self.stats = {"projects": 0, "refreshed": 0, "seconds": 0.0}
+
+    def _load(self) -> Dict[str, Any]:
+        """读取目录文件中的项目元数据，格式或根目录不一致时视为空"""
+        data = _read_json(str(self.catalog_file))
+        if (not data or data.get("version") != CATALOG_VERSION
+                or data.get("root") != os.path.abspath(self.root)):
+            return {}
+        return data.get("projects") or {}
+
+    def _save(self, projects: Dict[str, Any]) -> None:
+        """写入目录文件（先写临时文件再替换）"""
+        self.catalog_file.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CATALOG_VERSION, "root": os.path.abspath(self.root), "projects": projects}
+        fd, tmp_name = tempfile.mkstemp(dir=self.catalog_file.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_name, self.catalog_file)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.remove(tmp_name)
+            raise
+
+    def _list_root(self) -> Tuple[List[str], Dict[str, str]]:
+        """列出项目目录名和各项目最近的备份名称"""
+        names = []
+        backups: Dict[str, str] = {}
+        with os.scandir(self.root) as it:
+            for entry in it:
+                if entry.name.startswith("."):
+                    continue
+                if BACKUP_MARKER in entry.name:
+                    project = entry.name.split(BACKUP_MARKER, 1)[0]
+                    if entry.name > backups.get(project, ""):
+                        backups[project] = entry.name
+                if entry.is_dir():
+                    names.append(entry.name)
+        return sorted(names), backups
+
+    def names(self) -> List[str]:
+        """
+        只列出项目名称（一次 scandir，不读取目录文件、不计算签名）
+
+        Returns:
+            按名称排序的项目目录名，根目录不存在时返回空列表
+        """
+        if not os.path.isdir(self.root):
+            return []
+        return self._list_root()[0]
+
+    def invalidate(self, name: str) -> None:
+        """
+        丢弃一个项目的缓存元数据，下次 scan() 时重新扫描
+
+        Args:
+            name: 项目目录名
+        """
+        projects = self._load()
+        if projects.pop(name, None) is not None:
+            self._save(projects)
+
+    def scan(self, rescan: bool = False) -> List[Dict[str, Any]]:
+        """
+        列出全部项目，只重新扫描签名变化的项目
+
+        Args:
+            rescan: 忽略缓存，全部重新扫描
+
+        Returns:
+            按名称排序的项目元数据（read_project_metadata 的字段，加上 name、path、last_snapshot）；
+            根目录不存在时返回空列表
+        """
+        start = time.perf_counter()
+        if not os.path.isdir(self.root):
+            return []
+
+        cached = {} if rescan else self._load()
+        names, backups = self._list_root()
+        projects: Dict[str, Any] = {}
+        refreshed = 0
+        for name in names:
+            project_dir = os.path.join(self.root, name)
+            signature = project_signature(project_dir)
+            entry = cached.get(name)
+            if entry is None or entry.get("signature") != signature:
+                entry = {"signature": signature, **read_project_metadata(project_dir)}
+                refreshed += 1
+            projects[name] = entry
+
+        if refreshed or len(projects) != len(cached):
+            self._save(projects)
+        self.stats = {"projects": len(projects), "refreshed": refreshed,
+                      "seconds": time.perf_counter() - start}
+
+        results = []
+        for name, entry in projects.items():
+            record = {key: value for key, value in entry.items() if key != "signature"}
+            record.update(name=name, path=os.path.join(self.root, name),
+                          last_snapshot=backups.get(name))
+            results.append(record)
+        return results
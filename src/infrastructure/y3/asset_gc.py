@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+未使用资源回收
+以物编表（editor_table/*、maps/*/editor_table/*）、custom/OriginalRes 和UI图集中
+引用的模型/特效/图标为根，沿 resource.repository 的依赖边做一次可达性遍历，
+不可达的资源即可回收；支持仅报告（dry-run）和实际删除
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from src.infrastructure.y3.parse_cache import ParseCache
+from src.infrastructure.y3.resource_index import REPOSITORY_FILE, ResourceIndex
+
+
+# 作为可达性根的JSON文件（glob，相对项目目录）
+ROOT_PATTERNS = (
+    "editor_table/**/*.json",
+    "maps/*/editor_table/**/*.json",
+    "custom/OriginalRes/**/*.json",
+)
+
+# 以文件名引用资源的文件（glob -> 资源包名）：UI图集引用 ui 包中与图集同名的贴图
+ROOT_NAME_PATTERNS = {
+    "custom/UIScript/*": "ui",
+}
+
+
+def _iter_root_files(project_dir: Path) -> Iterable[Path]:
+    """列出所有作为根的JSON文件"""
+    seen: Set[Path] = set()
+    for pattern in ROOT_PATTERNS:
+        for file_path in project_dir.glob(pattern):
+            if file_path.is_file() and file_path not in seen:
+                seen.add(file_path)
+                yield file_path
+
+
+def collect_references(project_dir: Union[str, Path],
+                       cache: Union[ParseCache, None] = None,
+                       unreadable: Optional[List[str]] = None) -> Set[str]:
+    """
+    收集根文件中出现的全部字符串和整数值，以及UI图集的文件名
+
+    Args:
+        project_dir: 地图项目目录
+        cache: 解析缓存，为None时新建
+        unreadable: 输出：无法解析的根文件（相对项目目录），其中引用的资源无法确定
+
+    Returns:
+        引用值集合（整数转换为字符串）
+    """
+    project_dir = Path(project_dir)
+    cache = cache or ParseCache(project_dir)
+    references: Set[str] = set()
+
+    for file_path in _iter_root_files(project_dir):
+        try:
+            stack: List[Any] = [cache.load(file_path)]
+        except (ValueError, UnicodeDecodeError):
+            if unreadable is not None:
+                unreadable.append(file_path.relative_to(project_dir).as_posix())
+            continue
+        while stack:
+            value = stack.pop()
+            if isinstance(value, dict):
+                references.update(key for key in value if isinstance(key, str))
+                stack.extend(value.values())
+            elif isinstance(value, (list, tuple)):
+                stack.extend(value)
+            elif isinstance(value, str):
+                references.add(value)
+            elif isinstance(value, int) and not isinstance(value, bool):
+                references.add(str(value))
+
+    for pattern, package in ROOT_NAME_PATTERNS.items():
+        references.update(f"{package}/{file_path.stem}" for file_path in project_dir.glob(pattern))
+    return references
+
+
+def reference_keys(item: Dict[str, Any]) -> List[str]:
+    """
+    资源可能被引用的形式
+
+    物编表以"包名/资源名"引用资源（如 custom_model/134218935/空调外机_01、
+    ui/134219387），模型、图标也可能只以数字ID被引用
+    """
+    package, name = item["package"], item["name"]
+    keys = [f"{package}/{name}"]
+    if "/" in package:
+        # 只有具体的包路径（如 custom_model/134218935）才代表单个模型，ui 等公共包名不算
+        keys.append(package)
+    package_tail = package.rsplit("/", 1)[-1]
+    if package_tail.isdigit():
+        keys.append(package_tail)
+    if name.isdigit():
+        keys.append(name)
+    return keys
+
+
+def _dir_size(path: Path) -> int:
+    """目录内文件总字节数"""
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for filename in files:
+            total += os.path.getsize(os.path.join(root, filename))
+    return total
+
+
+class AssetGC:
+    """基于依赖可达性的资源回收"""
+
+    def __init__(self, project_dir: Union[str, Path]):
+        """
+        初始化资源回收
+
+        Args:
+            project_dir: 地图项目目录
+        """
+        self.project_dir = Path(project_dir)
+        self.index = ResourceIndex.load(self.project_dir)
+        # 上次 analyze() 时无法解析的根文件
+        self.unreadable: List[str] = []
+
+    def find_roots(self, references: Set[str]) -> Set[str]:
+        """被根文件引用的资源GUID"""
+        return {
+            guid for guid, item in self.index.items.items()
+            if guid in references or any(key in references for key in reference_keys(item))
+        }
+
+    def analyze(self) -> Dict[str, Any]:
+        """
+        计算不可达资源
+
+        Returns:
+            分析结果：资源总数、根数、可达数、不可达资源列表、可回收字节数，
+            以及无法解析的根文件（不为空时不可达列表中可能包含仍在使用的资源）
+        """
+        self.unreadable = []
+        roots = self.find_roots(collect_references(self.project_dir, unreadable=self.unreadable))
+        reachable = self.index.closure(roots)
+
+        garbage = []
+        reclaimable = 0
+        for guid, item in self.index.items.items():
+            if guid in reachable:
+                continue
+            rel_dir = self.index.resource_dir(guid)
+            size = _dir_size(self.project_dir / rel_dir) if rel_dir else 0
+            garbage.append({
+                "guid": guid,
+                "type": item["type"],
+                "package": item["package"],
+                "name": item["name"],
+                "path": rel_dir,
+                "size": size
+            })
+            reclaimable += size
+
+        return {
+            "total": len(self.index),
+            "roots": len(roots),
+            "reachable": len(reachable),
+            "garbage": garbage,
+            "reclaimable_bytes": reclaimable,
+            "unreadable": list(self.unreadable)
+        }
+
+    def prune(self, garbage: List[Dict[str, Any]]) -> int:
+        """
+        删除不可达资源：从 resource.repository 中移除记录并删除资源目录
+
+        Args:
+            garbage: analyze() 返回的不可达资源列表
+
+        Returns:
+            删除的资源数
+
+        Raises:
+            ValueError: 上次分析时有根文件无法解析，其引用的资源可能被误判为不可达
+        """
+        if not garbage:
+            return 0
+        if self.unreadable:
+            raise ValueError(f"有 {len(self.unreadable)} 个根文件无法解析，已取消删除")
+
+        guids = {entry["guid"] for entry in garbage}
+        repository_file = self.project_dir / REPOSITORY_FILE
+        with open(repository_file, 'r', encoding='utf-8', newline='') as f:
+            lines = f.readlines()
+
+        # 编辑器每条 <Item> 独占一行，按行过滤可保持文件其余部分不变
+        kept = [line for line in lines
+                if not (line.startswith("<Item>") and self._line_guid(line) in guids)]
+        if len(lines) - len(kept) != len(guids):
+            raise ValueError("resource.repository 格式与预期不符，已取消删除")
+
+        tmp_file = repository_file.with_name(repository_file.name + ".tmp")
+        with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+            f.writelines(kept)
+        os.replace(tmp_file, repository_file)
+
+        for entry in garbage:
+            resource_dir = self.project_dir / entry["path"]
+            if resource_dir.is_dir():
+                shutil.rmtree(resource_dir)
+            parent = resource_dir.parent
+            if parent.is_dir() and not any(parent.iterdir()):
+                parent.rmdir()
+
+        self.index = ResourceIndex.load(self.project_dir)
+        return len(guids)
+
+    @staticmethod
+    def _line_guid(line: str) -> str:
+        """取出一行 <Item> 记录中的GUID"""
+        start = line.find("<GUID>")
+        end = line.find("</GUID>", start)
+        if start < 0 or end < 0:
+            return ""
+        return line[start + len("<GUID>"):end]
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+编辑器数据表的列式加载
+maps/<地图>/tables/*.json 中 table_data.data 的第0行为列名、第1行为列类型
+（string、int、float、unit_type等），其余为数据行；按声明的类型把每列转换为
+NumPy数组，便于对整列做向量化计算，并可按编辑器格式原样写回
+"""
+
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from src.infrastructure.y3 import tuple_json
+
+
+# 列类型 -> NumPy类型；以 _type 结尾的类型（unit_type、ability_type等）和 image 为物编ID
+INT_TYPES = {"int", "image"}
+FLOAT_TYPES = {"float"}
+BOOL_TYPES = {"bool"}
+
+# 缺失值：整数列和ID列为0，浮点列为NaN，布尔列为False，字符串列为None
+INT_MISSING = 0
+FLOAT_MISSING = np.nan
+
+# 表头占用的行数（列名、列类型）
+HEADER_ROWS = 2
+
+
+def column_dtype(column_type: Optional[str]) -> Any:
+    """
+    列类型对应的NumPy类型
+
+    Args:
+        column_type: 表中声明的列类型
+
+    Returns:
+        np.int64、np.float64、np.bool_ 或 object
+    """
+    if column_type in INT_TYPES or (column_type or "").endswith("_type"):
+        return np.int64
+    if column_type in FLOAT_TYPES:
+        return np.float64
+    if column_type in BOOL_TYPES:
+        return np.bool_
+    return object
+
+
+def _parse_cell(value: Any, dtype: Any) -> Any:
+    """把单元格转换为列类型的值，缺失或无法转换时返回None"""
+    if value is None or value == "":
+        return None
+    try:
+        if dtype is np.int64:
+            return int(float(value)) if isinstance(value, str) else int(value)
+        if dtype is np.float64:
+            return float(value)
+        if dtype is np.bool_:
+            if isinstance(value, str):
+                return value.strip().lower() in ("1", "true")
+            return bool(value)
+    except (TypeError, ValueError):
+        return None
+    return value
+
+
+def _format_number(value: Any) -> str:
+    """数值写回为编辑器使用的字符串形式（整数值不带小数点）"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class EditorTable:
+    """列式的编辑器数据表"""
+
+    def __init__(self, document: Dict[str, Any]):
+        """
+        从表文件内容创建
+
+        Args:
+            document: 表文件解析结果（含 table_data）
+        """
+        self.document = document
+        rows: List[List[Any]] = document["table_data"]["data"]
+        header = rows[0] if rows else []
+        types = rows[1] if len(rows) > 1 else []
+        self._raw_rows = [list(row) for row in rows[HEADER_ROWS:]]
+        self._width = max((len(row) for row in rows), default=0)
+
+        self.names: List[str] = []
+        self.types: Dict[str, Optional[str]] = {}
+        self.columns: Dict[str, np.ndarray] = {}
+        self.valid: Dict[str, np.ndarray] = {}
+        self._positions: Dict[str, int] = {}
+        # 原单元格是否以字符串保存数值（如 "10"），写回时保持相同形式
+        self._string_coded: Dict[str, bool] = {}
+
+        for position, name in enumerate(header):
+            if name is None:
+                continue
+            name = str(name)
+            column_type = types[position] if position < len(types) else None
+            cells = [row[position] if position < len(row) else None for row in self._raw_rows]
+            self.names.append(name)
+            self.types[name] = column_type
+            self._positions[name] = position
+            self._string_coded[name] = any(isinstance(cell, str) for cell in cells)
+            self.columns[name], self.valid[name] = self._build_column(cells, column_type)
+
+    @staticmethod
+    def _build_column(cells: List[Any], column_type: Optional[str]):
+        """一列单元格转换为数组和有效值掩码"""
+        dtype = column_dtype(column_type)
+        parsed = [_parse_cell(cell, dtype) for cell in cells]
+        valid = np.fromiter((value is not None for value in parsed), dtype=np.bool_,
+                            count=len(parsed))
+        if dtype is object:
+            array = np.empty(len(parsed), dtype=object)
+            array[:] = parsed
+        else:
+            missing = {np.int64: INT_MISSING, np.float64: FLOAT_MISSING, np.bool_: False}[dtype]
+            array = np.fromiter((missing if value is None else value for value in parsed),
+                                dtype=dtype, count=len(parsed))
+        return array, valid
+
+    def __len__(self) -> int:
+        """数据行数（含编辑器保留的空行）"""
+        return len(self._raw_rows)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """按列名获取数组"""
+        return self.columns[name]
+
+    def __setitem__(self, name: str, values: Any) -> None:
+        """
+        替换已有列的值
+
+        Args:
+            name: 列名
+            values: 与行数等长的数组，浮点列中的NaN、对象列中的None视为缺失
+        """
+        if name not in self.columns:
+            raise KeyError(f"表中没有列: {name}")
+        dtype = column_dtype(self.types[name])
+        array = np.asarray(values, dtype=dtype)
+        if array.shape != (len(self),):
+            raise ValueError(f"列 {name} 的长度应为 {len(self)}，实际为 {array.shape}")
+        if dtype is np.float64:
+            valid = ~np.isnan(array)
+        elif dtype is object:
+            valid = np.fromiter((value is not None for value in array), dtype=np.bool_,
+                                count=len(array))
+        else:
+            valid = np.ones(len(array), dtype=np.bool_)
+        self.columns[name] = array
+        self.valid[name] = valid
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def row_mask(self) -> np.ndarray:
+        """至少有一列有值的行（排除编辑器保留的空行）"""
+        mask = np.zeros(len(self), dtype=np.bool_)
+        for valid in self.valid.values():
+            mask |= valid
+        return mask
+
+    def compact(self) -> Dict[str, np.ndarray]:
+        """去掉空行后的各列"""
+        mask = self.row_mask()
+        return {name: array[mask] for name, array in self.columns.items()}
+
+    def to_document(self) -> Dict[str, Any]:
+        """
+        转换回表文件内容
+
+        值未变化的单元格沿用原始内容，写回的文件与原文件逐字节一致
+        """
+        rows = [list(row) + [None] * (self._width - len(row)) for row in self._raw_rows]
+        # 每行需要保留的长度：原长度，或写入了原行末尾之后的单元格时延长到该单元格
+        lengths = [len(raw) for raw in self._raw_rows]
+        for name in self.names:
+            position = self._positions[name]
+            dtype = column_dtype(self.types[name])
+            array, valid = self.columns[name], self.valid[name]
+            for index, row in enumerate(rows):
+                original = row[position]
+                if not valid[index]:
+                    if _parse_cell(original, dtype) is not None:
+                        row[position] = None
+                    continue
+                value = array[index].item() if hasattr(array[index], "item") else array[index]
+                if _parse_cell(original, dtype) == value:
+                    continue
+                if dtype is not object and self._string_coded[name]:
+                    row[position] = _format_number(value)
+                else:
+                    row[position] = value
+                lengths[index] = max(lengths[index], position + 1)
+
+        # 去掉为对齐补上、且仍然为空的单元格，未命名的填充列保持不变
+        for row, length in zip(rows, lengths):
+            del row[length:]
+
+        document = dict(self.document)
+        table_data = dict(document["table_data"])
+        table_data["data"] = document["table_data"]["data"][:HEADER_ROWS] + rows
+        document["table_data"] = table_data
+        return document
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        """按编辑器格式写入表文件"""
+        tuple_json.dump_file(self.to_document(), file_path)
+
+
+def load_table(file_path: Union[str, Path]) -> EditorTable:
+    """
+    加载数据表
+
+    Args:
+        file_path: tables 目录下的表文件
+
+    Returns:
+        列式数据表
+    """
+    return EditorTable(tuple_json.load_file(file_path))
+
+
+def load_tables(map_dir: Union[str, Path]) -> Dict[str, EditorTable]:
+    """
+    加载地图的全部数据表
+
+    Args:
+        map_dir: 地图目录（如 maps/EntryMap）
+
+    Returns:
+        表名（文件名去掉后缀） -> 列式数据表
+    """
+    tables = {}
+    for file_path in sorted(Path(map_dir, "tables").glob("*.json")):
+        tables[file_path.stem] = load_table(file_path)
+    return tables
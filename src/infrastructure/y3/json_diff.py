@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+地图JSON语义对比
+对比两个快照（项目目录或对象存储中的快照目录树）中的JSON文件，输出对象级的变化，
+如 "unit 134222110 hp_max: 100 -> 200"：
+    先按内容哈希筛选，内容相同的文件不解析
+    解析时还原元组包装，为每个子树计算哈希（键排序，键顺序变化不算修改），
+    对比时哈希相同的子树直接跳过，只沿哈希不同的路径向下
+    物编表文件对应一个对象，logicres.json 等多条目文件中的每个条目对应一个对象
+"""
+
+import os
+import time
+import hashlib
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import file_digest
+from src.infrastructure.storage.delta_sync import scan_tree
+from src.infrastructure.storage.object_store import ObjectStore, load_tree
+from src.infrastructure.y3 import tuple_json
+from src.infrastructure.y3.object_index import MULTI_TABLE_SOURCES, SCRIPT_SOURCES, TABLE_SOURCES
+
+
+# 参与对比的文件：.json 以及JSON格式的头文件
+DIFF_SUFFIXES = (".json",)
+DIFF_NAMES = ("header.map", "header.project")
+
+# 多条目文件（相对项目目录的glob） -> 对象所在的层级（第几层键是对象ID）
+KEYED_SOURCES = (
+    ("maps/*/logicres.json", 2),
+)
+
+# 变化类型
+ADDED = "added"
+REMOVED = "removed"
+CHANGED = "changed"
+
+# 子树哈希长度（字节）
+HASH_SIZE = 16
+
+
+class Node:
+    """带哈希的JSON子树"""
+
+    __slots__ = ("digest", "children", "value")
+
+    def __init__(self, digest: bytes, children: Any, value: Any):
+        self.digest = digest
+        # 字典为 键 -> Node，列表/元组为 Node 列表，标量为None
+        self.children = children
+        self.value = value
+
+
+def build_tree(value: Any) -> Node:
+    """
+    为解析结果的每个子树计算哈希
+
+    字典按键排序后计算，列表和元组区分类型；标量的哈希包含类型（1、1.0、True 不相同）
+
+    Args:
+        value: tuple_json 解析结果
+
+    Returns:
+        根节点
+    """
+    if isinstance(value, dict):
+        children = {key: build_tree(item) for key, item in value.items()}
+        digest = hashlib.blake2b(b"d", digest_size=HASH_SIZE)
+        for key in sorted(children):
+            digest.update(key.encode("utf-8", "surrogatepass"))
+            digest.update(b"\x00")
+            digest.update(children[key].digest)
+        return Node(digest.digest(), children, value)
+    if isinstance(value, (list, tuple)):
+        children = [build_tree(item) for item in value]
+        digest = hashlib.blake2b(b"t" if isinstance(value, tuple) else b"l", digest_size=HASH_SIZE)
+        for child in children:
+            digest.update(child.digest)
+        return Node(digest.digest(), children, value)
+    text = f"{type(value).__name__}:{value!r}".encode("utf-8", "surrogatepass")
+    return Node(hashlib.blake2b(text, digest_size=HASH_SIZE).digest(), None, value)
+
+
+def diff_trees(old: Node, new: Node, path: Tuple[Any, ...] = ()) -> Iterator[Tuple[str, Tuple[Any, ...], Any, Any]]:
+    """
+    对比两棵子树，哈希相同的子树直接跳过
+
+    列表按位置对比，长度不同时多出的元素为新增或删除
+
+    Returns:
+        (变化类型, 路径, 旧值, 新值) 序列，路径为键和下标组成的元组
+    """
+    if old.digest == new.digest:
+        return
+    if isinstance(old.children, dict) and isinstance(new.children, dict):
+        for key, child in old.children.items():
+            if key not in new.children:
+                yield REMOVED, path + (key,), child.value, None
+            else:
+                yield from diff_trees(child, new.children[key], path + (key,))
+        for key, child in new.children.items():
+            if key not in old.children:
+                yield ADDED, path + (key,), None, child.value
+        return
+    if isinstance(old.children, list) and isinstance(new.children, list) \
+            and type(old.value) is type(new.value):
+        for index, (old_child, new_child) in enumerate(zip(old.children, new.children)):
+            yield from diff_trees(old_child, new_child, path + (index,))
+        for index in range(len(new.children), len(old.children)):
+            yield REMOVED, path + (index,), old.children[index].value, None
+        for index in range(len(old.children), len(new.children)):
+            yield ADDED, path + (index,), None, new.children[index].value
+        return
+    yield CHANGED, path, old.value, new.value
+
+
+def format_path(path: Tuple[Any, ...]) -> str:
+    """路径格式化为 a.b[0].c"""
+    text = ""
+    for part in path:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        else:
+            text += f".{part}" if text else str(part)
+    return text
+
+
+def object_scope(rel_path: str) -> Tuple[str, int]:
+    """
+    文件中对象的名称和层级
+
+    Args:
+        rel_path: 相对项目目录的路径
+
+    Returns:
+        (名称, 层级)：层级为0时整个文件是一个对象，名称如 "unit 134222110"；
+        层级为n时第n层键是对象ID，对象名称为 "<名称> <ID>"
+    """
+    path = Path(rel_path)
+    for pattern, depth in KEYED_SOURCES:
+        if path.match(pattern):
+            return path.stem, depth
+    for pattern, kind in TABLE_SOURCES:
+        if path.match(pattern):
+            return f"{kind or path.parent.name} {path.stem}", 0
+    for pattern in SCRIPT_SOURCES:
+        if path.match(pattern):
+            return f"{path.parent.name} {path.stem}", 0
+    for pattern in MULTI_TABLE_SOURCES:
+        if path.match(pattern):
+            return path.stem, 1
+    return rel_path, 0
+
+
+def _change(rel_path: str, op: str, path: Tuple[Any, ...], old: Any, new: Any) -> Dict[str, Any]:
+    """组装一条对象级变化"""
+    name, depth = object_scope(rel_path)
+    if depth and len(path) >= depth:
+        name = f"{name} {path[depth - 1]}"
+        path = path[depth:]
+    return {"file": rel_path, "object": name, "field": format_path(path),
+            "op": op, "old": old, "new": new}
+
+
+def diff_documents(rel_path: str, old: Any, new: Any) -> List[Dict[str, Any]]:
+    """
+    对比同一文件的两个解析结果
+
+    Args:
+        rel_path: 相对项目目录的路径（用于确定对象名称）
+        old: 旧的解析结果
+        new: 新的解析结果
+
+    Returns:
+        变化列表，每条包含 file、object、field（对象内的字段路径，空字符串表示整个对象）、
+        op（added/removed/changed）、old、new
+    """
+    return [_change(rel_path, op, path, old_value, new_value)
+            for op, path, old_value, new_value in diff_trees(build_tree(old), build_tree(new))]
+
+
+class Snapshot:
+    """参与对比的一侧：项目目录或对象存储中的快照目录树"""
+
+    def __init__(self, sizes: Dict[str, int], digests: Dict[str, str],
+                 reader: Callable[[str], bytes], hasher: Optional[Callable[[str], str]] = None):
+        """
+        Args:
+            sizes: 相对路径 -> 文件大小
+            digests: 已知的内容哈希（快照目录树中记录的SHA-256）
+            reader: 读取文件内容
+            hasher: 计算不在 digests 中的文件哈希
+        """
+        self.sizes = sizes
+        self.digests = digests
+        self.reader = reader
+        self.hasher = hasher
+
+    @classmethod
+    def from_directory(cls, root: Union[str, Path]) -> "Snapshot":
+        """项目目录（内容哈希在需要时计算）"""
+        root = Path(root)
+        files, _ = scan_tree(root)
+        return cls({rel_path: st.st_size for rel_path, st in files.items()}, {},
+                   lambda rel_path: (root / rel_path).read_bytes(),
+                   lambda rel_path: file_digest(root / rel_path))
+
+    @classmethod
+    def from_tree(cls, tree_file: Union[str, Path], store: ObjectStore) -> "Snapshot":
+        """
+        对象存储中的快照目录树（备份、模板）
+
+        Raises:
+            ValueError: 目录树不存在或格式不符
+        """
+        tree = load_tree(Path(tree_file))
+        if tree is None:
+            raise ValueError(f"快照目录树无效: {tree_file}")
+        files = tree.get("files", {})
+        return cls({rel_path: entry["size"] for rel_path, entry in files.items()},
+                   {rel_path: entry["sha256"] for rel_path, entry in files.items()},
+                   lambda rel_path: store.read(files[rel_path]["sha256"]))
+
+    def digest(self, rel_path: str) -> str:
+        """文件内容哈希"""
+        digest = self.digests.get(rel_path)
+        if digest is None:
+            digest = self.digests[rel_path] = self.hasher(rel_path)
+        return digest
+
+    def load(self, rel_path: str) -> Any:
+        """解析文件，无法解析为JSON时返回None"""
+        try:
+            return tuple_json.loads(self.reader(rel_path))
+        except (ValueError, UnicodeDecodeError):
+            return None
+
+
+def is_diff_file(rel_path: str) -> bool:
+    """文件是否参与对比"""
+    name = rel_path.rsplit("/", 1)[-1]
+    return name.endswith(DIFF_SUFFIXES) or name in DIFF_NAMES
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> Dict[str, Any]:
+    """
+    对比两个快照中的JSON文件
+
+    大小不同的文件必定变化；大小相同时比较内容哈希，哈希相同的文件不解析
+
+    Args:
+        old: 旧快照
+        new: 新快照
+
+    Returns:
+        对比结果：
+            changes: 变化列表（见 diff_documents；整个文件无法解析时 field 为None）
+            files: 参与对比的文件数
+            parsed: 内容变化、实际解析对比的文件数
+            seconds: 耗时
+    """
+    start = time.perf_counter()
+    paths = sorted(rel_path for rel_path in set(old.sizes) | set(new.sizes) if is_diff_file(rel_path))
+    changes: List[Dict[str, Any]] = []
+    parsed = 0
+    for rel_path in paths:
+        if rel_path not in new.sizes:
+            changes.append(_change(rel_path, REMOVED, (), None, None))
+            continue
+        if rel_path not in old.sizes:
+            changes.append(_change(rel_path, ADDED, (), None, None))
+            continue
+        if old.sizes[rel_path] == new.sizes[rel_path] and old.digest(rel_path) == new.digest(rel_path):
+            continue
+
+        parsed += 1
+        old_data = old.load(rel_path)
+        new_data = new.load(rel_path)
+        if old_data is None or new_data is None:
+            change = _change(rel_path, CHANGED, (), None, None)
+            change["field"] = None
+            changes.append(change)
+            continue
+        changes.extend(diff_documents(rel_path, old_data, new_data))
+
+    return {
+        "changes": changes,
+        "files": len(paths),
+        "parsed": parsed,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def describe_change(change: Dict[str, Any], width: int = 60) -> str:
+    """
+    变化格式化为一行文本
+
+    Args:
+        change: diff_snapshots / diff_documents 返回的一条变化
+        width: 旧值、新值各自显示的最大长度
+    """
+    def short(value: Any) -> str:
+        text = repr(value)
+        return text if len(text) <= width else text[:width - 3] + "..."
+
+    target = change["object"] + (f" {change['field']}" if change["field"] else "")
+    if change["field"] is None:
+        return f"{target}: 内容变化（无法解析为JSON）"
+    if change["op"] == ADDED:
+        return f"{target}: 新增" + (f" {short(change['new'])}" if change["field"] else "")
+    if change["op"] == REMOVED:
+        return f"{target}: 删除" + (f" {short(change['old'])}" if change["field"] else "")
+    return f"{target}: {short(change['old'])} -> {short(change['new'])}"
+
+
+def open_snapshot(path: Union[str, Path], store: Optional[ObjectStore] = None) -> Snapshot:
+    """
+    打开项目目录或快照目录树文件
+
+    Args:
+        path: 目录或 .snapshot.json 文件
+        store: 快照目录树使用的对象存储
+
+    Raises:
+        ValueError: 路径不存在，或是快照目录树但未提供对象存储
+    """
+    if os.path.isdir(path):
+        return Snapshot.from_directory(path)
+    if not os.path.isfile(path):
+        raise ValueError(f"快照不存在: {path}")
+    if store is None:
+        raise ValueError(f"读取快照目录树需要对象存储: {path}")
+    return Snapshot.from_tree(path, store)
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+多语言检查
+一次遍历项目中的全部JSON（每个文件只读一次），收集其中出现的全部值和键，
+再与各语言文件的键集合做集合运算，找出：
+    缺失的键：物编表名称/描述字段引用了、但任何语言文件中都没有的键
+    缺失的翻译：被引用、某种语言中有但其他语言中没有的键
+    未使用的文本：语言文件中有、但项目中没有任何地方引用的键
+
+触发器中出现的值同样计入引用（不会被误报为未使用），但缺失的键只检查物编表的名称/描述字段：
+触发器参数中的文本是字面字符串，参数本身不标明其中的整数是否为多语言键，
+把触发器中的全部整数字面值当作键会产生大量误报
+"""
+
+import os
+import re
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+from src.infrastructure.y3.resource_index import REPOSITORY_DIR
+from src.infrastructure.y3.string_table import LANGUAGE_SUFFIX, StringTable
+
+
+# 地图物编表中以多语言键保存文本的字段（项目级 editor_table 中的名称是编辑器内置资源库的键，不检查）
+LANGUAGE_KEY_FIELDS = ("name", "description", "desc")
+
+# 以此开头的键由编辑器内置使用（玩家、阵营名称等），不算未使用
+SYSTEM_KEY_PREFIX = "$"
+
+# UI控件文本的键形如 #<控件GUID>#<属性>，控件存在即视为被引用
+UI_KEY_PATTERN = re.compile(r"^#([0-9a-f-]{36})#")
+
+# 不参与扫描的目录（相对项目目录）
+SKIP_DIRS = {CACHE_DIR_NAME, REPOSITORY_DIR}
+
+
+def _iter_json_files(project_dir: Path, language_files: Set[Path]):
+    """列出项目中需要扫描的JSON文件"""
+    stack = [project_dir]
+    while stack:
+        current = stack.pop()
+        with os.scandir(current) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    rel_path = Path(entry.path).relative_to(project_dir).as_posix()
+                    if rel_path not in SKIP_DIRS and entry.name != CACHE_DIR_NAME:
+                        stack.append(Path(entry.path))
+                elif entry.name.endswith(".json") and Path(entry.path) not in language_files:
+                    yield Path(entry.path)
+
+
+def _collect(data: Any, values: Set[str], key_refs: Dict[str, str], rel_path: str,
+             is_table: bool) -> None:
+    """
+    收集一个文件中出现的全部值（整数转为字符串）和字典键
+
+    Args:
+        data: 解析结果
+        values: 输出：出现过的值
+        key_refs: 输出：物编表名称/描述字段引用的键 -> 首次出现的文件
+        rel_path: 文件相对路径
+        is_table: 是否为物编表文件
+    """
+    stack: List[Tuple[Any, Any]] = [(data, None)]
+    while stack:
+        value, field = stack.pop()
+        if isinstance(value, dict):
+            for key, item in value.items():
+                values.add(key)
+                stack.append((item, key))
+        elif isinstance(value, list):
+            stack.extend((item, field) for item in value)
+        elif isinstance(value, str):
+            values.add(value)
+        elif isinstance(value, int) and not isinstance(value, bool):
+            text = str(value)
+            values.add(text)
+            if is_table and field in LANGUAGE_KEY_FIELDS:
+                key_refs.setdefault(text, rel_path)
+
+
+def audit(project_dir: Union[str, Path], map_name: str = "EntryMap") -> Dict[str, Any]:
+    """
+    检查地图的多语言文本
+
+    Args:
+        project_dir: 地图项目目录
+        map_name: 地图目录名（maps/<map_name>）
+
+    Returns:
+        检查结果：
+            languages: 语言代码 -> 键数
+            missing_keys: 缺失的键 -> 引用所在的文件
+            missing_translations: 语言代码 -> 缺少翻译的键
+            unused: 未使用的键
+            files: 扫描的文件数
+            seconds: 耗时
+            table: 字符串表（用于显示文本）
+    """
+    start = time.perf_counter()
+    project_dir = Path(project_dir)
+    map_dir = project_dir / "maps" / map_name
+    language_files = set(map_dir.glob("*" + LANGUAGE_SUFFIX))
+    table = StringTable.from_map(map_dir)
+    language_keys = {language: set(table.language_keys(language)) for language in table.languages}
+    all_keys = set(table.keys())
+
+    values: Set[str] = set()
+    key_refs: Dict[str, str] = {}
+    table_prefix = f"maps/{map_name}/editor_table/"
+    files = 0
+    for file_path in _iter_json_files(project_dir, language_files):
+        try:
+            with open(file_path, 'rb') as f:
+                data = json.loads(f.read())
+        except (ValueError, UnicodeDecodeError):
+            # 编辑器中有些 .json 文件是二进制数据
+            continue
+        rel_path = file_path.relative_to(project_dir).as_posix()
+        _collect(data, values, key_refs, rel_path, rel_path.startswith(table_prefix))
+        files += 1
+
+    used = all_keys & values
+    for key in all_keys - used:
+        match = UI_KEY_PATTERN.match(key)
+        if key.startswith(SYSTEM_KEY_PREFIX) or (match and match.group(1) in values):
+            used.add(key)
+
+    # 完全没有文本的语言视为未启用；未使用的文本不必翻译
+    missing_translations = {
+        language: sorted(used - keys)
+        for language, keys in language_keys.items() if keys
+    }
+
+    return {
+        "languages": {language: len(keys) for language, keys in language_keys.items()},
+        "missing_keys": {key: key_refs[key] for key in sorted(set(key_refs) - all_keys)},
+        "missing_translations": missing_translations,
+        "unused": sorted(all_keys - used),
+        "files": files,
+        "seconds": time.perf_counter() - start,
+        "table": table,
+    }
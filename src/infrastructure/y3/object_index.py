@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+物编对象索引
+把单位、技能、魔法效果、投射物等按ID分文件保存的物编数据汇总到项目 .cache 目录下的
+SQLite数据库：对象的名称、类型、模型、图标等关键字段，以及对象中出现的全部引用值，
+查询"某单位用了哪些技能""哪些单位使用了某模型"时不再需要打开所有文件；
+更新时只重新解析大小或修改时间变化的文件
+"""
+
+import json
+import time
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+from src.infrastructure.y3 import tuple_json
+
+
+# 索引数据库文件名（位于项目 .cache 目录）
+INDEX_DB_NAME = "object_index.sqlite"
+
+# 数据库结构版本，结构变化时递增，旧数据库会被重建
+SCHEMA_VERSION = 1
+
+# 物编表：每个文件一个对象（glob，相对项目目录） -> 对象类别，None表示使用所在目录名
+TABLE_SOURCES = (
+    ("maps/*/editor_table/editorunit/*.json", "unit"),
+    ("maps/*/editor_table/abilityall/*.json", "ability"),
+    ("maps/*/editor_table/modifierall/*.json", "modifier"),
+    ("maps/*/editor_table/projectileall/*.json", "projectile"),
+    ("maps/*/editor_table/editordecoration/*.json", "decoration"),
+    ("editor_table/*/*.json", None),
+)
+
+# 资源表：每个文件包含多个以键索引的条目，类别为文件名（如 resicon）
+MULTI_TABLE_SOURCES = ("editor_table/*.json",)
+
+# 对象的触发器/脚本数据：每个文件对应一个对象，类别为所在目录名
+SCRIPT_SOURCES = (
+    "maps/*/unit/*.json",
+    "maps/*/ability/*.json",
+    "maps/*/modifier/*.json",
+    "maps/*/projectile/*.json",
+)
+
+# 对象名称所在的多语言文件（物编表中的name字段为多语言键）
+LANGUAGE_SOURCES = ("maps/*/zhlanguage.json",)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER
+);
+CREATE TABLE IF NOT EXISTS objects (
+    path TEXT, kind TEXT, id TEXT, map TEXT, source TEXT,
+    name TEXT, type INTEGER, model TEXT, icon TEXT, tags TEXT,
+    PRIMARY KEY (path, id)
+);
+CREATE INDEX IF NOT EXISTS objects_kind_id ON objects (kind, id);
+CREATE INDEX IF NOT EXISTS objects_id ON objects (id);
+CREATE TABLE IF NOT EXISTS refs (
+    path TEXT, kind TEXT, id TEXT, field TEXT, value TEXT
+);
+CREATE INDEX IF NOT EXISTS refs_value ON refs (value);
+CREATE INDEX IF NOT EXISTS refs_owner ON refs (kind, id);
+CREATE INDEX IF NOT EXISTS refs_path ON refs (path);
+CREATE TABLE IF NOT EXISTS language (
+    path TEXT, map TEXT, key TEXT, text TEXT, PRIMARY KEY (map, key)
+);
+CREATE INDEX IF NOT EXISTS language_path ON language (path);
+"""
+
+
+def _scalar(value: Any) -> Optional[str]:
+    """整数或数字字符串转换为引用值，其他值返回None"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str) and value.lstrip("-").isdigit():
+        return value
+    return None
+
+
+def _iter_refs(data: Dict[str, Any]) -> Iterable[Tuple[str, str]]:
+    """
+    对象中出现的全部引用值
+
+    Returns:
+        (顶层字段名, 值) 序列，嵌套结构中的值归到所在的顶层字段
+    """
+    for field, value in data.items():
+        seen = set()
+        stack = [value]
+        while stack:
+            current = stack.pop()
+            if isinstance(current, dict):
+                stack.extend(current.values())
+            elif isinstance(current, (list, tuple)):
+                stack.extend(current)
+            else:
+                ref = _scalar(current)
+                if ref is not None and ref not in seen:
+                    seen.add(ref)
+                    yield field, ref
+
+
+def _object_row(rel_path: str, kind: str, object_id: str, map_name: str, source: str,
+                data: Dict[str, Any]) -> tuple:
+    """对象记录的关键字段"""
+    tags = data.get("tags")
+    if isinstance(tags, (list, tuple)):
+        tags = json.dumps(list(tags), ensure_ascii=False)
+    else:
+        tags = None
+    data_type = data.get("type")
+    return (
+        rel_path, kind, object_id, map_name, source,
+        None if data.get("name") is None else str(data.get("name")),
+        data_type if isinstance(data_type, int) and not isinstance(data_type, bool) else None,
+        _scalar(data.get("model")),
+        _scalar(data.get("icon", data.get("ability_icon", data.get("modifier_icon")))),
+        tags
+    )
+
+
+class ObjectIndex:
+    """以SQLite保存、按文件增量维护的物编对象索引"""
+
+    def __init__(self, project_dir: Union[str, Path], db_path: Optional[Path] = None):
+        """
+        打开物编对象索引，不存在时创建
+
+        Args:
+            project_dir: 地图项目目录
+            db_path: 数据库文件，为None时使用 <项目>/.cache/object_index.sqlite
+        """
+        self.project_dir = Path(project_dir)
+        if db_path is None:
+            db_path = self.project_dir / CACHE_DIR_NAME / INDEX_DB_NAME
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """创建数据库结构，版本不一致时清空重建"""
+        self.conn.executescript(SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row["value"] != str(SCHEMA_VERSION):
+            with self.conn:
+                for table in ("files", "objects", "refs", "language"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                                  (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        """关闭数据库"""
+        self.conn.close()
+
+    def __enter__(self) -> "ObjectIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _scan_sources(self) -> Dict[str, Tuple[str, int, int]]:
+        """
+        列出全部源文件
+
+        Returns:
+            相对路径 -> (来源类别, 修改时间, 大小)
+        """
+        sources: Dict[str, Tuple[str, int, int]] = {}
+
+        def add(pattern: str, source: str) -> None:
+            for file_path in self.project_dir.glob(pattern):
+                if not file_path.is_file():
+                    continue
+                rel_path = file_path.relative_to(self.project_dir).as_posix()
+                st = file_path.stat()
+                sources.setdefault(rel_path, (source, st.st_mtime_ns, st.st_size))
+
+        for pattern, kind in TABLE_SOURCES:
+            add(pattern, "table")
+        for pattern in MULTI_TABLE_SOURCES:
+            add(pattern, "multi_table")
+        for pattern in SCRIPT_SOURCES:
+            add(pattern, "script")
+        for pattern in LANGUAGE_SOURCES:
+            add(pattern, "language")
+        return sources
+
+    @staticmethod
+    def _table_kind(rel_path: str) -> str:
+        """物编表文件对应的对象类别"""
+        for pattern, kind in TABLE_SOURCES:
+            if kind is not None and Path(rel_path).match(pattern):
+                return kind
+        return Path(rel_path).parent.name
+
+    @staticmethod
+    def _map_name(rel_path: str) -> str:
+        """文件所属的地图目录名，项目级文件返回空字符串"""
+        parts = rel_path.split("/")
+        return parts[1] if parts[0] == "maps" and len(parts) > 2 else ""
+
+    def update(self) -> Dict[str, Any]:
+        """
+        增量更新索引：只重新解析新增或大小、修改时间变化的文件，删除已移除文件的记录
+
+        Returns:
+            统计信息（扫描文件数、更新文件数、删除文件数、耗时秒数）
+        """
+        start = time.perf_counter()
+        sources = self._scan_sources()
+        indexed = {row["path"]: (row["mtime_ns"], row["size"])
+                   for row in self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+
+        changed = [rel_path for rel_path, (source, mtime_ns, size) in sources.items()
+                   if indexed.get(rel_path) != (mtime_ns, size)]
+        removed = [rel_path for rel_path in indexed if rel_path not in sources]
+
+        with self.conn:
+            for rel_path in removed + changed:
+                self._delete_file(rel_path)
+            for rel_path in changed:
+                source, mtime_ns, size = sources[rel_path]
+                self._index_file(rel_path, source)
+                self.conn.execute("INSERT INTO files VALUES (?, ?, ?)", (rel_path, mtime_ns, size))
+
+        return {
+            "scanned": len(sources),
+            "updated": len(changed),
+            "removed": len(removed),
+            "seconds": time.perf_counter() - start
+        }
+
+    def _delete_file(self, rel_path: str) -> None:
+        """删除一个文件贡献的全部记录"""
+        for table in ("files", "objects", "refs", "language"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel_path,))
+
+    def _index_file(self, rel_path: str, source: str) -> None:
+        """解析一个源文件并写入记录，无法解析的文件只记录文件状态"""
+        try:
+            data = tuple_json.load_file(self.project_dir / rel_path)
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"跳过无法解析的文件: {rel_path} ({e})")
+            return
+        if not isinstance(data, dict):
+            return
+
+        map_name = self._map_name(rel_path)
+        if source == "language":
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO language VALUES (?, ?, ?, ?)",
+                ((rel_path, map_name, key, text) for key, text in data.items()
+                 if isinstance(text, str))
+            )
+            return
+
+        if source == "multi_table":
+            kind = Path(rel_path).stem
+            entries = [(str(key), entry) for key, entry in data.items() if isinstance(entry, dict)]
+        elif source == "script":
+            kind = Path(rel_path).parent.name
+            entries = [(Path(rel_path).stem, data)]
+        else:
+            kind = self._table_kind(rel_path)
+            entries = [(str(data.get("key", Path(rel_path).stem)), data)]
+
+        for object_id, entry in entries:
+            self.conn.execute("INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                              _object_row(rel_path, kind, object_id, map_name, source, entry))
+            self.conn.executemany(
+                "INSERT INTO refs VALUES (?, ?, ?, ?, ?)",
+                ((rel_path, kind, object_id, field, value)
+                 for field, value in _iter_refs(entry) if value != object_id)
+            )
+
+    def _with_names(self, rows: Iterable[sqlite3.Row]) -> List[Dict[str, Any]]:
+        """转换为字典，并把多语言键形式的名称解析为文本"""
+        results = []
+        for row in rows:
+            record = dict(row)
+            name = record.get("name")
+            if name is not None:
+                text = self.conn.execute(
+                    "SELECT text FROM language WHERE key = ? ORDER BY map = ? DESC LIMIT 1",
+                    (name, record.get("map", ""))
+                ).fetchone()
+                if text is not None:
+                    record["name_key"] = name
+                    record["name"] = text["text"]
+            results.append(record)
+        return results
+
+    def get(self, object_id: Union[str, int], kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        按ID获取对象（同一ID可能同时有物编表和触发器数据）
+
+        Args:
+            object_id: 对象ID
+            kind: 对象类别，为None时不限
+        """
+        sql = "SELECT * FROM objects WHERE id = ?"
+        params: List[Any] = [str(object_id)]
+        if kind is not None:
+            sql += " AND kind = ?"
+            params.append(kind)
+        return self._with_names(self.conn.execute(sql + " ORDER BY source, path", params))
+
+    def find(self, name: str, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        按名称查找对象（匹配名称文本或多语言文本中的子串）
+
+        Args:
+            name: 名称片段
+            kind: 对象类别，为None时不限
+        """
+        pattern = f"%{name}%"
+        sql = """
+            SELECT DISTINCT objects.* FROM objects
+            LEFT JOIN language ON language.key = objects.name
+            WHERE (objects.name LIKE ? OR language.text LIKE ?)
+        """
+        params: List[Any] = [pattern, pattern]
+        if kind is not None:
+            sql += " AND objects.kind = ?"
+            params.append(kind)
+        return self._with_names(self.conn.execute(sql + " ORDER BY objects.kind, objects.id", params))
+
+    def references(self, object_id: Union[str, int], kind: Optional[str] = None,
+                   target_kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        对象引用的其他对象，如单位使用的技能（被引用对象只取物编表记录）
+
+        Args:
+            object_id: 对象ID
+            kind: 对象类别，为None时不限
+            target_kind: 只返回该类别的被引用对象
+
+        Returns:
+            被引用对象记录，附带引用所在的字段（field）
+        """
+        sql = """
+            SELECT DISTINCT refs.field AS field, target.* FROM refs
+            JOIN objects AS target ON target.id = refs.value AND target.source != 'script'
+            WHERE refs.id = ?
+        """
+        params: List[Any] = [str(object_id)]
+        if kind is not None:
+            sql += " AND refs.kind = ?"
+            params.append(kind)
+        if target_kind is not None:
+            sql += " AND target.kind = ?"
+            params.append(target_kind)
+        return self._with_names(self.conn.execute(sql + " ORDER BY target.kind, target.id", params))
+
+    def referenced_by(self, value: Union[str, int], field: Optional[str] = None,
+                      kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        引用了指定值的对象，如使用某模型的单位
+
+        Args:
+            value: 被引用的ID（对象ID、模型ID、图标ID等）
+            field: 只匹配该字段中的引用（如 model）
+            kind: 只返回该类别的对象
+
+        Returns:
+            引用方对象记录，附带引用所在的字段（field）
+        """
+        sql = """
+            SELECT DISTINCT refs.field AS field, owner.* FROM refs
+            JOIN objects AS owner ON owner.path = refs.path AND owner.id = refs.id
+            WHERE refs.value = ?
+        """
+        params: List[Any] = [str(value)]
+        if field is not None:
+            sql += " AND refs.field = ?"
+            params.append(field)
+        if kind is not None:
+            sql += " AND refs.kind = ?"
+            params.append(kind)
+        return self._with_names(self.conn.execute(sql + " ORDER BY owner.kind, owner.id", params))
+
+    def kinds(self) -> Dict[str, int]:
+        """各类别的对象数"""
+        return {row["kind"]: row["count"] for row in self.conn.execute(
+            "SELECT kind, COUNT(*) AS count FROM objects GROUP BY kind ORDER BY kind")}
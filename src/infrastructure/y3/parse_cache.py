@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+地图JSON解析缓存
+把解析结果以pickle分片保存在项目的 .cache/parse 目录下（每个JSON文件一个分片），
+分片以文件大小和修改时间校验，命中时完全跳过JSON解析，文件变化后自动失效重建
+"""
+
+import os
+import time
+import shutil
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Optional, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+from src.infrastructure.y3 import tuple_json
+
+
+# 分片格式版本，解析逻辑变化时递增使旧分片失效
+CACHE_VERSION = 1
+
+# 分片文件后缀
+SHARD_SUFFIX = ".pickle"
+
+# 临时文件后缀，修改时间超过宽限期的才视为残留（更新的可能是其他进程正在写入的分片）
+TMP_SUFFIX = ".tmp"
+TMP_GRACE_SECONDS = 3600
+
+# 记录上次清理时间的标记文件（缓存目录下），打开缓存时距上次清理超过间隔才自动清理
+PRUNE_MARKER = ".pruned"
+PRUNE_INTERVAL_SECONDS = 24 * 3600
+
+
+class ParseCache:
+    """按(路径, 大小, 修改时间)校验的持久化解析缓存"""
+
+    def __init__(self, project_dir: Union[str, Path], cache_dir: Optional[Path] = None,
+                 prune_on_open: bool = True):
+        """
+        初始化解析缓存
+
+        Args:
+            project_dir: 地图项目目录
+            cache_dir: 缓存目录，为None时使用 <项目>/.cache/parse
+            prune_on_open: 是否在打开时自动清理源文件已删除的分片；清理需要遍历整个缓存目录，
+                因此只在距上次清理超过 PRUNE_INTERVAL_SECONDS 时进行，其余打开只stat一个标记文件
+        """
+        self.project_dir = Path(project_dir)
+        if cache_dir is None:
+            self.cache_dir = self.project_dir / CACHE_DIR_NAME / "parse"
+        else:
+            self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+        if prune_on_open and self._prune_due():
+            self.prune()
+
+    def _prune_due(self) -> bool:
+        """
+        是否需要自动清理，需要时先更新标记文件
+
+        先更新标记再清理，同时打开缓存的其他进程看到新的标记后不会重复清理
+        """
+        marker = self.cache_dir / PRUNE_MARKER
+        try:
+            if time.time() - marker.stat().st_mtime < PRUNE_INTERVAL_SECONDS:
+                return False
+        except FileNotFoundError:
+            if not self.cache_dir.is_dir():
+                return False
+        try:
+            marker.touch()
+        except OSError:
+            return False
+        return True
+
+    def _shard_path(self, rel_path: str) -> Path:
+        """分片路径与源文件的相对路径一一对应"""
+        return self.cache_dir / (rel_path + SHARD_SUFFIX)
+
+    def _relative(self, file_path: Union[str, Path]) -> str:
+        """转换为相对项目目录、以"/"分隔的路径"""
+        path = Path(file_path)
+        if path.is_absolute() or not (self.project_dir / path).exists():
+            path = Path(os.path.relpath(path, self.project_dir))
+        if path.parts and path.parts[0] == "..":
+            raise ValueError(f"文件不在项目目录中: {file_path}")
+        return path.as_posix()
+
+    def load(self, file_path: Union[str, Path]) -> Any:
+        """
+        读取并解析JSON文件，优先使用缓存
+
+        Args:
+            file_path: 相对项目目录的路径或绝对路径
+
+        Returns:
+            解析结果（元组包装对象已还原为tuple）
+        """
+        rel_path = self._relative(file_path)
+        source_file = self.project_dir / rel_path
+        st = source_file.stat()
+        key = (CACHE_VERSION, rel_path, st.st_size, st.st_mtime_ns)
+
+        shard = self._shard_path(rel_path)
+        try:
+            with open(shard, 'rb') as f:
+                # 分片先写校验头再写数据，校验失败时不必反序列化数据
+                if pickle.load(f) == key:
+                    data = pickle.load(f)
+                    self.hits += 1
+                    return data
+        except FileNotFoundError:
+            pass
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            # 分片损坏，按未命中处理并重建
+            pass
+
+        self.misses += 1
+        data = tuple_json.load_file(source_file)
+        self._write_shard(shard, key, data)
+        return data
+
+    def _write_shard(self, shard: Path, key: tuple, data: Any) -> None:
+        """原子写入分片，并发进程不会读到写了一半的文件"""
+        try:
+            shard.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=shard.parent, suffix=TMP_SUFFIX)
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, shard)
+        except OSError as e:
+            # 缓存写入失败不影响解析结果
+            print(f"写入解析缓存失败: {shard} ({e})")
+
+    def invalidate(self, file_path: Union[str, Path]) -> None:
+        """删除指定文件的缓存分片"""
+        shard = self._shard_path(self._relative(file_path))
+        try:
+            shard.unlink()
+        except FileNotFoundError:
+            pass
+
+    def prune(self) -> int:
+        """
+        清理源文件已被删除的分片和残留的临时文件
+
+        源文件内容变化的分片在下次读取时会被覆盖，无需在这里处理；
+        临时文件只清理超过宽限期的，其他进程同时清理或写入时跳过已不存在的文件和非空目录
+
+        Returns:
+            删除的分片数
+        """
+        if not self.cache_dir.exists():
+            return 0
+
+        removed = 0
+        expired = time.time() - TMP_GRACE_SECONDS
+        for root, dirs, files in os.walk(self.cache_dir, topdown=False):
+            for filename in files:
+                shard = Path(root) / filename
+                if filename == PRUNE_MARKER:
+                    continue
+                try:
+                    if filename.endswith(SHARD_SUFFIX):
+                        rel_path = shard.relative_to(self.cache_dir).as_posix()[:-len(SHARD_SUFFIX)]
+                        if (self.project_dir / rel_path).is_file():
+                            continue
+                    elif filename.endswith(TMP_SUFFIX) and shard.stat().st_mtime > expired:
+                        continue
+                    shard.unlink()
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+            if root != str(self.cache_dir):
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    # 目录非空或已被删除
+                    pass
+        return removed
+
+    def clear(self) -> None:
+        """清空全部缓存"""
+        if self.cache_dir.exists():
+            shutil.rmtree(self.cache_dir)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+地图项目检查
+批量处理前快速确认项目可以被编辑器打开：
+    header.project 可以解析，入口地图存在且ID与其 header.map 一致
+    每个地图的 header.map 和物编表JSON可以解析
+    入口地图的物编表名称/描述引用的多语言键都存在
+"""
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from src.infrastructure.y3 import tuple_json
+from src.infrastructure.y3.localization_audit import audit
+
+
+# 项目和地图的头文件
+PROJECT_HEADER = "header.project"
+MAP_HEADER = "header.map"
+
+# 需要检查的物编表（相对地图目录）
+TABLE_PATTERNS = ("unit/*.json", "ability/*.json", "modifier/*.json", "projectile/*.json",
+                  "editor_table/*/*.json", "logicres.json")
+
+
+def _load_header(file_path: Path, problems: List[str], project_dir: Path) -> Optional[Dict[str, Any]]:
+    """读取头文件，失败时记录问题并返回None"""
+    rel_path = file_path.relative_to(project_dir).as_posix()
+    if not file_path.is_file():
+        problems.append(f"缺少 {rel_path}")
+        return None
+    try:
+        with open(file_path, 'rb') as f:
+            data = json.loads(f.read())
+    except (ValueError, UnicodeDecodeError) as e:
+        problems.append(f"{rel_path} 无法解析: {e}")
+        return None
+    if not isinstance(data, dict):
+        problems.append(f"{rel_path} 格式不正确")
+        return None
+    return data
+
+
+def validate_project(project_dir: Union[str, Path]) -> Dict[str, Any]:
+    """
+    检查地图项目
+
+    Args:
+        project_dir: 地图项目目录
+
+    Returns:
+        检查结果：
+            problems: 发现的问题（为空表示通过）
+            maps: 地图数
+            files: 检查的文件数
+            seconds: 耗时
+    """
+    start = time.perf_counter()
+    project_dir = Path(project_dir)
+    problems: List[str] = []
+    files = 0
+
+    project_header = _load_header(project_dir / PROJECT_HEADER, problems, project_dir)
+    map_dirs = sorted(path.parent for path in project_dir.glob(f"maps/*/{MAP_HEADER}"))
+    map_ids = {}
+    for map_dir in map_dirs:
+        header = _load_header(map_dir / MAP_HEADER, problems, project_dir)
+        files += 1
+        if header is not None:
+            map_ids[map_dir.name] = header.get("id")
+        for pattern in TABLE_PATTERNS:
+            for file_path in sorted(map_dir.glob(pattern)):
+                files += 1
+                try:
+                    tuple_json.load_file(file_path)
+                except (ValueError, UnicodeDecodeError) as e:
+                    problems.append(f"{file_path.relative_to(project_dir).as_posix()} 无法解析: {e}")
+
+    entry_map = (project_header or {}).get("entry_map") or {}
+    entry_name = entry_map.get("name")
+    if project_header is not None:
+        if entry_name not in map_ids:
+            problems.append(f"入口地图不存在: maps/{entry_name}")
+        elif entry_map.get("id") != map_ids[entry_name]:
+            problems.append(f"入口地图ID与 maps/{entry_name}/{MAP_HEADER} 不一致")
+
+    if entry_name in map_ids:
+        result = audit(project_dir, entry_name)
+        files += result["files"]
+        for key, rel_path in result["missing_keys"].items():
+            problems.append(f"{rel_path} 引用的多语言键不存在: {key}")
+
+    return {
+        "problems": problems,
+        "maps": len(map_dirs),
+        "files": files,
+        "seconds": time.perf_counter() - start,
+    }
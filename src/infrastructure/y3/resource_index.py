@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+导入资源索引
+用iterparse流式解析 custom/CustomImportRepo.local/resource.repository，
+建立按GUID、类型、包名、名称的字典索引以及正向/反向依赖关系，
+索引持久化到项目的 .cache 目录，resource.repository 未变化时不再解析XML
+"""
+
+import os
+import pickle
+import tempfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+
+
+# 资源仓库相对项目目录的位置
+REPOSITORY_DIR = "custom/CustomImportRepo.local"
+REPOSITORY_FILE = f"{REPOSITORY_DIR}/resource.repository"
+
+# 资源类型与仓库中存放目录不同名的情况，其余类型目录名与类型相同
+TYPE_FOLDERS = {
+    "CollisionShape": "Physics",
+    "ParticleSystem": "Effect",
+}
+
+# 持久化索引的格式版本
+INDEX_VERSION = 1
+INDEX_CACHE_NAME = "resource_index.pickle"
+
+
+def resource_folder(resource_type: str, guid: str) -> str:
+    """
+    获取资源在仓库中的目录（相对仓库根目录）
+
+    Args:
+        resource_type: 资源类型
+        guid: 资源GUID
+
+    Returns:
+        形如 Texture/00/{0088632e-...} 的相对路径
+    """
+    folder = TYPE_FOLDERS.get(resource_type, resource_type)
+    return f"{folder}/{guid[:2]}/{{{guid}}}"
+
+
+def _parse_item(elem: ET.Element) -> Dict[str, Any]:
+    """把一个 <Item> 元素转换为字典"""
+    item: Dict[str, Any] = {
+        "guid": elem.findtext("GUID", ""),
+        "type": elem.findtext("Type", ""),
+        "flags": int(elem.findtext("Flags", "0") or 0),
+        "package": elem.findtext("Package", ""),
+        "class": elem.findtext("Class", ""),
+        "name": elem.findtext("Name", ""),
+        "deps": [dep.text for dep in elem.findall("Deps") if dep.text],
+        "annotations": {}
+    }
+
+    annotation = elem.find("Annotation")
+    if annotation is not None:
+        item["source_path"] = annotation.findtext("SourcePath", "")
+        item["md5"] = annotation.findtext("MD5", "")
+        for anno in annotation.findall("Anno"):
+            key = anno.findtext("Key")
+            if key:
+                item["annotations"][key] = anno.findtext("Value", "")
+    return item
+
+
+class ResourceIndex:
+    """资源仓库索引"""
+
+    def __init__(self, items: Iterable[Dict[str, Any]]):
+        """
+        根据资源记录建立索引
+
+        Args:
+            items: 资源记录
+        """
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.types: Dict[str, List[str]] = {}
+        self.packages: Dict[str, List[str]] = {}
+        self.names: Dict[str, List[str]] = {}
+        self.forward: Dict[str, List[str]] = {}
+        self.reverse: Dict[str, List[str]] = {}
+
+        for item in items:
+            guid = item["guid"]
+            self.items[guid] = item
+            self.types.setdefault(item["type"], []).append(guid)
+            self.packages.setdefault(item["package"], []).append(guid)
+            self.names.setdefault(item["name"], []).append(guid)
+
+        for guid, item in self.items.items():
+            # 依赖边：<Deps> 以及注解中引用的其他资源（如网格引用的碰撞体）
+            edges = list(item["deps"])
+            for value in item["annotations"].values():
+                if value in self.items and value not in edges:
+                    edges.append(value)
+            self.forward[guid] = edges
+            for dep in edges:
+                self.reverse.setdefault(dep, []).append(guid)
+
+    @classmethod
+    def parse(cls, repository_file: Union[str, Path]) -> "ResourceIndex":
+        """
+        流式解析resource.repository
+
+        Args:
+            repository_file: resource.repository 文件路径
+
+        Returns:
+            资源索引
+        """
+        def iter_items() -> Iterable[Dict[str, Any]]:
+            # 记录当前路径上的元素，处理完的 <Item> 从父元素中移除（clear()只清空其内容，
+            # 元素本身仍挂在父元素上），内存占用与仓库大小无关
+            path = []
+            for event, elem in ET.iterparse(str(repository_file), events=("start", "end")):
+                if event == "start":
+                    path.append(elem)
+                    continue
+                path.pop()
+                if elem.tag == "Item":
+                    yield _parse_item(elem)
+                    if path:
+                        path[-1].remove(elem)
+
+        return cls(iter_items())
+
+    @classmethod
+    def load(cls, project_dir: Union[str, Path], use_cache: bool = True) -> "ResourceIndex":
+        """
+        加载项目的资源索引，resource.repository 未变化时直接读取持久化的索引
+
+        Args:
+            project_dir: 地图项目目录
+            use_cache: 是否使用并更新持久化索引
+
+        Returns:
+            资源索引
+        """
+        project_dir = Path(project_dir)
+        repository_file = project_dir / REPOSITORY_FILE
+        if not repository_file.exists():
+            return cls([])
+
+        st = repository_file.stat()
+        key = (INDEX_VERSION, st.st_size, st.st_mtime_ns)
+        cache_file = project_dir / CACHE_DIR_NAME / INDEX_CACHE_NAME
+        if use_cache and cache_file.exists():
+            try:
+                with open(cache_file, 'rb') as f:
+                    if pickle.load(f) == key:
+                        index: ResourceIndex = pickle.load(f)
+                        return index
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+                pass
+
+        index = cls.parse(repository_file)
+        if use_cache:
+            index._save(cache_file, key)
+        return index
+
+    def _save(self, cache_file: Path, key: tuple) -> None:
+        """原子写入持久化索引"""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(key, f, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_name, cache_file)
+        except OSError as e:
+            print(f"保存资源索引失败: {cache_file} ({e})")
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, guid: str) -> bool:
+        return guid in self.items
+
+    def get(self, guid: str) -> Optional[Dict[str, Any]]:
+        """按GUID获取资源记录"""
+        return self.items.get(guid)
+
+    def by_type(self, resource_type: str) -> List[str]:
+        """获取指定类型的全部GUID"""
+        return self.types.get(resource_type, [])
+
+    def by_package(self, package: str) -> List[str]:
+        """获取指定包中的全部GUID，如 custom_model/134233158"""
+        return self.packages.get(package, [])
+
+    def by_name(self, name: str) -> List[str]:
+        """获取指定名称的全部GUID（名称可能重复）"""
+        return self.names.get(name, [])
+
+    def dependencies(self, guid: str) -> List[str]:
+        """资源直接依赖的资源，如材质引用的贴图"""
+        return self.forward.get(guid, [])
+
+    def dependents(self, guid: str) -> List[str]:
+        """直接依赖该资源的资源，如使用某张贴图的材质"""
+        return self.reverse.get(guid, [])
+
+    def closure(self, roots: Iterable[str], reverse: bool = False) -> Set[str]:
+        """
+        计算传递依赖闭包
+
+        Args:
+            roots: 起始GUID
+            reverse: 为True时沿反向边查找所有（间接）使用者
+
+        Returns:
+            包含起始GUID在内的可达GUID集合
+        """
+        edges = self.reverse if reverse else self.forward
+        seen: Set[str] = set()
+        queue = deque(guid for guid in roots if guid in self.items)
+        seen.update(queue)
+        while queue:
+            for dep in edges.get(queue.popleft(), []):
+                if dep not in seen and dep in self.items:
+                    seen.add(dep)
+                    queue.append(dep)
+        return seen
+
+    def resource_dir(self, guid: str) -> Optional[str]:
+        """资源目录（相对项目目录），GUID不存在时返回None"""
+        item = self.items.get(guid)
+        if item is None:
+            return None
+        return f"{REPOSITORY_DIR}/{resource_folder(item['type'], guid)}"
@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+逻辑资源空间索引
+maps/<地图>/logicres.json 按类别（"2048" 矩形区域、"131072" 点光源、"1048576" 局部雾等）
+保存场景中放置的逻辑资源，坐标为 [整数部分, 小数部分/2^32] 形式的定点数，
+pos 依次为 x、高度、z；按水平面 (x, z) 把每个资源的外接矩形放入均匀网格，
+支持点查询、范围查询、最近邻查询和重叠检测，查询时只检查相关网格中的资源
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from src.infrastructure.y3 import tuple_json
+
+
+# 定点数小数部分的分母
+FIXED_SCALE = 2 ** 32
+
+# 资源形状：矩形区域、局部雾等为矩形，圆形区域和灯光（按照射范围）为圆，其余为点
+RECT = "rect"
+CIRCLE = "circle"
+POINT = "point"
+
+# 自动选择网格大小时，平均每个网格容纳的资源数
+TARGET_PER_CELL = 4
+
+Bounds = Tuple[float, float, float, float]
+
+
+def fixed_to_float(value: Any) -> float:
+    """
+    定点数转换为浮点数
+
+    Args:
+        value: [整数部分, 小数部分] 或普通数值
+    """
+    if isinstance(value, (list, tuple)):
+        return value[0] + value[1] / FIXED_SCALE
+    return float(value)
+
+
+def _vector(value: Any) -> List[float]:
+    """pos、scale 等元组转换为浮点数列表"""
+    return [fixed_to_float(item) for item in value] if isinstance(value, (list, tuple)) else []
+
+
+class Placement:
+    """一个放置在场景中的逻辑资源"""
+
+    __slots__ = ("id", "category", "name", "shape", "x", "y", "z", "radius", "bounds", "data")
+
+    def __init__(self, entry_id: int, category: str, name: str, shape: str,
+                 x: float, y: float, z: float, bounds: Bounds, radius: float = 0.0,
+                 data: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            entry_id: 资源ID
+            category: logicres.json 中的类别
+            name: 资源名称
+            shape: RECT、CIRCLE 或 POINT
+            x: 水平坐标
+            y: 高度
+            z: 水平坐标
+            bounds: 水平面上的外接矩形 (min_x, min_z, max_x, max_z)
+            radius: 圆的半径
+            data: 原始数据
+        """
+        self.id = entry_id
+        self.category = category
+        self.name = name
+        self.shape = shape
+        self.x = x
+        self.y = y
+        self.z = z
+        self.radius = radius
+        self.bounds = bounds
+        self.data = data
+
+    @classmethod
+    def from_entry(cls, category: str, entry: Dict[str, Any]) -> Optional["Placement"]:
+        """
+        从 logicres.json 的一个条目创建，没有位置的资源（如镜头）返回None
+
+        矩形区域以 pos 为中心，width/height 为x/z方向的边长；局部雾的 scale 为三个方向的边长
+        """
+        pos = _vector(entry.get("pos"))
+        if len(pos) < 3:
+            return None
+        x, y, z = pos[0], pos[1], pos[2]
+        shape, radius = POINT, 0.0
+        half_x = half_z = 0.0
+
+        if "width" in entry and "height" in entry:
+            shape = RECT
+            half_x = abs(fixed_to_float(entry["width"])) / 2
+            half_z = abs(fixed_to_float(entry["height"])) / 2
+        elif isinstance(entry.get("radius"), (int, float, list, tuple)):
+            shape, radius = CIRCLE, abs(fixed_to_float(entry["radius"]))
+        elif isinstance(entry.get("light_range"), (int, float)):
+            shape, radius = CIRCLE, abs(float(entry["light_range"]))
+        elif len(_vector(entry.get("scale"))) >= 3:
+            scale = _vector(entry["scale"])
+            shape = RECT
+            half_x, half_z = abs(scale[0]) / 2, abs(scale[2]) / 2
+        elif isinstance(entry.get("points"), (list, tuple)):
+            # 多边形区域按顶点的外接矩形处理
+            points = [_vector(point) for point in entry["points"]]
+            points = [point for point in points if len(point) >= 2]
+            if points:
+                xs = [point[0] for point in points]
+                zs = [point[-1] for point in points]
+                bounds = (x + min(xs), z + min(zs), x + max(xs), z + max(zs))
+                return cls(entry.get("id"), category, entry.get("name") or "", RECT,
+                           x, y, z, bounds, data=entry)
+
+        if shape == CIRCLE:
+            half_x = half_z = radius
+        bounds = (x - half_x, z - half_z, x + half_x, z + half_z)
+        return cls(entry.get("id"), category, entry.get("name") or "", shape,
+                   x, y, z, bounds, radius, entry)
+
+    def contains(self, x: float, z: float) -> bool:
+        """水平面上的点是否在资源范围内（点资源只在坐标重合时包含）"""
+        return self.distance(x, z) == 0.0
+
+    def distance(self, x: float, z: float) -> float:
+        """水平面上的点到资源边缘的距离，在范围内时为0"""
+        if self.shape == CIRCLE:
+            return max(0.0, math.hypot(x - self.x, z - self.z) - self.radius)
+        min_x, min_z, max_x, max_z = self.bounds
+        dx = max(min_x - x, 0.0, x - max_x)
+        dz = max(min_z - z, 0.0, z - max_z)
+        return math.hypot(dx, dz)
+
+    def overlaps(self, other: "Placement") -> bool:
+        """两个资源在水平面上是否重叠（边缘相接也算重叠）"""
+        if not _intersects(self.bounds, other.bounds):
+            return False
+        if self.shape == CIRCLE and other.shape == CIRCLE:
+            return math.hypot(self.x - other.x, self.z - other.z) <= self.radius + other.radius
+        if self.shape == CIRCLE:
+            return other.distance(self.x, self.z) <= self.radius
+        if other.shape == CIRCLE:
+            return self.distance(other.x, other.z) <= other.radius
+        return True
+
+    def __repr__(self) -> str:
+        return f"Placement({self.category}/{self.id} {self.name} {self.shape} x={self.x:.2f} z={self.z:.2f})"
+
+
+def _intersects(a: Bounds, b: Bounds) -> bool:
+    """两个外接矩形是否相交"""
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+class SpatialIndex:
+    """均匀网格空间索引"""
+
+    def __init__(self, placements: List[Placement], cell_size: Optional[float] = None):
+        """
+        建立索引
+
+        Args:
+            placements: 逻辑资源
+            cell_size: 网格边长，为None时按资源分布自动选择
+        """
+        self.placements = list(placements)
+        self._by_id = {placement.id: placement for placement in self.placements}
+        self.cell_size = cell_size or self._auto_cell_size()
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        for index, placement in enumerate(self.placements):
+            for cell in self._cells_of(placement.bounds):
+                self._cells.setdefault(cell, []).append(index)
+        if self._cells:
+            self._cell_range = (min(i for i, _ in self._cells), min(j for _, j in self._cells),
+                                max(i for i, _ in self._cells), max(j for _, j in self._cells))
+        else:
+            self._cell_range = (0, 0, 0, 0)
+
+    @classmethod
+    def from_file(cls, logicres_file: Union[str, Path],
+                  categories: Optional[Set[str]] = None,
+                  cell_size: Optional[float] = None) -> "SpatialIndex":
+        """
+        从 logicres.json 建立索引
+
+        Args:
+            logicres_file: logicres.json 路径
+            categories: 只索引这些类别，为None时索引全部
+            cell_size: 网格边长
+        """
+        data = tuple_json.load_file(logicres_file)
+        placements = []
+        for category, entries in data.items():
+            if categories is not None and category not in categories:
+                continue
+            if not isinstance(entries, dict):
+                continue
+            for entry in entries.values():
+                if isinstance(entry, dict):
+                    placement = Placement.from_entry(category, entry)
+                    if placement is not None:
+                        placements.append(placement)
+        return cls(placements, cell_size)
+
+    @classmethod
+    def from_map(cls, map_dir: Union[str, Path], **options: Any) -> "SpatialIndex":
+        """从地图目录（如 maps/EntryMap）的 logicres.json 建立索引"""
+        return cls.from_file(Path(map_dir) / "logicres.json", **options)
+
+    def _auto_cell_size(self) -> float:
+        """按资源分布范围和数量选择网格大小，使平均每个网格约有 TARGET_PER_CELL 个资源"""
+        if not self.placements:
+            return 1.0
+        min_x = min(p.bounds[0] for p in self.placements)
+        min_z = min(p.bounds[1] for p in self.placements)
+        max_x = max(p.bounds[2] for p in self.placements)
+        max_z = max(p.bounds[3] for p in self.placements)
+        area = max(max_x - min_x, 1e-6) * max(max_z - min_z, 1e-6)
+        return max(math.sqrt(area * TARGET_PER_CELL / len(self.placements)), 1e-3)
+
+    def _cell(self, x: float, z: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(z / self.cell_size)
+
+    def _cells_of(self, bounds: Bounds) -> Iterator[Tuple[int, int]]:
+        """外接矩形覆盖的网格"""
+        i0, j0 = self._cell(bounds[0], bounds[1])
+        i1, j1 = self._cell(bounds[2], bounds[3])
+        for i in range(i0, i1 + 1):
+            for j in range(j0, j1 + 1):
+                yield i, j
+
+    def _ring_cells(self, ci: int, cj: int, ring: int) -> Iterator[Tuple[int, int]]:
+        """以 (ci, cj) 为中心、切比雪夫距离为ring的一圈网格，只列出有资源的网格范围内的部分"""
+        min_i, min_j, max_i, max_j = self._cell_range
+        if ring == 0:
+            if min_i <= ci <= max_i and min_j <= cj <= max_j:
+                yield ci, cj
+            return
+        i0, i1 = max(ci - ring, min_i), min(ci + ring, max_i)
+        for j in (cj - ring, cj + ring):
+            if min_j <= j <= max_j:
+                for i in range(i0, i1 + 1):
+                    yield i, j
+        j0, j1 = max(cj - ring + 1, min_j), min(cj + ring - 1, max_j)
+        for i in (ci - ring, ci + ring):
+            if min_i <= i <= max_i:
+                for j in range(j0, j1 + 1):
+                    yield i, j
+
+    def _candidates(self, bounds: Bounds) -> Iterator[Placement]:
+        """外接矩形与bounds相交的资源（不重复）"""
+        seen: Set[int] = set()
+        for cell in self._cells_of(bounds):
+            for index in self._cells.get(cell, ()):
+                if index not in seen:
+                    seen.add(index)
+                    placement = self.placements[index]
+                    if _intersects(placement.bounds, bounds):
+                        yield placement
+
+    def __len__(self) -> int:
+        return len(self.placements)
+
+    def __iter__(self) -> Iterator[Placement]:
+        return iter(self.placements)
+
+    def get(self, entry_id: int) -> Optional[Placement]:
+        """按资源ID获取"""
+        return self._by_id.get(entry_id)
+
+    # ---- 查询 ----
+
+    def query_point(self, x: float, z: float, category: Optional[str] = None) -> List[Placement]:
+        """
+        包含该点的资源（如"这个点在哪些区域内"）
+
+        Args:
+            x: 水平坐标
+            z: 水平坐标
+            category: 只返回该类别
+        """
+        return [placement for placement in self._candidates((x, z, x, z))
+                if (category is None or placement.category == category)
+                and placement.contains(x, z)]
+
+    def query_range(self, min_x: float, min_z: float, max_x: float, max_z: float,
+                    category: Optional[str] = None) -> List[Placement]:
+        """
+        外接矩形与范围相交的资源
+
+        Args:
+            min_x, min_z, max_x, max_z: 查询范围
+            category: 只返回该类别
+        """
+        return [placement for placement in self._candidates((min_x, min_z, max_x, max_z))
+                if category is None or placement.category == category]
+
+    def within(self, x: float, z: float, distance: float,
+               category: Optional[str] = None) -> List[Tuple[float, Placement]]:
+        """
+        边缘到点的距离不超过distance的资源，按距离排序
+
+        Returns:
+            (距离, 资源) 列表
+        """
+        bounds = (x - distance, z - distance, x + distance, z + distance)
+        found = []
+        for placement in self._candidates(bounds):
+            if category is not None and placement.category != category:
+                continue
+            d = placement.distance(x, z)
+            if d <= distance:
+                found.append((d, placement))
+        found.sort(key=lambda item: item[0])
+        return found
+
+    def nearest(self, x: float, z: float, k: int = 1, category: Optional[str] = None,
+                exclude: Optional[Set[int]] = None) -> List[Tuple[float, Placement]]:
+        """
+        离点最近的k个资源（按到边缘的距离），从所在网格向外逐圈查找
+
+        Args:
+            x: 水平坐标
+            z: 水平坐标
+            k: 返回数量
+            category: 只查找该类别
+            exclude: 排除的资源ID（如查找某个资源的邻居时排除其自身）
+
+        Returns:
+            (距离, 资源) 列表，按距离排序
+        """
+        if k <= 0 or not self.placements:
+            return []
+        ci, cj = self._cell(x, z)
+        min_i, min_j, max_i, max_j = self._cell_range
+        max_ring = max(abs(ci - min_i), abs(ci - max_i), abs(cj - min_j), abs(cj - max_j))
+        # 点在网格范围之外时，从第一个与网格范围相交的圈开始
+        min_ring = max(min_i - ci, ci - max_i, min_j - cj, cj - max_j, 0)
+        # 网格内点到所在网格边界的最短距离，用于估计下一圈资源的最小距离
+        offset = min(x / self.cell_size - ci, ci + 1 - x / self.cell_size,
+                     z / self.cell_size - cj, cj + 1 - z / self.cell_size) * self.cell_size
+
+        seen: Set[int] = set()
+        found: List[Tuple[float, Placement]] = []
+        for ring in range(min_ring, max_ring + 1):
+            for cell in self._ring_cells(ci, cj, ring):
+                for index in self._cells.get(cell, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    placement = self.placements[index]
+                    if category is not None and placement.category != category:
+                        continue
+                    if exclude and placement.id in exclude:
+                        continue
+                    found.append((placement.distance(x, z), placement))
+            # 未检查的资源都在当前圈之外，距离不小于 ring * cell_size + offset
+            if len(found) >= k:
+                found.sort(key=lambda item: item[0])
+                if found[k - 1][0] <= ring * self.cell_size + offset:
+                    break
+        found.sort(key=lambda item: item[0])
+        return found[:k]
+
+    def overlapping(self, entry_id: int, category: Optional[str] = None) -> List[Placement]:
+        """与指定资源重叠的其他资源"""
+        placement = self._by_id.get(entry_id)
+        if placement is None:
+            return []
+        return [other for other in self._candidates(placement.bounds)
+                if other is not placement
+                and (category is None or other.category == category)
+                and placement.overlaps(other)]
+
+    def overlaps(self, category: Optional[str] = None) -> List[Tuple[Placement, Placement]]:
+        """
+        所有互相重叠的资源对，每对只在两者共同覆盖的第一个网格中检查一次
+
+        Args:
+            category: 只检查该类别的资源
+        """
+        pairs = []
+        for (i, j), indexes in self._cells.items():
+            for a_pos, a in enumerate(indexes):
+                first = self.placements[a]
+                if category is not None and first.category != category:
+                    continue
+                for b in indexes[a_pos + 1:]:
+                    second = self.placements[b]
+                    if category is not None and second.category != category:
+                        continue
+                    if not first.overlaps(second):
+                        continue
+                    # 两个外接矩形交集的左下角所在网格负责报告这一对
+                    owner = self._cell(max(first.bounds[0], second.bounds[0]),
+                                       max(first.bounds[1], second.bounds[1]))
+                    if owner == (i, j):
+                        pairs.append((first, second))
+        return pairs
@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+紧凑的多语言字符串表
+地图的 *language.json 以有符号32位整数（也有少量 "$player 1" 这类名称）为键；
+所有语言共用一份键表：整数键保存在有序的 array('i') 中二分查找，名称键单独排序保存，
+文本去重后拼接为一个UTF-8数据块并以偏移量索引，相同文本（如空的HTML片段）在所有语言中只存一份；
+可保存为二进制文件并以内存映射方式打开，同时打开大量地图的全部语言时几乎不占用内存
+"""
+
+import io
+import sys
+import mmap
+import json
+import struct
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Union
+
+
+# 二进制文件格式
+MAGIC = b"W3ST"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<4sIIIII")  # 标识、版本、语言数、整数键数、名称键数、文本数
+
+# 值索引中表示该语言缺少此键
+MISSING = 0xFFFFFFFF
+
+# 多语言文件名后缀，前缀即语言代码（zh、us、jp、user等）
+LANGUAGE_SUFFIX = "language.json"
+
+# 缺省查询语言
+DEFAULT_LANGUAGE = "zh"
+
+INT32_MIN = -2 ** 31
+INT32_MAX = 2 ** 31 - 1
+
+Key = Union[int, str]
+
+
+def int_key(key: Key) -> Optional[int]:
+    """键在32位整数范围内时返回整数，否则返回None（按名称键处理）"""
+    if isinstance(key, int):
+        return key if INT32_MIN <= key <= INT32_MAX else None
+    if key and key.lstrip("-").isdigit() and key == str(int(key)):
+        value = int(key)
+        if INT32_MIN <= value <= INT32_MAX:
+            return value
+    return None
+
+
+def _little_endian(values: array) -> array:
+    """数组转换为小端字节序（文件格式固定为小端）"""
+    if sys.byteorder == "big":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values
+
+
+def _pad(size: int) -> int:
+    """对齐到4字节需要补充的字节数"""
+    return -size % 4
+
+
+class StringTable:
+    """所有语言共用键表和文本数据块的字符串表"""
+
+    def __init__(self, languages: List[str], ids, names: List[str], value_index,
+                 offsets, blob, source: Optional[mmap.mmap] = None):
+        """
+        通常通过 build()、from_map() 或 open() 创建
+
+        Args:
+            languages: 语言代码
+            ids: 有序的整数键
+            names: 有序的名称键
+            value_index: 每种语言每个键的文本序号（语言 x (整数键 + 名称键)），缺失为MISSING
+            offsets: 文本在数据块中的起始偏移（比文本数多一项）
+            blob: 文本数据块
+            source: 内存映射的文件，关闭表时一并关闭
+        """
+        self.languages = list(languages)
+        self._language_pos = {language: i for i, language in enumerate(self.languages)}
+        self._ids = ids
+        self._names = names
+        self._value_index = value_index
+        self._offsets = offsets
+        self._blob = blob
+        self._source = source
+        self._slots = len(ids) + len(names)
+
+    @classmethod
+    def build(cls, languages: Dict[str, Dict[Key, str]]) -> "StringTable":
+        """
+        从各语言的字典创建
+
+        Args:
+            languages: 语言代码 -> {键: 文本}
+        """
+        language_codes = sorted(languages)
+        int_keys = set()
+        name_keys = set()
+        for entries in languages.values():
+            for key in entries:
+                number = int_key(key)
+                if number is None:
+                    name_keys.add(str(key))
+                else:
+                    int_keys.add(number)
+
+        ids = array('i', sorted(int_keys))
+        names = sorted(name_keys)
+        slot_of = {key: i for i, key in enumerate(ids)}
+        slot_of_name = {key: len(ids) + i for i, key in enumerate(names)}
+        slots = len(ids) + len(names)
+
+        # 文本去重：相同文本只保存一次
+        interned: Dict[str, int] = {}
+        blob = io.BytesIO()
+        offsets = array('I', [0])
+        value_index = array('I', [MISSING]) * (slots * len(language_codes))
+        for position, language in enumerate(language_codes):
+            base = position * slots
+            for key, text in languages[language].items():
+                if not isinstance(text, str):
+                    continue
+                number = int_key(key)
+                slot = slot_of[number] if number is not None else slot_of_name[str(key)]
+                index = interned.get(text)
+                if index is None:
+                    index = interned[text] = len(offsets) - 1
+                    blob.write(text.encode('utf-8'))
+                    offsets.append(blob.tell())
+                value_index[base + slot] = index
+
+        return cls(language_codes, ids, names, value_index, offsets, blob.getvalue())
+
+    @classmethod
+    def from_map(cls, map_dir: Union[str, Path]) -> "StringTable":
+        """
+        加载地图目录下的全部多语言文件
+
+        Args:
+            map_dir: 地图目录（如 maps/EntryMap）
+        """
+        return cls.build(load_language_files(map_dir))
+
+    # ---- 查询 ----
+
+    def _slot(self, key: Key) -> Optional[int]:
+        """键在键表中的位置，不存在时返回None"""
+        number = int_key(key)
+        if number is not None:
+            i = bisect_left(self._ids, number)
+            if i < len(self._ids) and self._ids[i] == number:
+                return i
+            return None
+        name = str(key)
+        lo, hi = 0, len(self._names)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._names[mid] < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < len(self._names) and self._names[lo] == name:
+            return len(self._ids) + lo
+        return None
+
+    def _text(self, index: int) -> str:
+        """按序号取出文本"""
+        return bytes(self._blob[self._offsets[index]:self._offsets[index + 1]]).decode('utf-8')
+
+    def get(self, key: Key, language: str = DEFAULT_LANGUAGE,
+            default: Optional[str] = None) -> Optional[str]:
+        """
+        查询文本
+
+        Args:
+            key: 整数键或名称键（整数可以是字符串形式）
+            language: 语言代码
+            default: 键或该语言的翻译不存在时的返回值
+        """
+        position = self._language_pos.get(language)
+        slot = self._slot(key)
+        if position is None or slot is None:
+            return default
+        index = self._value_index[position * self._slots + slot]
+        if index == MISSING:
+            return default
+        return self._text(index)
+
+    def __contains__(self, key: Key) -> bool:
+        return self._slot(key) is not None
+
+    def __len__(self) -> int:
+        """键的数量（所有语言的并集）"""
+        return self._slots
+
+    def keys(self) -> Iterator[str]:
+        """全部键（字符串形式，与语言文件中的键一致）"""
+        for number in self._ids:
+            yield str(number)
+        yield from self._names
+
+    def language_keys(self, language: str) -> Iterator[str]:
+        """指定语言中有翻译的键"""
+        position = self._language_pos.get(language)
+        if position is None:
+            return
+        base = position * self._slots
+        for slot, key in enumerate(self.keys()):
+            if self._value_index[base + slot] != MISSING:
+                yield key
+
+    def stats(self) -> Dict[str, int]:
+        """键数、去重后的文本数和数据占用的字节数"""
+        return {
+            "languages": len(self.languages),
+            "keys": self._slots,
+            "texts": len(self._offsets) - 1,
+            "bytes": (len(self._ids) * 4 + len(self._value_index) * 4
+                      + len(self._offsets) * 4 + len(self._blob)
+                      + sum(len(name.encode('utf-8')) for name in self._names))
+        }
+
+    # ---- 二进制文件 ----
+
+    def save(self, file_path: Union[str, Path]) -> None:
+        """
+        保存为二进制文件（小端，各段按4字节对齐，可直接内存映射）
+
+        Args:
+            file_path: 目标文件
+        """
+        names_blob = io.BytesIO()
+        name_offsets = array('I', [0])
+        for name in self._names:
+            names_blob.write(name.encode('utf-8'))
+            name_offsets.append(names_blob.tell())
+        language_blob = "\n".join(self.languages).encode('utf-8')
+
+        file_path = Path(file_path)
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = file_path.with_name(file_path.name + ".tmp")
+        with open(tmp_file, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(self.languages), len(self._ids),
+                                len(self._names), len(self._offsets) - 1))
+            f.write(struct.pack("<I", len(language_blob)))
+            f.write(language_blob + b"\0" * _pad(len(language_blob)))
+            for values in (self._ids, name_offsets):
+                f.write(_little_endian(array(values.typecode, values)).tobytes())
+            names = names_blob.getvalue()
+            f.write(names + b"\0" * _pad(len(names)))
+            for values in (self._value_index, self._offsets):
+                f.write(_little_endian(array(values.typecode, values)).tobytes())
+            f.write(bytes(self._blob))
+        tmp_file.replace(file_path)
+
+    @classmethod
+    def open(cls, file_path: Union[str, Path], use_mmap: bool = True) -> "StringTable":
+        """
+        打开二进制文件
+
+        Args:
+            file_path: save() 写入的文件
+            use_mmap: 是否内存映射（只在访问时读取需要的页），否则一次读入内存
+        """
+        with open(file_path, 'rb') as f:
+            if use_mmap and sys.byteorder == "little":
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                source: Optional[mmap.mmap] = data
+            else:
+                data = f.read()
+                source = None
+
+        view = memoryview(data)
+        magic, version, n_languages, n_ids, n_names, n_texts = HEADER.unpack_from(view, 0)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise ValueError(f"不是有效的字符串表文件: {file_path}")
+
+        pos = HEADER.size
+        (language_size,) = struct.unpack_from("<I", view, pos)
+        pos += 4
+        languages = bytes(view[pos:pos + language_size]).decode('utf-8').split("\n")
+        languages = languages if language_size else []
+        pos += language_size + _pad(language_size)
+
+        def take(typecode: str, count: int):
+            nonlocal pos
+            size = count * 4
+            section = view[pos:pos + size]
+            pos += size
+            if source is not None:
+                return section.cast(typecode)
+            values = array(typecode)
+            values.frombytes(section)
+            return _little_endian(values)
+
+        ids = take('i', n_ids)
+        name_offsets = take('I', n_names + 1)
+        names_size = name_offsets[-1]
+        names_blob = bytes(view[pos:pos + names_size])
+        names = [names_blob[name_offsets[i]:name_offsets[i + 1]].decode('utf-8')
+                 for i in range(n_names)]
+        pos += names_size + _pad(names_size)
+        value_index = take('I', n_languages * (n_ids + n_names))
+        offsets = take('I', n_texts + 1)
+        blob = view[pos:pos + offsets[-1]]
+        return cls(languages, ids, names, value_index, offsets, blob, source)
+
+    def close(self) -> None:
+        """释放内存映射"""
+        if self._source is not None:
+            for attr in ("_ids", "_value_index", "_offsets", "_blob"):
+                value = getattr(self, attr)
+                if isinstance(value, memoryview):
+                    value.release()
+            self._source.close()
+            self._source = None
+
+    def __enter__(self) -> "StringTable":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def language_code(file_path: Path) -> str:
+    """多语言文件的语言代码（zhlanguage.json -> zh）"""
+    return file_path.name[:-len(LANGUAGE_SUFFIX)]
+
+
+def load_language_files(map_dir: Union[str, Path]) -> Dict[str, Dict[str, str]]:
+    """
+    读取地图目录下的全部多语言文件
+
+    userlanguage.json 的内容是字典列表，合并为一个字典
+
+    Returns:
+        语言代码 -> {键: 文本}
+    """
+    languages: Dict[str, Dict[str, str]] = {}
+    for file_path in sorted(Path(map_dir).glob("*" + LANGUAGE_SUFFIX)):
+        with open(file_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        entries: Dict[str, str] = {}
+        for part in (data if isinstance(data, list) else [data]):
+            if isinstance(part, dict):
+                entries.update(part)
+        languages[language_code(file_path)] = entries
+    return languages
+
+
+def iter_language_entries(table: StringTable) -> Iterator[Tuple[str, str, str]]:
+    """逐条列出 (语言, 键, 文本)"""
+    for language in table.languages:
+        for key in table.language_keys(language):
+            yield language, key, table.get(key, language)
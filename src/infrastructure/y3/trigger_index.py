@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+触发器索引
+触发器分散在 maps/<地图>/global_trigger/ 下每个触发器/函数一个的JSON、global_trigger.json
+以及单位、技能、魔法效果、投射物文件的 trigger_dict 中；每个触发器的事件、条件、动作
+是以 args_list 嵌套的树。把全部触发器展开为节点表（事件/条件/动作及其父节点），并建立
+倒排索引：事件类型、条件类型、动作类型、API（参数的 sub_type）、调用的自定义函数、
+变量和参数中的字面值（物编ID、属性名等），保存在项目 .cache 目录下的SQLite数据库，
+更新时只重新编译大小或修改时间变化的文件
+"""
+
+import re
+import time
+import sqlite3
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from src.infrastructure.storage.backup_manifest import CACHE_DIR_NAME
+from src.infrastructure.y3 import tuple_json
+
+
+# 索引数据库文件名（位于项目 .cache 目录）
+INDEX_DB_NAME = "trigger_index.sqlite"
+
+# 数据库结构版本，结构变化时递增，旧数据库会被重建
+SCHEMA_VERSION = 1
+
+# 触发器来源（glob，相对项目目录）
+TRIGGER_SOURCES = (
+    "global_trigger.json",
+    "global_trigger/**/*.json",
+    "maps/*/global_trigger.json",
+    "maps/*/global_trigger/**/*.json",
+    "maps/*/unit/*.json",
+    "maps/*/ability/*.json",
+    "maps/*/modifier/*.json",
+    "maps/*/projectile/*.json",
+)
+
+# 节点类型字段 -> 节点类别
+ELEMENT_FIELDS = (
+    ("event_type", "event"),
+    ("condition_type", "condition"),
+    ("action_type", "action"),
+)
+
+# 倒排索引的类别
+TERM_KINDS = ("event", "condition", "action", "api", "function", "variable", "value")
+
+# 参数 sub_type 为这些值时，args_list 中是变量引用 [类型, 名称(, 作用域)]
+VARIABLE_SUB_TYPES = {"VARIABLE", 6, 7}
+
+# 变量类型名（INTEGER、PLAYER、UNIT_ENTITY等）
+_VARIABLE_TYPE = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+# 自定义函数ID（CALL_TRIGGER_FUNC 参数的 sub_type）
+_FUNCTION_ID = re.compile(r"^[0-9a-f]{32}$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER
+);
+CREATE TABLE IF NOT EXISTS triggers (
+    path TEXT, trigger_id INTEGER, name TEXT, kind TEXT, owner TEXT,
+    func_id TEXT, enabled INTEGER, nodes INTEGER,
+    PRIMARY KEY (path, trigger_id)
+);
+CREATE INDEX IF NOT EXISTS triggers_id ON triggers (trigger_id);
+CREATE INDEX IF NOT EXISTS triggers_func ON triggers (func_id);
+CREATE TABLE IF NOT EXISTS nodes (
+    path TEXT, trigger_id INTEGER, element_id INTEGER, parent_id INTEGER,
+    depth INTEGER, kind TEXT, type TEXT, enabled INTEGER
+);
+CREATE INDEX IF NOT EXISTS nodes_trigger ON nodes (trigger_id);
+CREATE INDEX IF NOT EXISTS nodes_element ON nodes (path, trigger_id, element_id);
+CREATE TABLE IF NOT EXISTS terms (
+    path TEXT, trigger_id INTEGER, element_id INTEGER, kind TEXT, term TEXT, detail TEXT
+);
+CREATE INDEX IF NOT EXISTS terms_term ON terms (kind, term);
+CREATE INDEX IF NOT EXISTS terms_path ON terms (path);
+"""
+
+
+def _variable_ref(value: Any) -> Optional[Tuple[str, str, str]]:
+    """变量引用 [类型, 名称(, 作用域)] 解析为 (名称, 类型, 作用域)，全局变量的作用域为 global"""
+    if (isinstance(value, (list, tuple)) and len(value) in (2, 3)
+            and all(isinstance(item, str) for item in value)
+            and _VARIABLE_TYPE.match(value[0]) and value[1]):
+        return value[1], value[0], value[2] if len(value) == 3 else "global"
+    return None
+
+
+def _literal(value: Any) -> Optional[str]:
+    """参数中的字面值（整数、字符串）转换为索引词，其他值返回None"""
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, str) and value:
+        return value
+    return None
+
+
+def compile_trigger(trigger: Dict[str, Any]) -> Tuple[List[tuple], List[tuple]]:
+    """
+    展开一个触发器
+
+    Args:
+        trigger: 触发器数据（含 event、condition、action）
+
+    Returns:
+        (节点列表, 索引词列表)
+        节点为 (element_id, parent_id, depth, 类别, 类型, 是否启用)
+        索引词为 (element_id, 类别, 词, 附加信息)，同一节点中重复的词只记录一次
+    """
+    nodes: List[tuple] = []
+    terms: Dict[tuple, None] = {}
+    # (值, 所属节点ID, 深度, 是否位于参数列表中)
+    stack: List[Tuple[Any, Optional[int], int, bool]] = []
+    for field in ("action", "condition", "event"):
+        value = trigger.get(field)
+        if isinstance(value, (list, tuple)):
+            stack.extend((item, None, 0, False) for item in reversed(value))
+
+    while stack:
+        value, parent_id, depth, in_args = stack.pop()
+        if isinstance(value, dict):
+            element_type = None
+            for type_field, kind in ELEMENT_FIELDS:
+                if isinstance(value.get(type_field), str):
+                    element_type = value[type_field]
+                    break
+            if element_type is not None:
+                element_id = value.get("element_id")
+                nodes.append((element_id, parent_id, depth, kind, element_type,
+                              int(value.get("enable", True) is not False)))
+                terms[(element_id, kind, element_type, None)] = None
+                children = value.get("args_list") or ()
+                stack.extend((item, element_id, depth + 1, True) for item in reversed(children))
+                continue
+
+            if "arg_type" in value:
+                sub_type = value.get("sub_type")
+                children = value.get("args_list") or ()
+                if sub_type in VARIABLE_SUB_TYPES:
+                    for item in children:
+                        ref = _variable_ref(item)
+                        if ref is not None:
+                            name, var_type, scope = ref
+                            terms[(parent_id, "variable", name, f"{var_type} {scope}")] = None
+                elif isinstance(sub_type, str):
+                    if _FUNCTION_ID.match(sub_type):
+                        terms[(parent_id, "function", sub_type, None)] = None
+                    else:
+                        terms[(parent_id, "api", sub_type, None)] = None
+                for item in reversed(children):
+                    if _variable_ref(item) is None:
+                        stack.append((item, parent_id, depth, True))
+                continue
+
+            stack.extend((item, parent_id, depth, in_args) for item in value.values())
+        elif isinstance(value, (list, tuple)):
+            ref = _variable_ref(value) if in_args else None
+            if ref is not None:
+                name, var_type, scope = ref
+                terms[(parent_id, "variable", name, f"{var_type} {scope}")] = None
+            else:
+                stack.extend((item, parent_id, depth, in_args) for item in reversed(value))
+        elif in_args:
+            literal = _literal(value)
+            if literal is not None:
+                terms[(parent_id, "value", literal, None)] = None
+    return nodes, list(terms)
+
+
+def iter_triggers(data: Any) -> Iterable[Dict[str, Any]]:
+    """
+    文件中的全部触发器：单个触发器/函数文件、对象文件的 trigger_dict、global_trigger.json 的 eatriggers
+    """
+    if not isinstance(data, dict):
+        return
+    if "trigger_id" in data and ("action" in data or "event" in data):
+        yield data
+    for container in (data.get("trigger_dict"), data.get("eatriggers")):
+        if isinstance(container, dict):
+            container = list(container.values())
+        if isinstance(container, (list, tuple)):
+            for trigger in container:
+                if isinstance(trigger, dict) and "trigger_id" in trigger:
+                    yield trigger
+
+
+class TriggerIndex:
+    """以SQLite保存、按文件增量维护的触发器索引"""
+
+    def __init__(self, project_dir: Union[str, Path], db_path: Optional[Path] = None):
+        """
+        打开触发器索引，不存在时创建
+
+        Args:
+            project_dir: 地图项目目录
+            db_path: 数据库文件，为None时使用 <项目>/.cache/trigger_index.sqlite
+        """
+        self.project_dir = Path(project_dir)
+        if db_path is None:
+            db_path = self.project_dir / CACHE_DIR_NAME / INDEX_DB_NAME
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.row_factory = sqlite3.Row
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        """创建数据库结构，版本不一致时清空重建"""
+        self.conn.executescript(SCHEMA)
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        if row is None or row["value"] != str(SCHEMA_VERSION):
+            with self.conn:
+                for table in ("files", "triggers", "nodes", "terms"):
+                    self.conn.execute(f"DELETE FROM {table}")
+                self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('version', ?)",
+                                  (str(SCHEMA_VERSION),))
+
+    def close(self) -> None:
+        """关闭数据库"""
+        self.conn.close()
+
+    def __enter__(self) -> "TriggerIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def _scan_sources(self) -> Dict[str, Tuple[int, int]]:
+        """
+        列出全部源文件
+
+        Returns:
+            相对路径 -> (修改时间, 大小)
+        """
+        sources: Dict[str, Tuple[int, int]] = {}
+        for pattern in TRIGGER_SOURCES:
+            for file_path in self.project_dir.glob(pattern):
+                if not file_path.is_file():
+                    continue
+                rel_path = file_path.relative_to(self.project_dir).as_posix()
+                if CACHE_DIR_NAME in rel_path.split("/"):
+                    continue
+                st = file_path.stat()
+                sources.setdefault(rel_path, (st.st_mtime_ns, st.st_size))
+        return sources
+
+    def update(self) -> Dict[str, Any]:
+        """
+        增量更新索引：只重新编译新增或大小、修改时间变化的文件，删除已移除文件的记录
+
+        Returns:
+            统计信息（扫描文件数、更新文件数、删除文件数、耗时秒数）
+        """
+        start = time.perf_counter()
+        sources = self._scan_sources()
+        indexed = {row["path"]: (row["mtime_ns"], row["size"])
+                   for row in self.conn.execute("SELECT path, mtime_ns, size FROM files")}
+
+        changed = [rel_path for rel_path, stamp in sources.items() if indexed.get(rel_path) != stamp]
+        removed = [rel_path for rel_path in indexed if rel_path not in sources]
+
+        with self.conn:
+            for rel_path in removed + changed:
+                self._delete_file(rel_path)
+            for rel_path in changed:
+                mtime_ns, size = sources[rel_path]
+                self._index_file(rel_path)
+                self.conn.execute("INSERT INTO files VALUES (?, ?, ?)", (rel_path, mtime_ns, size))
+
+        return {
+            "scanned": len(sources),
+            "updated": len(changed),
+            "removed": len(removed),
+            "seconds": time.perf_counter() - start
+        }
+
+    def _delete_file(self, rel_path: str) -> None:
+        """删除一个文件贡献的全部记录"""
+        for table in ("files", "triggers", "nodes", "terms"):
+            self.conn.execute(f"DELETE FROM {table} WHERE path = ?", (rel_path,))
+
+    @staticmethod
+    def _owner(rel_path: str) -> str:
+        """
+        触发器的归属：对象触发器为 类别/对象ID（如 unit/134222110），
+        全局触发器为所在目录（相对 global_trigger）
+        """
+        parts = rel_path.split("/")
+        if "global_trigger" in parts:
+            position = parts.index("global_trigger")
+            return "/".join(parts[position + 1:-1])
+        if len(parts) >= 2 and parts[-1].endswith(".json") and parts[-2] != "maps":
+            return f"{parts[-2]}/{Path(parts[-1]).stem}"
+        return ""
+
+    def _index_file(self, rel_path: str) -> None:
+        """编译一个源文件中的全部触发器并写入记录，无法解析的文件只记录文件状态"""
+        try:
+            data = tuple_json.load_file(self.project_dir / rel_path)
+        except (ValueError, UnicodeDecodeError) as e:
+            print(f"跳过无法解析的文件: {rel_path} ({e})")
+            return
+
+        for trigger in iter_triggers(data):
+            trigger_id = trigger.get("trigger_id")
+            nodes, terms = compile_trigger(trigger)
+            is_function = bool(trigger.get("is_func"))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO triggers VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (rel_path, trigger_id, trigger.get("func_name") or trigger.get("trigger_name"),
+                 "function" if is_function else "trigger", self._owner(rel_path),
+                 trigger.get("func_id") if is_function else None,
+                 int(trigger.get("enabled", True) is not False), len(nodes))
+            )
+            self.conn.executemany(
+                "INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((rel_path, trigger_id) + node for node in nodes)
+            )
+            self.conn.executemany(
+                "INSERT INTO terms VALUES (?, ?, ?, ?, ?, ?)",
+                ((rel_path, trigger_id) + term for term in terms)
+            )
+
+    # ---- 查询 ----
+
+    def search(self, kind: str, term: Union[str, int],
+               detail: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        查找使用了某个词的触发器
+
+        Args:
+            kind: 词的类别（event、condition、action、api、function、variable、value）
+            term: 词，如 SET_VARIABLE、变量名、物编ID
+            detail: 变量的类型和作用域片段（如 local、INTEGER），为None时不限
+
+        Returns:
+            触发器记录，附带所在节点（element_id、node_kind、node_type）和附加信息（detail）
+        """
+        if kind not in TERM_KINDS:
+            raise ValueError(f"未知的索引类别: {kind}，可用: {', '.join(TERM_KINDS)}")
+        sql = """
+            SELECT triggers.*, terms.element_id AS element_id, terms.detail AS detail,
+                   nodes.kind AS node_kind, nodes.type AS node_type
+            FROM terms
+            JOIN triggers ON triggers.path = terms.path AND triggers.trigger_id = terms.trigger_id
+            LEFT JOIN nodes ON nodes.path = terms.path AND nodes.trigger_id = terms.trigger_id
+                AND nodes.element_id = terms.element_id
+            WHERE terms.kind = ? AND terms.term = ?
+        """
+        params: List[Any] = [kind, str(term)]
+        if detail is not None:
+            sql += " AND terms.detail LIKE ?"
+            params.append(f"%{detail}%")
+        return [dict(row) for row in self.conn.execute(
+            sql + " ORDER BY triggers.path, triggers.trigger_id, terms.element_id", params)]
+
+    def triggers(self, name: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        列出触发器和函数
+
+        Args:
+            name: 名称片段，为None时列出全部
+        """
+        sql = "SELECT * FROM triggers"
+        params: List[Any] = []
+        if name is not None:
+            sql += " WHERE name LIKE ?"
+            params.append(f"%{name}%")
+        return [dict(row) for row in self.conn.execute(sql + " ORDER BY path, trigger_id", params)]
+
+    def locate(self, trigger_id: int) -> List[Dict[str, Any]]:
+        """
+        具有该ID的触发器记录
+
+        复制的物编对象沿用原对象的触发器，同一ID可能出现在多个文件中，
+        按ID查看节点或调用前用本方法确定所在文件
+        """
+        return [dict(row) for row in self.conn.execute(
+            "SELECT * FROM triggers WHERE trigger_id = ? ORDER BY path", (trigger_id,))]
+
+    def nodes(self, path: str, trigger_id: int) -> List[Dict[str, Any]]:
+        """
+        触发器展开后的节点（按树的先序排列）
+
+        Args:
+            path: 触发器所在文件（相对项目目录）
+            trigger_id: 触发器ID
+        """
+        return [dict(row) for row in self.conn.execute(
+            "SELECT * FROM nodes WHERE path = ? AND trigger_id = ? ORDER BY rowid",
+            (path, trigger_id))]
+
+    def callers(self, function: str) -> List[Dict[str, Any]]:
+        """
+        调用了自定义函数的触发器
+
+        Args:
+            function: 函数ID或函数名
+        """
+        rows = self.conn.execute(
+            "SELECT func_id FROM triggers WHERE kind = 'function' AND (func_id = ? OR name = ?)",
+            (function, function)).fetchall()
+        func_ids = [row["func_id"] for row in rows] or [function]
+        results = []
+        for func_id in func_ids:
+            results.extend(self.search("function", func_id))
+        return results
+
+    def calls(self, path: str, trigger_id: int) -> List[Dict[str, Any]]:
+        """
+        触发器调用的自定义函数
+
+        Args:
+            path: 触发器所在文件（相对项目目录）
+            trigger_id: 触发器ID
+        """
+        return [dict(row) for row in self.conn.execute("""
+            SELECT DISTINCT target.* FROM terms
+            JOIN triggers AS target ON target.func_id = terms.term
+            WHERE terms.kind = 'function' AND terms.path = ? AND terms.trigger_id = ?
+            ORDER BY target.path
+        """, (path, trigger_id))]
+
+    def term_counts(self, kind: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        某类词的使用次数（按触发器去重），从多到少
+
+        Args:
+            kind: 词的类别
+            limit: 最多返回的条数
+        """
+        sql = """
+            SELECT term, COUNT(DISTINCT path || ':' || trigger_id) AS count FROM terms
+            WHERE kind = ? GROUP BY term ORDER BY count DESC, term
+        """
+        params: List[Any] = [kind]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [(row["term"], row["count"]) for row in self.conn.execute(sql, params)]
+
+    def stats(self) -> Dict[str, int]:
+        """触发器、函数、节点和索引词的数量"""
+        count = lambda sql: self.conn.execute(sql).fetchone()[0]
+        return {
+            "triggers": count("SELECT COUNT(*) FROM triggers WHERE kind = 'trigger'"),
+            "functions": count("SELECT COUNT(*) FROM triggers WHERE kind = 'function'"),
+            "nodes": count("SELECT COUNT(*) FROM nodes"),
+            "terms": count("SELECT COUNT(*) FROM terms"),
+        }
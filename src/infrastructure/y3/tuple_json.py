@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Y3编辑器JSON编解码
+编辑器把元组写成 {"__tuple__": true, "items": [...]}，解码时通过object_hook
+在解析过程中直接还原为tuple，无需解析后再遍历整棵树；编码时按编辑器的格式写回
+"""
+
+import re
+import json
+from pathlib import Path
+from typing import IO, Any, Tuple, Union
+
+
+# 元组包装对象的键
+TUPLE_KEY = "__tuple__"
+ITEMS_KEY = "items"
+
+# 编辑器写出的JSON格式：4空格缩进、保留键顺序、逗号后带空格、非ASCII字符转义
+EDITOR_INDENT = 4
+EDITOR_SEPARATORS = (', ', ': ')
+
+# 匹配JSON字符串或指数部分带前导零的浮点数（Python写作1e-07，编辑器写作1e-7）
+_EXPONENT_PATTERN = re.compile(r'"(?:[^"\\]|\\.)*"|(?<=[0-9])e([+-]?)0+(?=[0-9])')
+_EXPONENT_HINT = re.compile(r'[0-9]e[+-]?0')
+
+
+def _object_hook(obj: dict) -> Any:
+    """解析每个JSON对象时调用，把元组包装对象还原为tuple"""
+    if len(obj) == 2 and obj.get(TUPLE_KEY) is True and ITEMS_KEY in obj:
+        return tuple(obj[ITEMS_KEY])
+    return obj
+
+
+_decoder = json.JSONDecoder(object_hook=_object_hook)
+
+
+def loads(text: Union[str, bytes]) -> Any:
+    """
+    解析Y3 JSON文本
+
+    Args:
+        text: JSON文本
+
+    Returns:
+        解析结果，元组包装对象已还原为tuple
+    """
+    if isinstance(text, bytes):
+        text = text.decode('utf-8')
+    return _decoder.decode(text)
+
+
+def load(fp: IO[str]) -> Any:
+    """从文件对象解析Y3 JSON"""
+    return loads(fp.read())
+
+
+def load_file(file_path: Union[str, Path]) -> Any:
+    """
+    读取并解析Y3 JSON文件
+
+    Args:
+        file_path: 文件路径
+
+    Returns:
+        解析结果
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return loads(f.read())
+
+
+def encode_tuples(obj: Any) -> Any:
+    """
+    把tuple转换回编辑器的元组包装对象
+
+    json模块会把tuple当作list输出，因此编码前需要转换
+
+    Args:
+        obj: 待编码的数据
+
+    Returns:
+        可直接交给json模块编码的数据
+    """
+    if isinstance(obj, dict):
+        return {key: encode_tuples(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [encode_tuples(item) for item in obj]
+    if isinstance(obj, tuple):
+        return {TUPLE_KEY: True, ITEMS_KEY: [encode_tuples(item) for item in obj]}
+    return obj
+
+
+def _strip_exponent_zeros(match: "re.Match[str]") -> str:
+    """去掉浮点数指数部分的前导零，字符串原样保留"""
+    if match.group(1) is None:
+        return match.group(0)
+    return f"e{match.group(1)}"
+
+
+def dumps(obj: Any, indent: int = EDITOR_INDENT, sort_keys: bool = False,
+          ensure_ascii: bool = True,
+          separators: Tuple[str, str] = EDITOR_SEPARATORS) -> str:
+    """
+    按编辑器格式编码
+
+    默认参数对应物编、logicres等编辑器数据文件的格式；部分文件（触发器、
+    资源meta等）不转义中文或逗号后不带空格，可通过参数调整
+
+    Args:
+        obj: 待编码的数据，tuple会写成元组包装对象
+        indent: 缩进空格数
+        sort_keys: 是否按键排序（默认保留原顺序，编辑器写出的数字键并非按字符串排序）
+        ensure_ascii: 是否转义非ASCII字符
+        separators: (元素分隔符, 键值分隔符)
+
+    Returns:
+        JSON文本
+    """
+    text = json.dumps(encode_tuples(obj), indent=indent, sort_keys=sort_keys,
+                      separators=separators, ensure_ascii=ensure_ascii)
+    if _EXPONENT_HINT.search(text):
+        text = _EXPONENT_PATTERN.sub(_strip_exponent_zeros, text)
+    return text
+
+
+def dump(obj: Any, fp: IO[str], **options: Any) -> None:
+    """按编辑器格式编码并写入文件对象，options同dumps"""
+    fp.write(dumps(obj, **options))
+
+
+def dump_file(obj: Any, file_path: Union[str, Path], **options: Any) -> None:
+    """
+    按编辑器格式写入JSON文件
+
+    Args:
+        obj: 待编码的数据
+        file_path: 文件路径
+        **options: 格式参数，同dumps
+    """
+    with open(file_path, 'w', encoding='utf-8', newline='') as f:
+        dump(obj, f, **options)
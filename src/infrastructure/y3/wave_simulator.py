@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+刷怪波次离线模拟
+根据 tables/幸存者_怪物波次表.json 中每个波次的怪物类型、开始/结束时间和每秒刷怪数，
+结合单位属性，按秒计算整条时间线上的刷怪数、累计敌人生命值和所需DPS；
+全部计算以数组形式完成，一次可评估大批参数变体（刷怪速度、生命值倍率、玩家DPS）
+"""
+
+import math
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+import numpy as np
+
+from src.infrastructure.y3 import tuple_json
+from src.infrastructure.y3.editor_table import load_table
+
+
+# 波次表文件名（位于地图的 tables 目录）
+WAVE_TABLE = "幸存者_怪物波次表"
+
+# 波次表的列名
+WAVE_COLUMNS = {
+    "name": "波次名称",
+    "unit": "怪物类型",
+    "start": "开始时间",
+    "end": "结束时间",
+    "rate": "每秒刷怪数",
+}
+
+# 单位属性所在的物编表目录（相对地图目录），unit/*.json 中只有触发器数据
+UNIT_TABLE_DIR = "editor_table/editorunit"
+
+# 模拟使用的单位属性及缺省值
+UNIT_STATS = {
+    "hp_max": 0.0,
+    "defense_phy": 0.0,
+    "attack_phy": 0.0,
+    "attack_interval": 1.0,
+}
+
+# 结束时间大于该值的波次视为持续到游戏结束（编辑器中常用999999999表示）
+OPEN_END = 1e6
+
+# 计算所需DPS时默认的滑动窗口（秒）
+DEFAULT_WINDOW = 10
+
+# 批量评估时每批的变体数，限制 变体数 x 时长 的中间数组大小
+VARIANT_CHUNK = 256
+
+
+def load_unit_stats(map_dir: Union[str, Path], unit_ids) -> Dict[int, Dict[str, float]]:
+    """
+    读取单位属性
+
+    Args:
+        map_dir: 地图目录
+        unit_ids: 单位ID
+
+    Returns:
+        单位ID -> 属性，缺少物编数据的单位使用缺省值
+    """
+    stats = {}
+    for unit_id in sorted(set(int(unit_id) for unit_id in unit_ids)):
+        unit_file = Path(map_dir) / UNIT_TABLE_DIR / f"{unit_id}.json"
+        values = dict(UNIT_STATS)
+        if unit_file.exists():
+            data = tuple_json.load_file(unit_file)
+            for key, default in UNIT_STATS.items():
+                value = data.get(key, default)
+                values[key] = float(value) if isinstance(value, (int, float)) else default
+        else:
+            print(f"未找到单位物编数据: {unit_id}")
+        stats[unit_id] = values
+    return stats
+
+
+class WaveSimulator:
+    """向量化的刷怪波次模拟"""
+
+    def __init__(self, waves: Dict[str, np.ndarray], unit_stats: Dict[int, Dict[str, float]],
+                 duration: Optional[float] = None):
+        """
+        初始化模拟
+
+        Args:
+            waves: 波次数组（unit、start、end、rate，长度相同）
+            unit_stats: 单位ID -> 属性
+            duration: 模拟时长（秒），为None时取有限结束时间中的最大值
+        """
+        self.unit = np.asarray(waves["unit"], dtype=np.int64)
+        self.start = np.asarray(waves["start"], dtype=np.float64)
+        self.end = np.asarray(waves["end"], dtype=np.float64)
+        self.rate = np.asarray(waves["rate"], dtype=np.float64)
+        self.names = list(waves.get("name", range(len(self.unit))))
+
+        if duration is None:
+            finite = self.end[self.end < OPEN_END]
+            duration = float(finite.max()) if finite.size else float(self.start.max(initial=0) + 60)
+        self.duration = int(math.ceil(duration))
+        self.end = np.minimum(self.end, self.duration)
+
+        self.hp = np.array([unit_stats[unit_id]["hp_max"] for unit_id in self.unit])
+        self.defense = np.array([unit_stats[unit_id]["defense_phy"] for unit_id in self.unit])
+        # 每秒时间点 t 代表区间 [t, t+1)
+        self.time = np.arange(self.duration, dtype=np.float64)
+
+    @classmethod
+    def from_map(cls, map_dir: Union[str, Path], duration: Optional[float] = None,
+                 table_name: str = WAVE_TABLE) -> "WaveSimulator":
+        """
+        从地图目录加载波次表和单位属性
+
+        Args:
+            map_dir: 地图目录（如 maps/EntryMap）
+            duration: 模拟时长（秒）
+            table_name: 波次表名称
+        """
+        table = load_table(Path(map_dir) / "tables" / f"{table_name}.json")
+        mask = np.ones(len(table), dtype=np.bool_)
+        for key in ("unit", "start", "end", "rate"):
+            mask &= table.valid[WAVE_COLUMNS[key]]
+        waves = {key: table[column][mask] for key, column in WAVE_COLUMNS.items()}
+        return cls(waves, load_unit_stats(map_dir, waves["unit"]), duration)
+
+    def active_seconds(self) -> np.ndarray:
+        """
+        每个波次在每一秒内的有效时长（波次 x 秒，取值0~1）
+        """
+        left = np.maximum(self.time[None, :], self.start[:, None])
+        right = np.minimum(self.time[None, :] + 1, self.end[:, None])
+        return np.clip(right - left, 0.0, 1.0)
+
+    def spawns_by_wave(self) -> np.ndarray:
+        """
+        每个波次每秒实际刷出的怪物数（波次 x 秒，整数）
+
+        累计刷怪数向下取整后逐秒差分，小数刷怪速度按累计值折算
+        """
+        elapsed = np.cumsum(self.active_seconds(), axis=1)
+        cumulative = np.floor(elapsed * self.rate[:, None] + 1e-9)
+        return np.diff(cumulative, axis=1, prepend=0).astype(np.int64)
+
+    def timeline(self, window: int = DEFAULT_WINDOW) -> Dict[str, np.ndarray]:
+        """
+        计算整条时间线
+
+        Args:
+            window: 计算所需DPS的滑动窗口（秒）
+
+        Returns:
+            time: 秒
+            spawns: 每秒刷怪数
+            cumulative_spawns: 累计刷怪数
+            hp: 每秒刷出的敌人生命值
+            cumulative_hp: 累计敌人生命值
+            required_dps: 在window秒内清掉新刷出敌人所需的DPS
+        """
+        by_wave = self.spawns_by_wave()
+        hp = self.hp @ by_wave
+        return {
+            "time": self.time,
+            "spawns": by_wave.sum(axis=0),
+            "cumulative_spawns": np.cumsum(by_wave.sum(axis=0)),
+            "hp": hp,
+            "cumulative_hp": np.cumsum(hp),
+            "required_dps": rolling_mean(hp, window),
+        }
+
+    def evaluate(self, rate_scale: Any = 1.0, hp_scale: Any = 1.0,
+                 player_dps: Any = None, window: int = DEFAULT_WINDOW) -> Dict[str, np.ndarray]:
+        """
+        批量评估参数变体（使用期望刷怪数，不做取整）
+
+        Args:
+            rate_scale: 刷怪速度倍率，形状为 (变体数,) 或 (变体数, 波次数)
+            hp_scale: 生命值倍率，形状同上
+            player_dps: 玩家DPS，形状为 (变体数,) 或 (变体数, 秒)；为None时不计算积压
+            window: 计算所需DPS的滑动窗口（秒）
+
+        Returns:
+            每个变体的指标数组：total_spawns、total_hp、peak_required_dps，
+            给出玩家DPS时还有 max_backlog_hp（未清掉的敌人生命值峰值）和
+            overwhelmed_at（积压首次超过一个窗口的刷怪量的时间，未超过为-1）
+        """
+        rate_scale = np.atleast_1d(np.asarray(rate_scale, dtype=np.float64))
+        hp_scale = np.atleast_1d(np.asarray(hp_scale, dtype=np.float64))
+        variants = max(rate_scale.shape[0], hp_scale.shape[0])
+        if player_dps is not None:
+            player_dps = np.atleast_1d(np.asarray(player_dps, dtype=np.float64))
+            variants = max(variants, player_dps.shape[0])
+
+        waves = len(self.rate)
+        rate = np.broadcast_to(_per_wave(rate_scale, waves) * self.rate, (variants, waves))
+        hp = np.broadcast_to(_per_wave(hp_scale, waves) * self.hp, (variants, waves))
+        active = self.active_seconds()
+
+        results = {
+            "total_spawns": np.empty(variants),
+            "total_hp": np.empty(variants),
+            "peak_required_dps": np.empty(variants),
+        }
+        if player_dps is not None:
+            results["max_backlog_hp"] = np.empty(variants)
+            results["overwhelmed_at"] = np.empty(variants, dtype=np.int64)
+
+        for begin in range(0, variants, VARIANT_CHUNK):
+            chunk = slice(begin, min(begin + VARIANT_CHUNK, variants))
+            # (变体, 波次) @ (波次, 秒) -> (变体, 秒)
+            spawn_rate = rate[chunk] @ active
+            hp_rate = (rate[chunk] * hp[chunk]) @ active
+            results["total_spawns"][chunk] = spawn_rate.sum(axis=1)
+            results["total_hp"][chunk] = hp_rate.sum(axis=1)
+            required = rolling_mean(hp_rate, window)
+            results["peak_required_dps"][chunk] = required.max(axis=1)
+
+            if player_dps is not None:
+                dps = np.broadcast_to(
+                    player_dps[chunk] if player_dps.shape[0] > 1 else player_dps,
+                    (chunk.stop - chunk.start,) + player_dps.shape[1:]
+                )
+                if dps.ndim == 1:
+                    dps = dps[:, None]
+                backlog = backlog_hp(hp_rate, dps)
+                results["max_backlog_hp"][chunk] = backlog.max(axis=1)
+                overwhelmed = backlog > required * window
+                results["overwhelmed_at"][chunk] = np.where(
+                    overwhelmed.any(axis=1), overwhelmed.argmax(axis=1), -1)
+        return results
+
+
+def _per_wave(scale: np.ndarray, waves: int) -> np.ndarray:
+    """倍率整理为 (变体数, 波次数)"""
+    return scale.reshape(-1, 1) if scale.ndim == 1 else scale.reshape(-1, waves)
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    沿最后一维的滑动平均（前window-1秒按已有的秒数平均）
+
+    Args:
+        values: 一维或二维数组
+        window: 窗口长度（秒）
+    """
+    cumulative = np.cumsum(values, axis=-1)
+    shifted = np.zeros_like(cumulative)
+    if window < values.shape[-1]:
+        shifted[..., window:] = cumulative[..., :-window]
+    counts = np.minimum(np.arange(1, values.shape[-1] + 1), window)
+    return (cumulative - shifted) / counts
+
+
+def backlog_hp(hp_rate: np.ndarray, dps: np.ndarray) -> np.ndarray:
+    """
+    未被清掉的敌人生命值：backlog[t] = max(0, backlog[t-1] + hp_rate[t] - dps[t])
+
+    递推式等价于 S - min(0, S的前缀最小值)，S为净增量的累加和，可整体向量化计算
+
+    Args:
+        hp_rate: 每秒刷出的生命值，形状 (..., 秒)
+        dps: 每秒造成的伤害，可广播到hp_rate的形状
+    """
+    net = np.cumsum(hp_rate - dps, axis=-1)
+    return net - np.minimum(np.minimum.accumulate(net, axis=-1), 0.0)
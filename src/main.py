@@ -6,38 +6,74 @@
 """
 
 import sys
-import os
 from pathlib import Path
-from typing import Optional, List, Dict, Any
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
-from src.shared.utils.logger import setup_logger
-from src.shared.utils.config_loader import ConfigLoader
-from src.interfaces.gui.main_window import MainWindow
-from src.application.services.project_service import ProjectService
-from src.infrastructure.tools.war3_editor_launcher import War3EditorLauncher
+from src.shared.utils.instrumentation import traced
 
 
 class War3MapStudio:
-    """魔兽争霸3地图开发工作室主类"""
+    """魔兽争霸3地图开发工作室主类
+    
+    日志、配置、项目服务和编辑器启动器都在第一次使用时才导入和创建，
+    命令行的单个操作只加载自己用到的子系统，PyQt6只在run_gui中导入；
+    各命令的耗时可通过 --trace 或 WAR3_TRACE 环境变量记录到跟踪文件
+    """
     
     def __init__(self):
         """初始化地图开发工作室"""
-        self.logger = setup_logger("War3MapStudio")
-        self.config = ConfigLoader()
-        self.project_service = ProjectService()
-        self.editor_launcher = War3EditorLauncher()
-        
-        self.logger.info("魔兽争霸3地图开发工作室启动")
+        self._logger = None
+        self._config = None
+        self._project_service = None
+        self._editor_launcher = None
+    
+    @property
+    def logger(self):
+        """日志记录器"""
+        if self._logger is None:
+            from src.shared.utils.logger import setup_logger
+            
+            self._logger = setup_logger("War3MapStudio")
+            self._logger.info("魔兽争霸3地图开发工作室启动")
+        return self._logger
+    
+    @property
+    def config(self):
+        """配置加载器"""
+        if self._config is None:
+            from src.shared.utils.config_loader import ConfigLoader
+            
+            self._config = ConfigLoader()
+        return self._config
     
+    @property
+    def project_service(self):
+        """项目服务"""
+        if self._project_service is None:
+            from src.application.services.project_service import ProjectService
+            
+            self._project_service = ProjectService()
+        return self._project_service
+    
+    @property
+    def editor_launcher(self):
+        """编辑器启动器"""
+        if self._editor_launcher is None:
+            from src.infrastructure.tools.war3_editor_launcher import War3EditorLauncher
+            
+            self._editor_launcher = War3EditorLauncher()
+        return self._editor_launcher
+    
+    @traced("War3MapStudio.run_gui")
     def run_gui(self) -> None:
         """启动图形用户界面"""
         try:
             from PyQt6.QtWidgets import QApplication
             from PyQt6.QtCore import Qt
+            from src.interfaces.gui.main_window import MainWindow
             
             app = QApplication(sys.argv)
             app.setApplicationName("War3 Map Studio")
@@ -64,6 +100,7 @@ class War3MapStudio:
             self.logger.error(f"GUI启动失败: {e}")
             sys.exit(1)
     
+    @traced("War3MapStudio.run_cli")
     def run_cli(self) -> None:
         """启动命令行界面"""
         try:
@@ -76,6 +113,7 @@ class War3MapStudio:
             self.logger.error(f"CLI启动失败: {e}")
             sys.exit(1)
     
+    @traced("War3MapStudio.check_environment")
     def check_environment(self) -> bool:
         """检查开发环境"""
         self.logger.info("检查开发环境...")
@@ -102,6 +140,7 @@ class War3MapStudio:
         self.logger.info("环境检查完成")
         return True
     
+    @traced("War3MapStudio.create_project")
     def create_project(self, project_name: str, project_type: str) -> bool:
         """创建新项目"""
         try:
@@ -116,6 +155,7 @@ class War3MapStudio:
             self.logger.error(f"创建项目时出错: {e}")
             return False
     
+    @traced("War3MapStudio.open_project")
     def open_project(self, project_path: str) -> bool:
         """打开现有项目"""
         try:
@@ -130,6 +170,7 @@ class War3MapStudio:
             self.logger.error(f"打开项目时出错: {e}")
             return False
     
+    @traced("War3MapStudio.launch_editor")
     def launch_editor(self, editor_type: str = "world_editor") -> bool:
         """启动地图编辑器"""
         try:
@@ -160,9 +201,14 @@ def main():
                        choices=["world_editor", "jngp"], 
                        default="world_editor", help="启动编辑器")
     parser.add_argument("--check-env", action="store_true", help="检查开发环境")
+    parser.add_argument("--trace", type=str, help="记录各操作耗时到跟踪文件（.jsonl 或 .csv）")
     
     args = parser.parse_args()
     
+    if args.trace:
+        from src.shared.utils import instrumentation
+        instrumentation.enable(args.trace)
+    
     # 创建工作室实例
     studio = War3MapStudio()
     
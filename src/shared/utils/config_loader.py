@@ -6,15 +6,46 @@
 """
 
 import os
+import copy
 import json
+import threading
 import yaml
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 from configparser import ConfigParser
 
 
+# 按优先级从低到高合并的配置文件
+CONFIG_FILES = ("config.yaml", "config.json", "config.ini")
+
+# 进程内共享的配置快照：配置文件路径 -> {"config": 配置, "stamps": 文件状态}
+# 同一配置只读取和合并一次，之后的实例和get()调用都不再访问磁盘；
+# 快照只读，每个实例持有自己的副本，未保存的修改不会影响其他实例
+_config_cache: Dict[Path, Dict[str, Any]] = {}
+_cache_lock = threading.RLock()
+
+
+def _file_stamp(file_path: Path) -> Optional[Tuple[int, int]]:
+    """文件的(修改时间, 大小)，文件不存在时返回None"""
+    try:
+        st = file_path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def clear_config_cache() -> None:
+    """清空进程内的配置缓存，下次创建实例时重新读取配置文件"""
+    with _cache_lock:
+        _config_cache.clear()
+
+
 class ConfigLoader:
-    """配置加载器"""
+    """配置加载器
+    
+    同一配置目录的合并结果在进程内只加载一次并由所有实例共享，
+    需要感知配置文件变化时调用revalidate()或watch()
+    """
     
     def __init__(self, config_dir: Optional[Path] = None):
         """
@@ -59,8 +90,80 @@ class ConfigLoader:
             }
         }
         
-        # 加载配置
-        self.config = self._load_config()
+        # 加载配置（优先使用进程内缓存）
+        self.config = self._load_cached()
+    
+    def _cache_key(self) -> Path:
+        """缓存键：配置目录的绝对路径"""
+        return self.config_dir.resolve()
+    
+    def _stamps(self) -> Dict[str, Optional[Tuple[int, int]]]:
+        """各配置文件当前的(修改时间, 大小)"""
+        return {name: _file_stamp(self.config_dir / name) for name in CONFIG_FILES}
+    
+    def _load_cached(self) -> Dict[str, Any]:
+        """从进程内缓存获取配置，首次使用时加载"""
+        key = self._cache_key()
+        with _cache_lock:
+            snapshot = _config_cache.get(key)
+            if snapshot is None:
+                # 先记录文件状态再读取，读取期间发生的修改会在下次revalidate时发现
+                stamps = self._stamps()
+                snapshot = {"config": self._load_config(), "stamps": stamps}
+                _config_cache[key] = snapshot
+            # 本实例持有的配置对应的文件状态，revalidate时与磁盘比较
+            self.stamps = snapshot["stamps"]
+            return copy.deepcopy(snapshot["config"])
+    
+    def revalidate(self) -> bool:
+        """
+        检查配置文件是否变化，变化时重新加载
+        
+        只对配置文件做stat，未变化时不读取文件，也保留本实例未保存的修改；
+        其他实例已经重新加载过的配置直接从进程内缓存复制
+        
+        Returns:
+            是否重新加载了配置
+        """
+        key = self._cache_key()
+        with _cache_lock:
+            stamps = self._stamps()
+            if self.stamps == stamps:
+                return False
+            
+            snapshot = _config_cache.get(key)
+            if snapshot is None or snapshot["stamps"] != stamps:
+                snapshot = {"config": self._load_config(), "stamps": stamps}
+                _config_cache[key] = snapshot
+            self.config = copy.deepcopy(snapshot["config"])
+            self.stamps = stamps
+            return True
+    
+    def watch(self, callback: Callable[[Dict[str, Any]], None],
+              interval: float = 1.0) -> threading.Event:
+        """
+        在后台线程中定期检查配置文件，变化时重新加载并调用回调
+        
+        Args:
+            callback: 配置变化时的回调，参数为新的配置
+            interval: 检查间隔（秒）
+        
+        Returns:
+            停止事件，调用其set()方法停止监视
+        """
+        stop_event = threading.Event()
+        
+        def poll() -> None:
+            while not stop_event.wait(interval):
+                try:
+                    if self.revalidate():
+                        callback(self.config)
+                except Exception as e:
+                    print(f"配置文件监视出错: {e}")
+        
+        thread = threading.Thread(target=poll, name="ConfigWatcher", daemon=True)
+        thread.start()
+        return stop_event
     
     def _load_config(self) -> Dict[str, Any]:
         """加载配置文件"""
@@ -185,6 +288,14 @@ class ConfigLoader:
             else:
                 raise ValueError(f"不支持的配置格式: {format}")
             
+            # 以保存的配置更新缓存，自己写入的修改不会触发重新加载
+            with _cache_lock:
+                self.stamps = self._stamps()
+                _config_cache[self._cache_key()] = {
+                    "config": copy.deepcopy(self.config),
+                    "stamps": self.stamps
+                }
+            
             return True
             
         except Exception as e:
@@ -287,7 +398,18 @@ class ProjectConfig:
         """
         self.project_path = project_path
         self.config_file = project_path / "project_config.yaml"
-        self.config = self._load_project_config()
+        self.config = self._load_cached()
+    
+    def _load_cached(self) -> Dict[str, Any]:
+        """从进程内缓存获取项目配置，文件变化时重新加载"""
+        key = self.config_file.resolve()
+        stamps = {"project_config": _file_stamp(self.config_file)}
+        with _cache_lock:
+            snapshot = _config_cache.get(key)
+            if snapshot is None or snapshot["stamps"] != stamps:
+                snapshot = {"config": self._load_project_config(), "stamps": stamps}
+                _config_cache[key] = snapshot
+            return copy.deepcopy(snapshot["config"])
     
     def _load_project_config(self) -> Dict[str, Any]:
         """加载项目配置"""
@@ -342,6 +464,11 @@ class ProjectConfig:
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 yaml.dump(self.config, f, default_flow_style=False, 
                          allow_unicode=True, indent=2)
+            with _cache_lock:
+                _config_cache[self.config_file.resolve()] = {
+                    "config": copy.deepcopy(self.config),
+                    "stamps": {"project_config": _file_stamp(self.config_file)}
+                }
             return True
         except Exception as e:
             print(f"保存项目配置失败: {e}")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能埋点工具
+以装饰器或上下文管理器记录操作耗时，并按操作累计文件数、字节数等计数，
+结果追加写入JSON Lines或CSV跟踪文件，便于跨多次运行汇总分析；
+未启用时装饰器和上下文管理器只做一次标志判断
+"""
+
+import os
+import csv
+import json
+import time
+import atexit
+import tempfile
+import threading
+from pathlib import Path
+from datetime import datetime
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+# 设置此环境变量（跟踪文件路径）即在进程启动时启用埋点
+TRACE_ENV = "WAR3_TRACE"
+
+# CSV跟踪文件的固定列，计数列按出现顺序追加在后面
+CSV_FIELDS = ("run", "name", "parent", "start", "seconds", "ok", "thread")
+
+_enabled = False
+_trace_file: Optional[Path] = None
+_records: List[Dict[str, Any]] = []
+_records_lock = threading.Lock()
+_local = threading.local()
+# 同一进程的记录共享运行ID，跨运行汇总时用于区分
+_run_id = f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+
+
+class Span:
+    """一次被记录的操作"""
+
+    __slots__ = ("name", "parent", "counters", "_start_time", "_start")
+
+    def __init__(self, name: str, parent: Optional[str], counters: Dict[str, Any]):
+        self.name = name
+        self.parent = parent
+        self.counters = counters
+        self._start_time = datetime.now()
+        self._start = time.perf_counter()
+
+    def count(self, key: str, value: Union[int, float] = 1) -> None:
+        """累加计数（如 files、bytes）"""
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def __enter__(self) -> "Span":
+        stack = _span_stack()
+        stack.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        seconds = time.perf_counter() - self._start
+        stack = _span_stack()
+        if stack and stack[-1] is self:
+            stack.pop()
+
+        record = {
+            "run": _run_id,
+            "name": self.name,
+            "parent": self.parent,
+            "start": self._start_time.isoformat(),
+            "seconds": round(seconds, 6),
+            "ok": exc_type is None,
+            "thread": threading.current_thread().name
+        }
+        record.update(self.counters)
+        with _records_lock:
+            _records.append(record)
+        return False
+
+
+class _NullSpan:
+    """未启用埋点时使用的空操作，所有调用共享同一个实例"""
+
+    __slots__ = ()
+
+    def count(self, key: str, value: Union[int, float] = 1) -> None:
+        pass
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def _span_stack() -> List[Span]:
+    """当前线程中正在进行的操作"""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def enable(trace_file: Optional[Union[str, Path]] = None) -> None:
+    """
+    启用埋点
+
+    Args:
+        trace_file: 跟踪文件路径，.csv 后缀写CSV，其他写JSON Lines；
+                    为None时只在内存中记录，可通过 records() 获取
+    """
+    global _enabled, _trace_file
+    _trace_file = Path(trace_file) if trace_file else None
+    _enabled = True
+
+
+def disable() -> None:
+    """停止埋点并把已记录的操作写入跟踪文件"""
+    global _enabled
+    _enabled = False
+    flush()
+
+
+def is_enabled() -> bool:
+    """是否已启用埋点"""
+    return _enabled
+
+
+def span(name: str, **counters: Any) -> Union[Span, _NullSpan]:
+    """
+    记录一段代码的耗时
+
+    用法:
+        with span("backup_project", mode="store") as s:
+            ...
+            s.count("files", 100)
+
+    Args:
+        name: 操作名称
+        **counters: 附加字段或计数初值
+
+    Returns:
+        上下文管理器，未启用时为空操作
+    """
+    if not _enabled:
+        return _NULL_SPAN
+    stack = _span_stack()
+    parent = stack[-1].name if stack else None
+    return Span(name, parent, dict(counters))
+
+
+def traced(name: Optional[str] = None) -> Callable[[Callable], Callable]:
+    """
+    记录函数耗时的装饰器
+
+    Args:
+        name: 操作名称，默认为函数的限定名
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(key: str, value: Union[int, float] = 1) -> None:
+    """
+    累加当前操作的计数，不在任何操作中或未启用时忽略
+
+    Args:
+        key: 计数名称（如 files、bytes）
+        value: 增量
+    """
+    if not _enabled:
+        return
+    stack = _span_stack()
+    if stack:
+        stack[-1].count(key, value)
+
+
+def records() -> List[Dict[str, Any]]:
+    """尚未写入跟踪文件的记录"""
+    with _records_lock:
+        return list(_records)
+
+
+def add_records(trace_records: List[Dict[str, Any]]) -> None:
+    """
+    加入其他进程记录的操作（如进程池工作进程返回的记录），未启用时忽略
+
+    工作进程以 os._exit 退出，不会执行退出时的写入；由主进程收集后统一写入，
+    避免多个进程同时追加同一个跟踪文件
+    """
+    if not _enabled:
+        return
+    with _records_lock:
+        _records.extend(trace_records)
+
+
+def flush() -> None:
+    """把已记录的操作追加写入跟踪文件"""
+    with _records_lock:
+        if _trace_file is None or not _records:
+            return
+        pending = list(_records)
+        _records.clear()
+
+    try:
+        write_trace(pending, _trace_file)
+    except OSError as e:
+        print(f"写入跟踪文件失败: {_trace_file} ({e})")
+
+
+def write_trace(trace_records: List[Dict[str, Any]], trace_file: Union[str, Path]) -> None:
+    """
+    追加写入跟踪记录
+
+    Args:
+        trace_records: 记录列表
+        trace_file: 跟踪文件，.csv 后缀写CSV，其他写JSON Lines（每行一条记录）
+    """
+    trace_file = Path(trace_file)
+    trace_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if trace_file.suffix.lower() != ".csv":
+        with open(trace_file, 'a', encoding='utf-8') as f:
+            for record in trace_records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return
+
+    # 已有文件沿用其表头追加写入；出现新的计数列时扩展表头并重写整个文件（旧记录的新列留空）
+    fields = list(CSV_FIELDS)
+    existing = trace_file.exists() and trace_file.stat().st_size > 0
+    if existing:
+        with open(trace_file, 'r', encoding='utf-8', newline='') as f:
+            fields = next(csv.reader(f), fields)
+    header_size = len(fields)
+    for record in trace_records:
+        fields.extend(key for key in record if key not in fields)
+
+    if existing and len(fields) == header_size:
+        with open(trace_file, 'a', encoding='utf-8', newline='') as f:
+            csv.DictWriter(f, fieldnames=fields).writerows(trace_records)
+        return
+
+    rows: List[Dict[str, Any]] = []
+    if existing:
+        with open(trace_file, 'r', encoding='utf-8', newline='') as f:
+            rows = list(csv.DictReader(f))
+    fd, tmp_name = tempfile.mkstemp(dir=trace_file.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+            writer.writerows(trace_records)
+        os.replace(tmp_name, trace_file)
+    except BaseException:
+        if os.path.exists(tmp_name):
+            os.remove(tmp_name)
+        raise
+
+
+def load_trace(trace_file: Union[str, Path]) -> List[Dict[str, Any]]:
+    """
+    读取跟踪文件
+
+    Args:
+        trace_file: JSON Lines或CSV跟踪文件
+
+    Returns:
+        记录列表（CSV中的数值列转换为数字）
+    """
+    trace_file = Path(trace_file)
+    with open(trace_file, 'r', encoding='utf-8', newline='') as f:
+        if trace_file.suffix.lower() != ".csv":
+            return [json.loads(line) for line in f if line.strip()]
+
+        loaded = []
+        for row in csv.DictReader(f):
+            for key, value in row.items():
+                if key in ("run", "name", "parent", "start", "thread") or not value:
+                    continue
+                if value in ("True", "False"):
+                    row[key] = value == "True"
+                    continue
+                try:
+                    row[key] = float(value) if "." in value else int(value)
+                except ValueError:
+                    pass
+            loaded.append(row)
+        return loaded
+
+
+def summarize(trace_records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """
+    按操作名称汇总记录
+
+    Args:
+        trace_records: 记录列表（可来自多次运行）
+
+    Returns:
+        操作名称 -> 次数、总耗时、平均耗时、最大耗时以及各计数的合计
+    """
+    summary: Dict[str, Dict[str, Any]] = {}
+    for record in trace_records:
+        entry = summary.setdefault(record["name"], {"calls": 0, "seconds": 0.0, "max_seconds": 0.0})
+        seconds = float(record.get("seconds") or 0)
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        entry["max_seconds"] = max(entry["max_seconds"], seconds)
+        for key, value in record.items():
+            if key in CSV_FIELDS or isinstance(value, bool):
+                continue
+            if isinstance(value, (int, float)):
+                entry[key] = entry.get(key, 0) + value
+
+    for entry in summary.values():
+        entry["avg_seconds"] = entry["seconds"] / entry["calls"]
+    return summary
+
+
+atexit.register(flush)
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])
@@ -5,56 +5,367 @@
 提供统一的日志记录功能
 """
 
+import os
 import sys
+import time
+import atexit
 import logging
+import zipfile
+import threading
 from pathlib import Path
-from typing import Optional
+from datetime import datetime
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
 from loguru import logger
 
 
+# 控制台与日志文件的输出格式
+CONSOLE_FORMAT = ("<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
+                  "<level>{level: <8}</level> | "
+                  "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
+                  "<level>{message}</level>")
+FILE_FORMAT = ("{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | "
+               "{name}:{function}:{line} - {message}")
+
+# 异步写入队列已满时的处理策略：阻塞等待、丢弃新日志、丢弃最旧的日志
+OVERFLOW_POLICIES = ("block", "drop_new", "drop_oldest")
+
+# 异步写入队列默认容量（条）
+DEFAULT_QUEUE_SIZE = 10000
+
+# 后台线程每次合并写入的最大日志条数
+WRITE_BATCH_SIZE = 256
+
+# 日志文件轮转大小（字节）和旧日志保留天数，同步输出和异步输出一致
+ROTATION_BYTES = 10 * 1024 * 1024
+RETENTION_DAYS = 30
+
+# 已注册的输出：键 -> (配置, 处理器ID, 异步输出或None)
+_sinks: Dict[tuple, Tuple[tuple, int, Optional["AsyncSink"]]] = {}
+_sinks_lock = threading.Lock()
+_default_removed = False
+
+
+class AsyncSink:
+    """
+    异步日志输出
+    
+    调用线程只把记录追加到有界队列（deque.append，不加锁），由后台线程完成格式化和实际写入
+    （包括文件轮转和压缩），写日志不会因为磁盘I/O而阻塞
+    """
+    
+    def __init__(self, write: Callable[[str], None],
+                 queue_size: int = DEFAULT_QUEUE_SIZE,
+                 overflow: str = "drop_new",
+                 name: str = "AsyncLogWriter",
+                 render: Optional[Callable[[Dict[str, Any]], str]] = None,
+                 close: Optional[Callable[[], None]] = None):
+        """
+        初始化异步输出
+        
+        Args:
+            write: 实际写入函数，参数为格式化后的日志文本（可能包含多条）
+            queue_size: 队列容量
+            overflow: 队列已满时的处理策略，见 OVERFLOW_POLICIES
+            name: 后台线程名称
+            render: 在后台线程中把loguru记录格式化为文本；为None时使用loguru在调用线程中
+                格式化好的文本，带异常的记录也使用loguru的格式（含回溯）
+            close: 后台线程停止后调用，用于关闭文件
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"不支持的队列溢出策略: {overflow}")
+        
+        self._write = write
+        self._render = render
+        self._close = close
+        self.queue_size = queue_size
+        self.overflow = overflow
+        self.dropped = 0
+        self._reported = 0
+        self._items: Deque[Any] = deque()
+        self._stopping = False
+        # 有新日志时唤醒后台线程；后台线程写完一批后通知阻塞的调用方；队列写空时置位
+        self._wakeup = threading.Event()
+        self._drained = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def __call__(self, message: Any) -> None:
+        """loguru输出接口：把记录（或格式化好的文本）放入队列"""
+        record = message.record
+        item = record if self._render is not None and record["exception"] is None else str(message)
+        if len(self._items) >= self.queue_size:
+            if self.overflow == "block":
+                while len(self._items) >= self.queue_size and self._thread.is_alive():
+                    self._drained.clear()
+                    self._wakeup.set()
+                    self._drained.wait(0.05)
+            elif self.overflow == "drop_oldest":
+                try:
+                    self._items.popleft()
+                except IndexError:
+                    pass
+                self.dropped += 1
+            else:
+                self.dropped += 1
+                return
+        
+        self._items.append(item)
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+    
+    def _run(self) -> None:
+        """后台写入线程：被唤醒后把队列中已有的日志分批合并写入"""
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            self._idle.clear()
+            while self._items:
+                batch = []
+                try:
+                    while len(batch) < WRITE_BATCH_SIZE:
+                        batch.append(self._items.popleft())
+                except IndexError:
+                    pass
+                try:
+                    self._write("".join(item if isinstance(item, str) else self._render(item)
+                                        for item in batch))
+                except Exception as e:
+                    print(f"写入日志失败: {e}", file=sys.stderr)
+                self._drained.set()
+            
+            if self.dropped > self._reported:
+                # 队列清空后报告期间丢弃的日志数
+                count = self.dropped - self._reported
+                self._reported = self.dropped
+                try:
+                    self._write(f"日志队列已满，丢弃了 {count} 条日志\n")
+                except Exception as e:
+                    print(f"写入日志失败: {e}", file=sys.stderr)
+            self._idle.set()
+            if self._stopping and not self._items:
+                break
+        if self._close is not None:
+            self._close()
+    
+    def flush(self) -> None:
+        """等待队列中的日志全部写完"""
+        while (self._items or not self._idle.is_set()) and self._thread.is_alive():
+            self._idle.wait(0.05)
+    
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        """写完队列中的日志后停止后台线程"""
+        if self._thread.is_alive():
+            self._stopping = True
+            self._wakeup.set()
+            self._thread.join(timeout)
+
+
+class RotatingFileWriter:
+    """
+    异步输出使用的日志文件：按大小轮转，旧日志压缩为zip并按天数清理
+    
+    与loguru的 rotation/retention/compression 行为一致，轮转后的文件名为
+    <名称>.<时间><后缀>.zip；只应由一个线程写入
+    """
+    
+    def __init__(self, file_path: Path, rotation_bytes: int = ROTATION_BYTES,
+                 retention_days: int = RETENTION_DAYS):
+        """
+        初始化日志文件
+        
+        Args:
+            file_path: 日志文件路径
+            rotation_bytes: 写入后超过该大小时先轮转
+            retention_days: 旧日志保留天数
+        """
+        self.file_path = Path(file_path)
+        self.rotation_bytes = rotation_bytes
+        self.retention_days = retention_days
+        self._file = open(self.file_path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+        self._remove_expired()
+    
+    def write(self, text: str) -> None:
+        """追加写入文本"""
+        data_size = len(text.encode('utf-8'))
+        if self._size and self._size + data_size > self.rotation_bytes:
+            self._rotate()
+        self._file.write(text)
+        self._file.flush()
+        self._size += data_size
+    
+    def _rotate(self) -> None:
+        """关闭当前文件，改名并压缩为zip后重新打开"""
+        self._file.close()
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        rotated = self.file_path.with_name(f"{self.file_path.stem}.{stamp}{self.file_path.suffix}")
+        os.replace(self.file_path, rotated)
+        try:
+            with zipfile.ZipFile(f"{rotated}.zip", 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                archive.write(rotated, rotated.name)
+            rotated.unlink()
+        except OSError as e:
+            print(f"压缩日志文件失败: {rotated} ({e})", file=sys.stderr)
+        self._file = open(self.file_path, 'a', encoding='utf-8')
+        self._size = 0
+        self._remove_expired()
+    
+    def _remove_expired(self) -> None:
+        """删除超过保留天数的旧日志"""
+        expired = time.time() - self.retention_days * 86400
+        pattern = f"{self.file_path.stem}.*{self.file_path.suffix}*"
+        for old_file in self.file_path.parent.glob(pattern):
+            try:
+                if old_file != self.file_path and old_file.stat().st_mtime < expired:
+                    old_file.unlink()
+            except OSError:
+                continue
+    
+    def close(self) -> None:
+        """关闭日志文件"""
+        self._file.close()
+
+
+def _deferred_file_format(record: Dict[str, Any]) -> str:
+    """异步文件输出的loguru格式：普通记录由后台线程格式化，调用线程不做格式化"""
+    return FILE_FORMAT + "\n{exception}" if record["exception"] is not None else "{message}"
+
+
+def format_file_record(record: Dict[str, Any]) -> str:
+    """按 FILE_FORMAT 格式化loguru记录（异步输出在后台线程中调用）"""
+    return (f"{record['time']:%Y-%m-%d %H:%M:%S} | {record['level'].name: <8} | "
+            f"{record['name']}:{record['function']}:{record['line']} - {record['message']}\n")
+
+
+def _register_sink(key: tuple, options: tuple,
+                   add: Callable[[], Tuple[int, Optional[AsyncSink]]]) -> None:
+    """
+    注册输出，配置相同的输出只注册一次
+    
+    Args:
+        key: 输出的唯一键（控制台或日志文件路径）
+        options: 输出配置，与已注册的配置不同时替换原输出
+        add: 添加输出的函数，返回处理器ID和异步输出
+    """
+    registered = _sinks.get(key)
+    if registered is not None:
+        if registered[0] == options:
+            return
+        _remove_sink(key)
+    handler_id, async_sink = add()
+    _sinks[key] = (options, handler_id, async_sink)
+
+
+def _remove_sink(key: tuple) -> None:
+    """移除已注册的输出，异步输出先写完队列"""
+    options, handler_id, async_sink = _sinks.pop(key)
+    logger.remove(handler_id)
+    if async_sink is not None:
+        async_sink.stop()
+
+
+def flush_logs() -> None:
+    """等待所有异步输出写完队列中的日志"""
+    with _sinks_lock:
+        async_sinks = [entry[2] for entry in _sinks.values() if entry[2] is not None]
+    for async_sink in async_sinks:
+        async_sink.flush()
+
+
+@atexit.register
+def _stop_async_sinks() -> None:
+    """进程退出前写完异步输出中的日志"""
+    with _sinks_lock:
+        async_sinks = [entry[2] for entry in _sinks.values() if entry[2] is not None]
+    for async_sink in async_sinks:
+        async_sink.stop()
+
+
 def setup_logger(name: str = "War3MapStudio", 
                 log_level: str = "INFO",
-                log_file: Optional[str] = None) -> logger:
+                log_file: Optional[str] = None,
+                async_sink: bool = False,
+                queue_size: int = DEFAULT_QUEUE_SIZE,
+                overflow: str = "drop_new",
+                console: bool = True) -> logger:
     """
     设置日志记录器
     
+    输出只注册一次，重复调用（如多个ProjectLogger）不会移除其他记录器添加的输出；
+    日志文件只记录同名记录器和未绑定名称的日志（绑定了其他名称的日志不会写入）
+    
     Args:
         name: 日志记录器名称
         log_level: 日志级别 (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: 日志文件路径，如果为None则只输出到控制台
+        async_sink: 是否由后台线程写入（适合逐文件写日志的批处理工具）；
+            日志文件的格式化、写入、轮转和压缩都在后台线程中进行
+        queue_size: 异步写入队列容量
+        overflow: 异步写入队列已满时的处理策略 (block, drop_new, drop_oldest)
+        console: 是否输出到控制台
     
     Returns:
         配置好的日志记录器
     """
+    global _default_removed
     
-    # 移除默认的日志处理器
-    logger.remove()
-    
-    # 添加控制台输出
-    logger.add(
-        sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | "
-               "<level>{level: <8}</level> | "
-               "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
-               "<level>{message}</level>",
-        level=log_level,
-        colorize=True
-    )
-    
-    # 如果指定了日志文件，添加文件输出
-    if log_file:
-        log_path = Path(log_file)
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+    if overflow not in OVERFLOW_POLICIES:
+        raise ValueError(f"不支持的队列溢出策略: {overflow}")
+    async_options = (queue_size, overflow) if async_sink else None
+    
+    with _sinks_lock:
+        # 移除默认的日志处理器（只在第一次调用时）
+        if not _default_removed:
+            logger.remove()
+            _default_removed = True
         
-        logger.add(
-            log_file,
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | "
-                   "{name}:{function}:{line} - {message}",
-            level=log_level,
-            rotation="10 MB",  # 日志文件大小超过10MB时轮转
-            retention="30 days",  # 保留30天的日志
-            compression="zip"  # 压缩旧日志文件
-        )
+        # 添加控制台输出
+        if console:
+            def add_console() -> Tuple[int, Optional[AsyncSink]]:
+                if not async_sink:
+                    return logger.add(sys.stdout, format=CONSOLE_FORMAT, level=log_level,
+                                      colorize=True), None
+                
+                def write_console(text: str) -> None:
+                    sys.stdout.write(text)
+                    sys.stdout.flush()
+                
+                sink = AsyncSink(write_console, queue_size, overflow, name="AsyncConsoleWriter")
+                return logger.add(sink, format=CONSOLE_FORMAT, level=log_level,
+                                  colorize=sys.stdout.isatty()), sink
+            
+            _register_sink(("console",), (log_level, async_options), add_console)
+        
+        # 如果指定了日志文件，添加文件输出
+        if log_file:
+            log_path = Path(log_file)
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            file_key = ("file", str(log_path.resolve()))
+            
+            def accept(record: Dict[str, Any]) -> bool:
+                return record["extra"].get("name", name) == name
+            
+            def add_file() -> Tuple[int, Optional[AsyncSink]]:
+                if not async_sink:
+                    return logger.add(
+                        log_file, format=FILE_FORMAT, level=log_level, filter=accept,
+                        rotation=ROTATION_BYTES,  # 日志文件大小超过10MB时轮转
+                        retention=f"{RETENTION_DAYS} days",  # 保留30天的日志
+                        compression="zip"  # 压缩旧日志文件
+                    ), None
+                
+                # 调用线程只把记录入队，后台线程格式化后直接写文件，不再经过loguru的第二次分发；
+                # 带异常的记录仍由loguru在调用线程中格式化（含回溯）
+                writer = RotatingFileWriter(log_path)
+                sink = AsyncSink(writer.write, queue_size, overflow, name="AsyncFileWriter",
+                                 render=format_file_record, close=writer.close)
+                return logger.add(sink, format=_deferred_file_format, level=log_level,
+                                  filter=accept), sink
+            
+            _register_sink(file_key, (name, log_level, async_options), add_file)
     
     return logger.bind(name=name)
 
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+清理地图项目中未被引用的导入资源（贴图、网格、碰撞体等）
+
+默认只报告可回收的资源和字节数，加 --prune 才会实际删除
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.asset_gc import AssetGC
+
+
+def resolve_project(project):
+    """项目名称解析为 maps/<名称>，也可以直接传入路径"""
+    if os.path.isdir(project):
+        return project
+    return os.path.join("maps", project)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="清理未被引用的导入资源")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    parser.add_argument("--prune", action="store_true", help="删除不可达资源（默认只报告）")
+    parser.add_argument("--verbose", action="store_true", help="列出每个不可达资源")
+    args = parser.parse_args()
+
+    project_path = resolve_project(args.project)
+    if not os.path.isdir(project_path):
+        print(f"项目不存在: {args.project}")
+        return 1
+
+    gc = AssetGC(project_path)
+    result = gc.analyze()
+    garbage = result["garbage"]
+
+    print(f"资源总数: {result['total']}, 根资源: {result['roots']}, 可达: {result['reachable']}")
+    print(f"不可达资源: {len(garbage)} 个, 可回收 {result['reclaimable_bytes'] / 1024:.1f} KB")
+    if args.verbose:
+        for entry in sorted(garbage, key=lambda e: e["size"], reverse=True):
+            print(f"  {entry['type']:<16} {entry['size']:>10}  {entry['package']}/{entry['name']}")
+
+    if result["unreadable"]:
+        print(f"⚠ 有 {len(result['unreadable'])} 个根文件无法解析，其中引用的资源可能被误判为不可达:")
+        for rel_path in result["unreadable"]:
+            print(f"  {rel_path}")
+        if args.prune:
+            print("已取消删除，请先修复这些文件")
+        return 1
+
+    if args.prune and garbage:
+        removed = gc.prune(garbage)
+        print(f"✓ 已删除 {removed} 个资源")
+    elif garbage:
+        print("（仅报告，使用 --prune 删除。建议先执行备份）")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
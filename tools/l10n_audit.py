@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+多语言文本检查
+列出物编表引用了但语言文件中不存在的键、各语言缺少的翻译和未被引用的文本
+
+示例:
+    python tools/l10n_audit.py ProjectName001_1
+    python tools/l10n_audit.py ProjectName001_1 --verbose
+
+存在缺失的键时返回1，可在提交前检查中使用
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.localization_audit import audit
+
+
+# 非详细模式下每类最多列出的条数
+PREVIEW_LIMIT = 10
+
+
+def resolve_project(project):
+    """项目名称解析为 maps/<名称>，也可以直接传入路径"""
+    if os.path.isdir(project):
+        return project
+    return os.path.join("maps", project)
+
+
+def preview(text, width=40):
+    """单行显示的文本预览"""
+    text = " ".join((text or "").split())
+    return text if len(text) <= width else text[:width - 3] + "..."
+
+
+def print_keys(title, keys, describe, verbose):
+    """输出一类键"""
+    print(f"\n{title}: {len(keys)}")
+    shown = keys if verbose else keys[:PREVIEW_LIMIT]
+    for key in shown:
+        print(f"  {key:<45} {describe(key)}")
+    if len(shown) < len(keys):
+        print(f"  ... 另有 {len(keys) - len(shown)} 条（--verbose 查看全部）")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多语言文本检查")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    parser.add_argument("--map", default="EntryMap", help="地图目录名")
+    parser.add_argument("--verbose", action="store_true", help="列出全部条目")
+    args = parser.parse_args()
+
+    project_path = resolve_project(args.project)
+    if not os.path.isdir(project_path):
+        print(f"项目不存在: {args.project}")
+        return 1
+
+    result = audit(project_path, args.map)
+    table = result["table"]
+    languages = ", ".join(f"{language}={count}" for language, count in result["languages"].items())
+    print(f"扫描 {result['files']} 个文件 ({result['seconds'] * 1000:.0f} ms)")
+    print(f"语言: {languages}")
+
+    missing_keys = result["missing_keys"]
+    print_keys("缺失的键", list(missing_keys), missing_keys.get, args.verbose)
+    for language, keys in result["missing_translations"].items():
+        if keys:
+            print_keys(f"缺少翻译 [{language}]", keys, lambda key: preview(table.get(key)),
+                       args.verbose)
+    print_keys("未使用的文本", result["unused"], lambda key: preview(table.get(key)), args.verbose)
+
+    return 1 if missing_keys else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+查询地图中放置的逻辑资源（区域、灯光、局部雾等）的空间关系
+
+示例:
+    python tools/logicres_query.py ProjectName001_1 --point 0 0
+    python tools/logicres_query.py ProjectName001_1 --near 10 -5 -k 5 --category 131072
+    python tools/logicres_query.py ProjectName001_1 --range -20 -20 20 20
+    python tools/logicres_query.py ProjectName001_1 --overlaps --category 2048
+
+坐标为水平面上的 x、z（logicres.json 中 pos 的第1、3项）
+"""
+
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.spatial_index import SpatialIndex
+
+
+def resolve_map(project, map_name):
+    """项目名称或路径解析为地图目录 <项目>/maps/<地图>"""
+    project_path = project if os.path.isdir(project) else os.path.join("maps", project)
+    return os.path.join(project_path, "maps", map_name)
+
+
+def describe(placement):
+    """单行描述一个逻辑资源"""
+    return (f"{placement.category:<10} {placement.id:<10} {placement.name:<12} "
+            f"{placement.shape:<7} ({placement.x:.2f}, {placement.z:.2f})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="逻辑资源空间查询")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    parser.add_argument("--map", default="EntryMap", help="地图目录名")
+    parser.add_argument("--category", help="只查询该类别（如 2048 矩形区域）")
+    parser.add_argument("--point", nargs=2, type=float, metavar=("X", "Z"), help="列出包含该点的资源")
+    parser.add_argument("--near", nargs=2, type=float, metavar=("X", "Z"), help="列出离该点最近的资源")
+    parser.add_argument("-k", type=int, default=5, help="--near 返回的数量")
+    parser.add_argument("--range", nargs=4, type=float, metavar=("MIN_X", "MIN_Z", "MAX_X", "MAX_Z"),
+                        help="列出与范围相交的资源")
+    parser.add_argument("--overlaps", action="store_true", help="列出互相重叠的资源")
+    args = parser.parse_args()
+
+    logicres_file = Path(resolve_map(args.project, args.map)) / "logicres.json"
+    if not logicres_file.exists():
+        print(f"未找到逻辑资源文件: {logicres_file}")
+        return 1
+
+    start = time.perf_counter()
+    index = SpatialIndex.from_file(logicres_file)
+    print(f"索引: {len(index)} 个逻辑资源, 网格边长 {index.cell_size:.2f} "
+          f"({(time.perf_counter() - start) * 1000:.0f} ms)")
+
+    if args.point:
+        results = index.query_point(*args.point, category=args.category)
+        for placement in results:
+            print(f"  {describe(placement)}")
+        print(f"共 {len(results)} 个")
+    elif args.near:
+        results = index.nearest(*args.near, k=args.k, category=args.category)
+        for distance, placement in results:
+            print(f"  {distance:>8.2f}  {describe(placement)}")
+    elif args.range:
+        results = index.query_range(*args.range, category=args.category)
+        for placement in results:
+            print(f"  {describe(placement)}")
+        print(f"共 {len(results)} 个")
+    elif args.overlaps:
+        pairs = index.overlaps(args.category)
+        for first, second in pairs:
+            print(f"  {describe(first)}\n    <-> {describe(second)}")
+        print(f"共 {len(pairs)} 对")
+    else:
+        for category, count in sorted(Counter(p.category for p in index).items()):
+            print(f"  {category:<10} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+对比两个地图快照中的JSON数据，按对象列出变化
+
+示例:
+    python tools/map_diff.py ProjectName001_1_backup_20250808_120000.snapshot.json ProjectName001_1
+    python tools/map_diff.py maps/ProjectName001_1 /path/to/other/ProjectName001_1 --object unit
+    python tools/map_diff.py old.snapshot.json new.snapshot.json --store ~/.war3mapstudio/store
+
+快照可以是项目名称（maps/下）、项目目录或快照目录树文件（备份、模板）；
+内容相同的文件不解析，键顺序变化和元组包装不算修改
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.storage.object_store import ObjectStore
+from src.infrastructure.y3.json_diff import describe_change, diff_snapshots, open_snapshot
+
+
+# 默认的对象存储（与 map_manager 相同）
+DEFAULT_STORE = os.path.join(os.path.expanduser("~"), ".war3mapstudio", "store")
+
+
+def resolve_snapshot(snapshot):
+    """快照名称解析为路径：依次尝试原路径、maps/<名称>、templates/<名称>"""
+    for candidate in (snapshot, os.path.join("maps", snapshot), os.path.join("templates", snapshot)):
+        if os.path.exists(candidate):
+            return candidate
+    return snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比地图快照中的JSON数据")
+    parser.add_argument("old", help="旧快照：项目名称、项目目录或 .snapshot.json 文件")
+    parser.add_argument("new", help="新快照")
+    parser.add_argument("--store", default=DEFAULT_STORE, help="快照目录树使用的对象存储目录")
+    parser.add_argument("--object", help="只列出名称包含该文本的对象（如 unit、unit 134222110）")
+    parser.add_argument("--limit", type=int, default=200, help="最多列出的变化条数（0为不限）")
+    args = parser.parse_args()
+
+    store = ObjectStore(Path(args.store))
+    try:
+        old = open_snapshot(resolve_snapshot(args.old), store)
+        new = open_snapshot(resolve_snapshot(args.new), store)
+    except ValueError as e:
+        print(e)
+        return 1
+
+    result = diff_snapshots(old, new)
+    changes = result["changes"]
+    if args.object:
+        changes = [change for change in changes if args.object in change["object"]]
+
+    shown = changes[:args.limit] if args.limit else changes
+    for change in shown:
+        print(f"  {describe_change(change)}")
+    if len(shown) < len(changes):
+        print(f"  ... 另有 {len(changes) - len(shown)} 条变化")
+    objects = len({change["object"] for change in changes})
+    print(f"共 {len(changes)} 处变化, 涉及 {objects} 个对象; 对比 {result['files']} 个文件, "
+          f"解析 {result['parsed']} 个 ({result['seconds'] * 1000:.0f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
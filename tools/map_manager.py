@@ -1,27 +1,77 @@
 import os
-import shutil
 import json
 import sys
+import time
+import fnmatch
+import hashlib
+import argparse
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.storage.backup_manifest import IncrementalBackup
+from src.infrastructure.storage.delta_sync import DeltaSync
+from src.infrastructure.storage.mirror_watch import LEFT, RIGHT, MirrorDaemon
+from src.infrastructure.storage.parallel_copy import ConsoleProgress, copy_tree
+from src.infrastructure.storage.project_catalog import ProjectCatalog
+from src.infrastructure.storage.object_store import ObjectStore, load_tree
+from src.infrastructure.y3.project_validator import validate_project
+from src.shared.utils import instrumentation
+from src.shared.utils.instrumentation import count, traced
+
+# 快照目录树文件后缀（模板与备份）
+SNAPSHOT_SUFFIX = ".snapshot.json"
+
+# 备份目录名中的标记，批量处理时通配符不匹配备份
+BACKUP_MARKER = "_backup_"
+
+# 批量处理的日志目录，每次运行一个子目录，每个项目的每个操作一个日志文件
+BATCH_LOG_DIR = os.path.join("logs", "batch")
+
+# 批量处理汇总的计数（来自各操作的埋点）
+BATCH_COUNTERS = ("files", "bytes", "bytes_stored")
 
 class MapManager:
     def __init__(self):
         self.y3_local_data = r"D:\Program Files\y3\games\2.0\game\LocalData"
         self.project_maps_dir = "maps"
         self.templates_dir = "templates"
+        # 本机共享的对象存储，所有项目、模板和备份中相同的资源只保存一份
+        self.object_store_dir = os.path.join(os.path.expanduser("~"), ".war3mapstudio", "store")
+        self.object_store = ObjectStore(self.object_store_dir)
+        # 项目列表的元数据缓存，每个项目根目录一个文件
+        self.catalog_dir = os.path.join(os.path.expanduser("~"), ".war3mapstudio", "catalog")
         
-    def list_y3_projects(self):
-        """列出Y3编辑器中的所有地图项目"""
+    def _catalog(self, root):
+        """项目根目录对应的项目目录（元数据缓存）"""
+        key = hashlib.sha1(os.path.abspath(root).encode("utf-8")).hexdigest()[:16]
+        return ProjectCatalog(root, os.path.join(self.catalog_dir, f"{key}.json"))
+        
+    def _invalidate_catalog(self, root, project_name):
+        """写入项目后丢弃其缓存的元数据（原地修改文件不一定改变目录签名）"""
+        if os.path.isdir(root):
+            self._catalog(root).invalidate(project_name)
+        
+    def list_y3_projects(self, detail=False, refresh=False):
+        """列出Y3编辑器中的所有地图项目
+        
+        detail 为True时返回每个项目的元数据（大小、文件数、地图版本等），否则只返回名称；
+        refresh 为True时忽略缓存，重新扫描全部项目
+        """
         if not os.path.exists(self.y3_local_data):
             print(f"Y3本地数据目录不存在: {self.y3_local_data}")
             return []
             
-        projects = []
-        for item in os.listdir(self.y3_local_data):
-            if os.path.isdir(os.path.join(self.y3_local_data, item)):
-                projects.append(item)
-        return projects
+        catalog = self._catalog(self.y3_local_data)
+        return catalog.scan(rescan=refresh) if detail else catalog.names()
     
+    @traced("MapManager.import_project")
     def import_project(self, project_name, target_name=None):
         """导入Y3地图项目到war3项目目录"""
         source_path = os.path.join(self.y3_local_data, project_name)
@@ -41,7 +91,10 @@ class MapManager:
                 if response.lower() != 'y':
                     return False
                     
-            shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+            stats = copy_tree(source_path, target_path, dirs_exist_ok=True,
+                              progress=ConsoleProgress("导入"))
+            count("files", stats["files"])
+            count("bytes", stats["bytes"])
             print(f"成功导入项目: {project_name} -> {target_path}")
             
             # 创建项目信息文件
@@ -55,26 +108,31 @@ class MapManager:
             info_file = os.path.join(target_path, "project_info.json")
             with open(info_file, 'w', encoding='utf-8') as f:
                 json.dump(project_info, f, indent=2, ensure_ascii=False)
+            self._invalidate_catalog(self.project_maps_dir, target_name)
                 
             return True
         except Exception as e:
             print(f"导入失败: {e}")
             return False
     
-    def list_imported_projects(self):
-        """列出已导入的地图项目"""
+    def list_imported_projects(self, detail=False, refresh=False):
+        """列出已导入的地图项目
+        
+        detail 为True时返回每个项目的元数据（含最近的备份），否则只返回名称；
+        refresh 为True时忽略缓存，重新扫描全部项目
+        """
         if not os.path.exists(self.project_maps_dir):
             return []
             
-        projects = []
-        for item in os.listdir(self.project_maps_dir):
-            project_path = os.path.join(self.project_maps_dir, item)
-            if os.path.isdir(project_path):
-                projects.append(item)
-        return projects
+        catalog = self._catalog(self.project_maps_dir)
+        return catalog.scan(rescan=refresh) if detail else catalog.names()
     
+    @traced("MapManager.create_template")
     def create_template(self, template_name, source_project=None):
-        """创建地图项目模板"""
+        """创建地图项目模板
+        
+        从项目创建的模板保存为对象存储中的快照目录树
+        """
         template_path = os.path.join(self.templates_dir, template_name)
         
         if source_project:
@@ -83,8 +141,12 @@ class MapManager:
                 print(f"源项目不存在: {source_project}")
                 return False
                 
-            shutil.copytree(source_path, template_path, dirs_exist_ok=True)
-            print(f"从项目 {source_project} 创建模板: {template_name}")
+            tree_file = template_path + SNAPSHOT_SUFFIX
+            stats = self.object_store.save_tree(source_path, tree_file)
+            count("files", stats["files"])
+            count("bytes_stored", stats["bytes_stored"])
+            print(f"从项目 {source_project} 创建模板: {template_name} "
+                  f"(共 {stats['files']} 个文件, 新增对象 {stats['stored']} 个/{stats['bytes_stored']} 字节)")
         else:
             # 创建空模板
             os.makedirs(template_path, exist_ok=True)
@@ -92,10 +154,12 @@ class MapManager:
             
         return True
     
+    @traced("MapManager.create_project_from_template")
     def create_project_from_template(self, template_name, project_name):
         """从模板创建新项目"""
         template_path = os.path.join(self.templates_dir, template_name)
-        if not os.path.exists(template_path):
+        tree_file = template_path + SNAPSHOT_SUFFIX
+        if not os.path.exists(template_path) and not os.path.exists(tree_file):
             print(f"模板不存在: {template_name}")
             return False
             
@@ -104,80 +168,398 @@ class MapManager:
             print(f"项目已存在: {project_name}")
             return False
             
-        shutil.copytree(template_path, target_path)
+        if os.path.exists(tree_file):
+            tree = load_tree(tree_file)
+            if tree is None:
+                print(f"模板快照无效: {tree_file}")
+                return False
+            stats = self.object_store.checkout_tree(tree, target_path)
+        else:
+            stats = copy_tree(template_path, target_path, progress=ConsoleProgress("复制模板"))
+        count("files", stats["files"])
+        count("bytes", stats["bytes"])
         print(f"从模板 {template_name} 创建项目: {project_name}")
         return True
     
-    def backup_project(self, project_name):
-        """备份地图项目"""
+    @traced("MapManager.backup_project")
+    def backup_project(self, project_name, mode="store"):
+        """备份地图项目
+        
+        备份模式:
+            store: 保存为对象存储中的快照目录树，只存入新内容
+            incremental: 目录备份，未变化的文件从上一个备份硬链接
+            full: 完整复制整个项目目录
+        """
         project_path = os.path.join(self.project_maps_dir, project_name)
         if not os.path.exists(project_path):
             print(f"项目不存在: {project_name}")
             return False
             
-        backup_name = f"{project_name}_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        backup_prefix = f"{project_name}_backup_"
+        backup_name = f"{backup_prefix}{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         backup_path = os.path.join(self.project_maps_dir, backup_name)
         
-        shutil.copytree(project_path, backup_path)
-        print(f"项目备份完成: {backup_name}")
+        if mode == "store":
+            previous_tree = self._latest_backup_tree(backup_prefix)
+            stats = self.object_store.save_tree(project_path, backup_path + SNAPSHOT_SUFFIX,
+                                                previous_tree)
+            count("files", stats["files"])
+            count("bytes_stored", stats["bytes_stored"])
+            print(f"项目备份完成: {backup_name}{SNAPSHOT_SUFFIX} "
+                  f"(共 {stats['files']} 个文件, 新增对象 {stats['stored']} 个/{stats['bytes_stored']} 字节)")
+            return True
+            
+        if mode == "full":
+            stats = copy_tree(project_path, backup_path, progress=ConsoleProgress("备份"))
+            count("files", stats["files"])
+            count("bytes", stats["bytes"])
+            print(f"项目备份完成: {backup_name}")
+            return True
+            
+        if mode != "incremental":
+            print(f"不支持的备份模式: {mode}")
+            return False
+            
+        backup = IncrementalBackup(project_path, self.project_maps_dir, backup_prefix)
+        stats = backup.create(backup_path)
+        count("files", stats["files"])
+        count("bytes", stats["bytes_copied"])
+        print(f"项目备份完成: {backup_name} "
+              f"(共 {stats['files']} 个文件, 复制 {stats['copied']} 个/{stats['bytes_copied']} 字节, "
+              f"链接 {stats['linked']} 个)")
         return True
     
-    def sync_to_y3(self, project_name):
-        """同步项目到Y3编辑器"""
-        project_path = os.path.join(self.project_maps_dir, project_name)
-        if not os.path.exists(project_path):
-            print(f"项目不存在: {project_name}")
+    @traced("MapManager.restore_backup")
+    def restore_backup(self, backup_name, project_name):
+        """从快照备份恢复为新项目"""
+        tree_file = os.path.join(self.project_maps_dir, backup_name)
+        if not tree_file.endswith(SNAPSHOT_SUFFIX):
+            tree_file += SNAPSHOT_SUFFIX
+        tree = load_tree(tree_file)
+        if tree is None:
+            print(f"备份不存在: {backup_name}")
             return False
             
-        # 读取项目信息
-        info_file = os.path.join(project_path, "project_info.json")
+        target_path = os.path.join(self.project_maps_dir, project_name)
+        if os.path.exists(target_path):
+            print(f"项目已存在: {project_name}")
+            return False
+            
+        stats = self.object_store.checkout_tree(tree, target_path)
+        count("files", stats["files"])
+        count("bytes", stats["bytes"])
+        print(f"从备份 {backup_name} 恢复项目: {project_name} (共 {stats['files']} 个文件)")
+        return True
+    
+    def _latest_backup_tree(self, backup_prefix):
+        """读取指定项目最新的快照备份目录树"""
+        if not os.path.exists(self.project_maps_dir):
+            return None
+            
+        candidates = [item for item in os.listdir(self.project_maps_dir)
+                      if item.startswith(backup_prefix) and item.endswith(SNAPSHOT_SUFFIX)]
+        if not candidates:
+            return None
+        return load_tree(os.path.join(self.project_maps_dir, max(candidates)))
+    
+    def _y3_project_path(self, project_name):
+        """项目在Y3编辑器中的名称和目录（导入时记录在 project_info.json 中）"""
+        info_file = os.path.join(self.project_maps_dir, project_name, "project_info.json")
         if os.path.exists(info_file):
             with open(info_file, 'r', encoding='utf-8') as f:
                 info = json.load(f)
                 original_name = info.get("original_name", project_name)
         else:
             original_name = project_name
+        return original_name, os.path.join(self.y3_local_data, original_name)
+    
+    @traced("MapManager.validate_project")
+    def validate_project(self, project_name):
+        """检查项目能否被编辑器打开（头文件、物编表和多语言键）"""
+        project_path = os.path.join(self.project_maps_dir, project_name)
+        if not os.path.exists(project_path):
+            print(f"项目不存在: {project_name}")
+            return False
+            
+        result = validate_project(project_path)
+        count("files", result["files"])
+        for problem in result["problems"]:
+            print(f"  {problem}")
+        if result["problems"]:
+            print(f"项目检查未通过: {project_name} (发现 {len(result['problems'])} 个问题)")
+            return False
+        print(f"项目检查通过: {project_name} ({result['maps']} 个地图, {result['files']} 个文件)")
+        return True
+    
+    @traced("MapManager.sync_to_y3")
+    def sync_to_y3(self, project_name):
+        """同步项目到Y3编辑器"""
+        project_path = os.path.join(self.project_maps_dir, project_name)
+        if not os.path.exists(project_path):
+            print(f"项目不存在: {project_name}")
+            return False
             
-        target_path = os.path.join(self.y3_local_data, original_name)
+        original_name, target_path = self._y3_project_path(project_name)
         
         try:
-            if os.path.exists(target_path):
-                shutil.rmtree(target_path)
-            shutil.copytree(project_path, target_path)
-            print(f"项目已同步到Y3编辑器: {original_name}")
+            # 增量同步：只复制变化的文件、删除已移除的文件，目标项目不会在同步中途消失
+            stats = DeltaSync(project_path, target_path).run()
+            self._invalidate_catalog(self.y3_local_data, original_name)
+            count("files", stats["files_copied"])
+            count("bytes", stats["bytes_copied"])
+            count("files_deleted", stats["files_deleted"])
+            print(f"项目已同步到Y3编辑器: {original_name} "
+                  f"(复制 {stats['files_copied']} 个文件/{stats['bytes_copied']} 字节, "
+                  f"删除 {stats['files_deleted']} 个文件, 未变化 {stats['files_unchanged']} 个)")
             return True
         except Exception as e:
             print(f"同步失败: {e}")
             return False
 
+    def watch_sync(self, project_name, prefer=None, polling=False, duration=None):
+        """持续双向同步项目与Y3编辑器中的副本（按 Ctrl+C 停止）
+        
+        以启动时两侧的文件为基准，之后任一侧保存的文件在约一秒内复制到另一侧；
+        两侧都修改过的文件视为冲突，prefer 为 "maps"/"y3" 时保留该侧，否则不覆盖并提示
+        """
+        project_path = os.path.join(self.project_maps_dir, project_name)
+        if not os.path.exists(project_path):
+            print(f"项目不存在: {project_name}")
+            return False
+            
+        original_name, target_path = self._y3_project_path(project_name)
+        sides = {"maps": LEFT, "y3": RIGHT}
+        names = {LEFT: "war3", RIGHT: "Y3"}
+        
+        def report(action, direction, rel_path):
+            if action == "conflict":
+                print(f"[冲突] {rel_path} 在两侧都被修改，未同步")
+                return
+            source, target = direction.split("->")
+            verb = "复制" if action == "copy" else "删除"
+            print(f"[{names[source]} -> {names[target]}] {verb} {rel_path}")
+        
+        daemon = MirrorDaemon(project_path, target_path, prefer=sides.get(prefer),
+                              polling=polling, on_event=report)
+        daemon.start()
+        print(f"开始监视 ({daemon.backend}): {project_path} <-> {target_path}，按 Ctrl+C 停止")
+        try:
+            daemon.run(duration)
+        except KeyboardInterrupt:
+            daemon.close()
+        self._invalidate_catalog(self.project_maps_dir, project_name)
+        self._invalidate_catalog(self.y3_local_data, original_name)
+        stats = daemon.stats
+        print(f"监视已停止: 复制 {stats['copied']} 个文件/{stats['bytes']} 字节, "
+              f"删除 {stats['deleted']} 个, 冲突 {stats['conflicts']} 个")
+        for rel_path in sorted(daemon.conflicts):
+            print(f"  未解决的冲突: {rel_path}")
+        return True
+
+# 批量操作：名称 -> (MapManager, 项目名称, 命令行参数) -> 是否成功
+BATCH_OPERATIONS = {
+    "backup": lambda manager, project, args: manager.backup_project(project, args.backup_mode),
+    "validate": lambda manager, project, args: manager.validate_project(project),
+    "sync": lambda manager, project, args: manager.sync_to_y3(project),
+    "template": lambda manager, project, args: manager.create_template(
+        args.template_name.format(project=project), project),
+}
+
+
+def _run_batch_project(project_name, operations, args, log_dir):
+    """
+    在工作进程中依次执行一个项目的各个操作
+    
+    每个操作的输出写入单独的日志文件，标准输入为空（需要确认的操作直接失败而不会卡住）；
+    某个操作失败后跳过该项目的后续操作。埋点只记录在内存中，随结果返回（trace字段），
+    由主进程统一写入跟踪文件
+    
+    Returns:
+        每个操作的结果列表
+    """
+    sys.stdin = open(os.devnull, 'r')
+    instrumentation.enable()
+    manager = MapManager()
+    results = []
+    failed = False
+    for operation in operations:
+        result = {"project": project_name, "operation": operation, "ok": False,
+                  "skipped": failed, "error": None, "seconds": 0.0,
+                  "log": os.path.join(log_dir, f"{project_name}.{operation}.log"), "trace": []}
+        result.update(dict.fromkeys(BATCH_COUNTERS, 0))
+        results.append(result)
+        if failed:
+            continue
+        
+        recorded = len(instrumentation.records())
+        start = time.perf_counter()
+        with open(result["log"], 'w', encoding='utf-8') as log, \
+                redirect_stdout(log), redirect_stderr(log):
+            try:
+                result["ok"] = bool(BATCH_OPERATIONS[operation](manager, project_name, args))
+            except Exception as e:
+                result["error"] = f"{type(e).__name__}: {e}"
+                traceback.print_exc()
+        result["seconds"] = time.perf_counter() - start
+        result["trace"] = instrumentation.records()[recorded:]
+        for record in result["trace"]:
+            for key in BATCH_COUNTERS:
+                result[key] += record.get(key, 0)
+        failed = not result["ok"]
+    return results
+
+
+def print_projects(projects):
+    """逐行输出项目列表及其元数据"""
+    for project in projects:
+        version = project["map_version"] if project["map_version"] is not None else "-"
+        modified = (datetime.fromtimestamp(project["modified"]).strftime('%Y-%m-%d %H:%M')
+                    if project["modified"] else "-")
+        snapshot = f"  最近备份: {project['last_snapshot']}" if project.get("last_snapshot") else ""
+        print(f"  {project['name']:<32} {project['size'] / 1024 / 1024:>8.1f} MB "
+              f"{project['files']:>6} 个文件  版本 {version:<4} {modified}{snapshot}")
+    print(f"共 {len(projects)} 个项目")
+
+
+def select_projects(manager, patterns):
+    """按名称或通配符选择已导入的项目（通配符不匹配备份目录）"""
+    projects = sorted(manager.list_imported_projects())
+    selected = []
+    for pattern in patterns:
+        if pattern in projects:
+            matches = [pattern]
+        else:
+            matches = [project for project in projects
+                       if fnmatch.fnmatch(project, pattern) and BACKUP_MARKER not in project]
+            if not matches:
+                print(f"没有匹配的项目: {pattern}")
+        selected.extend(project for project in matches if project not in selected)
+    return selected
+
+
+def run_batch(projects, operations, args, workers=None):
+    """
+    用进程池对多个项目执行批量操作
+    
+    Args:
+        projects: 项目名称列表
+        operations: 操作名称列表，每个项目按顺序执行
+        args: 命令行参数（备份模式、模板名称等）
+        workers: 进程数，默认为CPU核数
+    
+    Returns:
+        全部操作的结果列表（按项目、操作顺序）
+    """
+    log_dir = os.path.join(BATCH_LOG_DIR, datetime.now().strftime('%Y%m%d_%H%M%S'))
+    os.makedirs(log_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count() or 1, len(projects)) or 1
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(_run_batch_project, project, operations, args, log_dir): project
+                   for project in projects}
+        for future in as_completed(futures):
+            project = futures[future]
+            try:
+                results[project] = future.result()
+            except Exception as e:
+                # 工作进程异常退出
+                results[project] = [{"project": project, "operation": operation, "ok": False,
+                                     "skipped": False, "error": f"{type(e).__name__}: {e}",
+                                     "seconds": 0.0, "log": None, "trace": [],
+                                     **dict.fromkeys(BATCH_COUNTERS, 0)}
+                                    for operation in operations]
+            for result in results[project]:
+                instrumentation.add_records(result.pop("trace"))
+            status = "失败" if any(not r["ok"] for r in results[project]) else "完成"
+            print(f"[{len(results)}/{len(projects)}] {project} {status}")
+    return [result for project in projects for result in results[project]]
+
+
+def print_batch_summary(results, seconds):
+    """按操作汇总批量处理的耗时、文件数、字节数和失败项"""
+    print(f"\n=== 批量处理汇总 (总耗时 {seconds:.1f} 秒) ===")
+    operations = list(dict.fromkeys(result["operation"] for result in results))
+    for operation in operations:
+        group = [result for result in results if result["operation"] == operation]
+        ok = sum(result["ok"] for result in group)
+        skipped = sum(result["skipped"] for result in group)
+        print(f"  {operation:<9} 成功 {ok}/{len(group)}, 跳过 {skipped}, "
+              f"耗时 {sum(r['seconds'] for r in group):.1f} 秒, "
+              f"文件 {sum(r['files'] for r in group)} 个, "
+              f"字节 {sum(r['bytes'] + r['bytes_stored'] for r in group)}")
+    failures = [result for result in results if not result["ok"] and not result["skipped"]]
+    for result in failures:
+        reason = result["error"] or "操作返回失败"
+        print(f"  [失败] {result['project']} {result['operation']}: {reason} (日志: {result['log']})")
+
+
+def batch_main(argv):
+    """非交互批量处理入口，返回退出码（有失败时为1）"""
+    parser = argparse.ArgumentParser(
+        prog="map_manager.py",
+        description="对多个已导入项目批量执行操作（进程池并行）",
+        epilog='示例: python tools/map_manager.py "ProjectName*" --ops validate,backup,sync')
+    parser.add_argument("projects", nargs="*", help="项目名称或通配符")
+    parser.add_argument("--all", action="store_true", help="全部已导入的项目（不含备份）")
+    parser.add_argument("--ops", required=True,
+                        help=f"逗号分隔的操作，按顺序执行: {','.join(BATCH_OPERATIONS)}")
+    parser.add_argument("--workers", type=int, help="进程数（默认CPU核数）")
+    parser.add_argument("--backup-mode", default="store", choices=("store", "incremental", "full"),
+                        help="备份模式")
+    parser.add_argument("--template-name", default="{project}",
+                        help="模板名称，{project} 替换为项目名称")
+    args = parser.parse_args(argv)
+    
+    operations = [operation.strip() for operation in args.ops.split(",") if operation.strip()]
+    unknown = [operation for operation in operations if operation not in BATCH_OPERATIONS]
+    if unknown or not operations:
+        parser.error(f"不支持的操作: {','.join(unknown)}")
+    
+    manager = MapManager()
+    projects = select_projects(manager, ["*"] if args.all else args.projects)
+    if not projects:
+        print("没有要处理的项目")
+        return 1
+    
+    print(f"批量处理 {len(projects)} 个项目: {', '.join(operations)}")
+    start = time.perf_counter()
+    results = run_batch(projects, operations, args, args.workers)
+    print_batch_summary(results, time.perf_counter() - start)
+    return 0 if all(result["ok"] for result in results) else 1
+
 def main():
+    if len(sys.argv) > 1:
+        return batch_main(sys.argv[1:])
+    
     manager = MapManager()
     
     while True:
         print("\n=== Y3地图项目管理工具 ===")
-        print("1. 列出Y3编辑器中的项目")
+        print("1. 列出Y3编辑器中的项目（1r 重新扫描）")
         print("2. 导入项目到war3目录")
-        print("3. 列出已导入的项目")
+        print("3. 列出已导入的项目（3r 重新扫描）")
         print("4. 创建项目模板")
         print("5. 从模板创建项目")
         print("6. 备份项目")
         print("7. 同步项目到Y3编辑器")
+        print("8. 从备份恢复项目")
+        print("9. 持续双向同步（监视模式）")
         print("0. 退出")
         
-        choice = input("\n请选择操作 (0-7): ").strip()
+        choice = input("\n请选择操作 (0-9): ").strip()
         
         if choice == "0":
             break
-        elif choice == "1":
-            projects = manager.list_y3_projects()
-            print(f"Y3编辑器中的项目: {projects}")
+        elif choice in ("1", "1r"):
+            print("Y3编辑器中的项目:")
+            print_projects(manager.list_y3_projects(detail=True, refresh=choice == "1r"))
         elif choice == "2":
             project_name = input("请输入项目名称: ").strip()
             target_name = input("请输入目标名称 (直接回车使用原名): ").strip() or None
             manager.import_project(project_name, target_name)
-        elif choice == "3":
-            projects = manager.list_imported_projects()
-            print(f"已导入的项目: {projects}")
+        elif choice in ("3", "3r"):
+            print("已导入的项目:")
+            print_projects(manager.list_imported_projects(detail=True, refresh=choice == "3r"))
         elif choice == "4":
             template_name = input("请输入模板名称: ").strip()
             source_project = input("请输入源项目名称 (直接回车创建空模板): ").strip() or None
@@ -192,8 +574,15 @@ def main():
         elif choice == "7":
             project_name = input("请输入项目名称: ").strip()
             manager.sync_to_y3(project_name)
+        elif choice == "8":
+            backup_name = input("请输入备份名称: ").strip()
+            project_name = input("请输入恢复后的项目名称: ").strip()
+            manager.restore_backup(backup_name, project_name)
+        elif choice == "9":
+            project_name = input("请输入项目名称: ").strip()
+            manager.watch_sync(project_name)
         else:
             print("无效选择，请重新输入")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
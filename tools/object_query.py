@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+查询地图项目的物编对象索引
+
+示例:
+    python tools/object_query.py ProjectName001_1 --get 134220438
+    python tools/object_query.py ProjectName001_1 --refs 134220438 --target-kind ability
+    python tools/object_query.py ProjectName001_1 --users 210302 --field model --kind unit
+    python tools/object_query.py ProjectName001_1 --find 空调
+
+索引保存在项目的 .cache/object_index.sqlite，每次查询前只重新解析变化的文件
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.object_index import ObjectIndex
+
+
+def resolve_project(project):
+    """项目名称解析为 maps/<名称>，也可以直接传入路径"""
+    if os.path.isdir(project):
+        return project
+    return os.path.join("maps", project)
+
+
+def print_records(records):
+    """逐行输出对象记录"""
+    for record in records:
+        field = f"[{record['field']}] " if record.get("field") else ""
+        name = record.get("name") or ""
+        print(f"  {field}{record['kind']:<12} {record['id']:<14} {name}  ({record['path']})")
+    print(f"共 {len(records)} 条")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查询物编对象索引")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    parser.add_argument("--get", metavar="ID", help="按ID获取对象")
+    parser.add_argument("--refs", metavar="ID", help="列出对象引用的其他对象")
+    parser.add_argument("--users", metavar="VALUE", help="列出引用了该ID的对象")
+    parser.add_argument("--find", metavar="NAME", help="按名称查找对象")
+    parser.add_argument("--kind", help="对象类别（unit、ability、modifier、projectile等）")
+    parser.add_argument("--target-kind", help="--refs 只列出该类别的被引用对象")
+    parser.add_argument("--field", help="--users 只匹配该字段中的引用（如 model）")
+    args = parser.parse_args()
+
+    project_path = resolve_project(args.project)
+    if not os.path.isdir(project_path):
+        print(f"项目不存在: {args.project}")
+        return 1
+
+    with ObjectIndex(project_path) as index:
+        stats = index.update()
+        print(f"索引: {stats['scanned']} 个文件, 更新 {stats['updated']} 个, "
+              f"删除 {stats['removed']} 个 ({stats['seconds'] * 1000:.0f} ms)")
+
+        if args.get:
+            print_records(index.get(args.get, args.kind))
+        elif args.refs:
+            print_records(index.references(args.refs, args.kind, args.target_kind))
+        elif args.users:
+            print_records(index.referenced_by(args.users, args.field, args.kind))
+        elif args.find:
+            print_records(index.find(args.find, args.kind))
+        else:
+            for kind, count in index.kinds().items():
+                print(f"  {kind:<16} {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+地图项目打包/解包（zip格式，可用任何zip工具打开）
+
+示例:
+    python tools/project_archive.py pack ProjectName001_1 ProjectName001_1.zip
+    python tools/project_archive.py list ProjectName001_1.zip --include "maps/EntryMap/*.json"
+    python tools/project_archive.py unpack ProjectName001_1.zip maps/ProjectName001_1
+    python tools/project_archive.py unpack ProjectName001_1.zip out --include "maps/EntryMap/*.json"
+
+打包时跳过 .cache 目录；--include 使用fnmatch规则（* 也匹配 /），以 / 结尾时匹配整个目录
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.storage.archive import DEFAULT_LEVEL, list_entries, pack, unpack
+
+
+def resolve_project(project):
+    """项目名称解析为 maps/<名称>，也可以直接传入路径"""
+    if os.path.isdir(project):
+        return project
+    return os.path.join("maps", project)
+
+
+def format_size(size):
+    """字节数格式化为MB"""
+    return f"{size / 1024 / 1024:.1f} MB"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="地图项目打包/解包")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    pack_parser = commands.add_parser("pack", help="打包项目")
+    pack_parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    pack_parser.add_argument("archive", help="输出的zip文件")
+    pack_parser.add_argument("--workers", type=int, help="压缩线程数（默认CPU核数）")
+    pack_parser.add_argument("--level", type=int, default=DEFAULT_LEVEL, choices=range(1, 10),
+                             metavar="1-9", help="压缩级别")
+
+    list_parser = commands.add_parser("list", help="列出归档内容")
+    list_parser.add_argument("archive", help="zip文件")
+    list_parser.add_argument("--include", action="append", metavar="PATTERN", help="只列出匹配的条目")
+
+    unpack_parser = commands.add_parser("unpack", help="解包到目录")
+    unpack_parser.add_argument("archive", help="zip文件")
+    unpack_parser.add_argument("target", help="目标目录")
+    unpack_parser.add_argument("--include", action="append", metavar="PATTERN", help="只解出匹配的条目")
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        project_path = resolve_project(args.project)
+        if not os.path.isdir(project_path):
+            print(f"项目不存在: {args.project}")
+            return 1
+        stats = pack(project_path, args.archive, workers=args.workers, level=args.level)
+        ratio = stats["archive_bytes"] / stats["bytes"] if stats["bytes"] else 1.0
+        print(f"已打包 {stats['files']} 个文件（{stats['stored']} 个直接存储）: "
+              f"{format_size(stats['bytes'])} -> {format_size(stats['archive_bytes'])} "
+              f"({ratio:.0%}), 耗时 {stats['seconds']:.1f} 秒")
+        return 0
+
+    if not os.path.isfile(args.archive):
+        print(f"归档不存在: {args.archive}")
+        return 1
+
+    if args.command == "list":
+        entries = list_entries(args.archive, args.include)
+        for entry in entries:
+            method = "存储" if entry["stored"] else "压缩"
+            print(f"  {entry['size']:>12} {entry['compressed']:>12} {method}  {entry['name']}")
+        print(f"共 {len(entries)} 个文件, {format_size(sum(e['size'] for e in entries))}")
+        return 0
+
+    stats = unpack(args.archive, args.target, args.include)
+    print(f"已解出 {stats['files']} 个文件 ({format_size(stats['bytes'])}) 到 {args.target}, "
+          f"耗时 {stats['seconds']:.1f} 秒")
+    return 0 if stats["files"] or not args.include else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,9 +4,16 @@
 """
 
 import os
-import shutil
+import sys
 import json
 from datetime import datetime
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.storage.parallel_copy import ConsoleProgress, copy_tree
 
 def quick_import_project():
     """快速导入ProjectName001_1项目"""
@@ -35,7 +42,8 @@ def quick_import_project():
     
     try:
         # 复制项目
-        shutil.copytree(source_path, target_path, dirs_exist_ok=True)
+        copy_tree(source_path, target_path, dirs_exist_ok=True,
+                  progress=ConsoleProgress("导入"))
         print(f"✓ 成功导入项目: {source_project} -> {target_path}")
         
         # 创建项目信息文件
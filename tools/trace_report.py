@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+汇总性能跟踪文件
+按操作名称统计调用次数、总耗时/平均耗时/最大耗时和文件数、字节数等计数，
+可同时传入多次运行产生的跟踪文件（JSON Lines 或 CSV）
+
+启用跟踪: 设置环境变量 WAR3_TRACE=trace.jsonl，或 python src/main.py --trace trace.jsonl
+"""
+
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.shared.utils.instrumentation import CSV_FIELDS, load_trace, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description="汇总性能跟踪文件")
+    parser.add_argument("trace_files", nargs="+", help="跟踪文件（.jsonl 或 .csv）")
+    parser.add_argument("--sort", choices=["seconds", "calls", "avg_seconds", "max_seconds"],
+                        default="seconds", help="排序字段")
+    args = parser.parse_args()
+
+    trace_records = []
+    for trace_file in args.trace_files:
+        if not Path(trace_file).exists():
+            print(f"跟踪文件不存在: {trace_file}")
+            return 1
+        trace_records.extend(load_trace(trace_file))
+
+    runs = {record.get("run") for record in trace_records}
+    print(f"共 {len(trace_records)} 条记录，来自 {len(runs)} 次运行")
+    summary = summarize(trace_records)
+    ordered = sorted(summary.items(), key=lambda item: item[1][args.sort], reverse=True)
+
+    print(f"{'操作':<45} {'次数':>6} {'总耗时(s)':>10} {'平均(s)':>9} {'最大(s)':>9}  计数")
+    for name, entry in ordered:
+        counters = ", ".join(f"{key}={value}" for key, value in entry.items()
+                             if key not in ("calls", "seconds", "avg_seconds", "max_seconds")
+                             and key not in CSV_FIELDS)
+        print(f"{name:<45} {entry['calls']:>6} {entry['seconds']:>10.3f} "
+              f"{entry['avg_seconds']:>9.3f} {entry['max_seconds']:>9.3f}  {counters}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+查询地图项目的触发器索引
+
+示例:
+    python tools/trigger_query.py ProjectName001_1 --action SET_VARIABLE
+    python tools/trigger_query.py ProjectName001_1 --variable 幸存者_玩家数量
+    python tools/trigger_query.py ProjectName001_1 --value 134272672
+    python tools/trigger_query.py ProjectName001_1 --callers WASD移动_获取输入方向
+    python tools/trigger_query.py ProjectName001_1 --show 609304604
+    python tools/trigger_query.py ProjectName001_1 --show 544051202 --path unit/134222110
+
+索引保存在项目的 .cache/trigger_index.sqlite，每次查询前只重新编译变化的文件
+"""
+
+import os
+import sys
+import argparse
+from pathlib import Path
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.trigger_index import TERM_KINDS, TriggerIndex
+
+
+def resolve_project(project):
+    """项目名称解析为 maps/<名称>，也可以直接传入路径"""
+    if os.path.isdir(project):
+        return project
+    return os.path.join("maps", project)
+
+
+def print_matches(records):
+    """逐行输出匹配的触发器和所在节点"""
+    for record in records:
+        node = f"{record.get('node_type') or ''} #{record.get('element_id')}"
+        detail = f" [{record['detail']}]" if record.get("detail") else ""
+        print(f"  {record['kind']:<8} {record['trigger_id']:<12} {record['name']:<24} "
+              f"{node}{detail}  ({record['owner']})")
+    print(f"共 {len(records)} 处，{len({(r['path'], r['trigger_id']) for r in records})} 个触发器")
+
+
+def print_nodes(nodes):
+    """按层级缩进输出触发器展开后的节点"""
+    for node in nodes:
+        state = "" if node["enabled"] else "  (已禁用)"
+        print(f"  {'  ' * node['depth']}{node['kind']:<9} {node['type']}{state}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="查询触发器索引")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    for kind in TERM_KINDS:
+        parser.add_argument(f"--{kind}", metavar="TERM", help=f"列出使用了该{kind}的触发器")
+    parser.add_argument("--scope", help="--variable 只匹配该作用域或类型（global、local、actor、INTEGER等）")
+    parser.add_argument("--callers", metavar="FUNC", help="列出调用了该自定义函数（名称或ID）的触发器")
+    parser.add_argument("--show", type=int, metavar="TRIGGER_ID", help="显示触发器展开后的节点")
+    parser.add_argument("--path", help="--show 的ID出现在多个文件中时，只看路径包含该文本的文件")
+    parser.add_argument("--top", type=int, default=10, help="未指定查询时每类列出的常用词数量")
+    args = parser.parse_args()
+
+    project_path = resolve_project(args.project)
+    if not os.path.isdir(project_path):
+        print(f"项目不存在: {args.project}")
+        return 1
+
+    with TriggerIndex(project_path) as index:
+        stats = index.update()
+        print(f"索引: {stats['scanned']} 个文件, 更新 {stats['updated']} 个, "
+              f"删除 {stats['removed']} 个 ({stats['seconds'] * 1000:.0f} ms)")
+
+        for kind in TERM_KINDS:
+            term = getattr(args, kind)
+            if term is not None:
+                detail = args.scope if kind == "variable" else None
+                print_matches(index.search(kind, term, detail))
+                return 0
+
+        if args.callers:
+            print_matches(index.callers(args.callers))
+        elif args.show is not None:
+            found = [trigger for trigger in index.locate(args.show)
+                     if args.path is None or args.path in trigger["path"]]
+            if len(found) != 1:
+                print(f"触发器 {args.show} " + ("不存在" if not found else
+                      f"出现在 {len(found)} 个文件中，请用 --path 指定其中一个:"))
+                for trigger in found:
+                    print(f"  {trigger['path']}  {trigger['name']}")
+                return 1
+            trigger = found[0]
+            print(f"{trigger['name']} ({trigger['path']})")
+            print_nodes(index.nodes(trigger["path"], args.show))
+            for function in index.calls(trigger["path"], args.show):
+                print(f"  调用函数: {function['name']} ({function['func_id']})")
+        else:
+            totals = index.stats()
+            print(f"触发器 {totals['triggers']} 个, 函数 {totals['functions']} 个, "
+                  f"节点 {totals['nodes']} 个, 索引词 {totals['terms']} 个")
+            for kind in ("event", "action", "api", "variable"):
+                common = ", ".join(f"{term}({count})" for term, count in index.term_counts(kind, args.top))
+                print(f"  {kind:<9} {common}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
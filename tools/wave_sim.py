@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+刷怪波次离线模拟
+按分钟汇总刷怪数、敌人生命值和所需DPS；给出 --dps 时计算敌人积压，
+--variants 随机生成一批刷怪速度/生命值倍率变体并报告评估速度
+
+示例:
+    python tools/wave_sim.py ProjectName001_1 --dps 3000
+    python tools/wave_sim.py ProjectName001_1 --dps 3000 --variants 10000
+"""
+
+import os
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+# 添加项目根目录到Python路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from src.infrastructure.y3.wave_simulator import DEFAULT_WINDOW, WaveSimulator, backlog_hp
+
+
+def resolve_map(project, map_name):
+    """项目名称或路径解析为地图目录 <项目>/maps/<地图>"""
+    project_path = project if os.path.isdir(project) else os.path.join("maps", project)
+    return os.path.join(project_path, "maps", map_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="刷怪波次离线模拟")
+    parser.add_argument("project", help="项目名称（maps/下）或项目路径")
+    parser.add_argument("--map", default="EntryMap", help="地图目录名")
+    parser.add_argument("--duration", type=float, help="模拟时长（秒），默认取波次表中的最大结束时间")
+    parser.add_argument("--window", type=int, default=DEFAULT_WINDOW, help="所需DPS的滑动窗口（秒）")
+    parser.add_argument("--dps", type=float, help="玩家DPS，用于计算敌人积压")
+    parser.add_argument("--variants", type=int, default=0, help="随机评估的参数变体数")
+    args = parser.parse_args()
+
+    map_dir = resolve_map(args.project, args.map)
+    if not os.path.isdir(os.path.join(map_dir, "tables")):
+        print(f"地图不存在或没有数据表: {map_dir}")
+        return 1
+
+    simulator = WaveSimulator.from_map(map_dir, args.duration)
+    timeline = simulator.timeline(args.window)
+    backlog = backlog_hp(timeline["hp"], args.dps) if args.dps else None
+
+    print(f"{len(simulator.rate)} 个波次, 模拟 {simulator.duration} 秒")
+    header = f"{'分钟':>4} {'刷怪数':>8} {'累计刷怪':>10} {'累计生命值':>14} {'所需DPS峰值':>12}"
+    print(header + (f" {'积压生命值峰值':>14}" if backlog is not None else ""))
+    for minute_start in range(0, simulator.duration, 60):
+        span = slice(minute_start, min(minute_start + 60, simulator.duration))
+        line = (f"{minute_start // 60:>4} {timeline['spawns'][span].sum():>8} "
+                f"{timeline['cumulative_spawns'][span][-1]:>10} "
+                f"{timeline['cumulative_hp'][span][-1]:>14.0f} "
+                f"{timeline['required_dps'][span].max():>12.1f}")
+        if backlog is not None:
+            line += f" {backlog[span].max():>14.0f}"
+        print(line)
+
+    if args.variants:
+        rng = np.random.default_rng(0)
+        rate_scale = rng.uniform(0.5, 2.0, (args.variants, len(simulator.rate)))
+        hp_scale = rng.uniform(0.5, 2.0, args.variants)
+        start = time.perf_counter()
+        results = simulator.evaluate(rate_scale, hp_scale, args.dps, args.window)
+        elapsed = time.perf_counter() - start
+        print(f"\n评估 {args.variants} 个变体用时 {elapsed:.3f}s ({args.variants / elapsed:,.0f} 个/秒)")
+        print(f"所需DPS峰值: 中位数 {np.median(results['peak_required_dps']):.1f}, "
+              f"最大 {results['peak_required_dps'].max():.1f}")
+        if "overwhelmed_at" in results:
+            overwhelmed = results["overwhelmed_at"] >= 0
+            print(f"玩家DPS {args.dps:.0f} 被压垮的变体: {overwhelmed.mean():.1%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())